@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+# Cache-Control of responses that never change (finished runs)
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Cache-Control of responses that may change: cache, but revalidate every time
+REVALIDATE = "no-cache"
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized response bodies, bounded by their
+    total size. Entries larger than the whole cache are not stored.
+
+    Args:
+        max_bytes: Maximum total size of the cached bodies.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# Serialized details of finished runs, shared by all requests
+run_details_cache = ResponseCache(
+    int(os.environ.get("MULTINEAR_RESPONSE_CACHE_MB", "128")) * 1024 * 1024
+)
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag from the values a response is derived from.
+    """
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    A 304 response if the request's If-None-Match matches the ETag, else None.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = [tag.strip() for tag in header.split(",")]
+    if "*" in tags or etag in tags or f"W/{etag}" in tags:
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
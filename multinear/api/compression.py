@@ -0,0 +1,134 @@
+import gzip
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, responses are compressed with gzip
+    brotli = None
+
+
+# Smaller responses are sent as is: compression wouldn't save a round trip
+MINIMUM_SIZE = 1024
+# Larger responses are compressed in a worker thread, not in the event loop
+THREAD_SIZE = 256 * 1024
+
+GZIP_LEVEL = 6
+# Brotli quality 4-5 compresses better than gzip -6 at a similar speed
+BROTLI_QUALITY = 5
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Content coding to use for a request: "br" (when the brotli package is
+    installed) or "gzip", by the preference of its Accept-Encoding header,
+    or None if the client accepts neither.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [
+        (weights.get(name, weights.get("*", 0.0)), -i, name)
+        for i, name in enumerate(supported)
+    ]
+    weight, _, name = max(candidates)
+    return name if weight > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body with a coding returned by `negotiate`.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text and JSON responses with brotli or gzip,
+    as negotiated by the request's Accept-Encoding header.
+
+    Responses that already have a Content-Encoding (e.g. run details cached
+    compressed) are left alone, and so are streamed responses.
+    """
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks: List[bytes] = []
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if _compressible(Headers(raw=message["headers"])):
+                    # Hold the headers until the body is known
+                    start = message
+                    return
+                await send(message)
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    if len(chunks) == 1:
+                        # A streamed response: send it uncompressed
+                        await send(start)
+                    await send(message)
+                    return
+                if len(chunks) > 1:
+                    await send(message)
+                    return
+                await self._send_body(start, chunks[0], encoding, send)
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _send_body(self, start, body: bytes, encoding: str, send):
+        headers = MutableHeaders(raw=start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) >= self.minimum_size:
+            if len(body) >= THREAD_SIZE:
+                from anyio import to_thread
+
+                body = await to_thread.run_sync(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            # The compressed body is a different representation
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,64 @@
+import time
+
+from fastapi import APIRouter, HTTPException, Response
+
+from ..utils import metrics
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Expose runner, evaluator, storage and API metrics in the Prometheus format.
+
+    Raises:
+        HTTPException: If prometheus_client is not installed.
+    """
+    if not metrics.enabled():
+        raise HTTPException(
+            status_code=503, detail="Metrics require the prometheus_client package"
+        )
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting API requests and timing them per route.
+
+    Requests are labelled with the route template (e.g. `/api/runs/{project_id}`)
+    rather than the raw path, to keep the number of series bounded. Everything
+    outside the API (frontend files) is grouped under "static".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled():
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None)
+            if not path or not path.startswith("/api"):
+                path = "/metrics" if scope["path"] == "/metrics" else "static"
+            method = scope["method"]
+            metrics.HTTP_REQUESTS.labels(method, path, str(status)).inc()
+            metrics.HTTP_REQUEST_SECONDS.labels(method, path).observe(
+                time.perf_counter() - start
+            )
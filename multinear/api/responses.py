@@ -0,0 +1,17 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..utils.fastjson import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson when it is installed.
+
+    Endpoints returning large payloads built from database rows (which are
+    trusted) return it with plain dicts, skipping the validation and encoding
+    of their response model.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,5 +1,5 @@
-from fastapi import BackgroundTasks, HTTPException, APIRouter, Query
-from typing import List
+from fastapi import BackgroundTasks, HTTPException, APIRouter, Query, Request, Response
+from typing import List, Optional
 from datetime import timezone
 
 from ..api.schemas import (
@@ -8,9 +8,30 @@ from ..api.schemas import (
     FullRunDetails,
     TaskDetails,
     RecentRunsResponse,
+    RegressionReport,
+    FlakyChallenge,
+    ChallengeTrend,
+    ChallengeStats,
+    CompareResponse,
+    OutputDiff,
 )
+from ..api.cache import IMMUTABLE, REVALIDATE, make_etag, not_modified, run_details_cache
+from ..api.compression import compress, negotiate
+from ..api.responses import FastJSONResponse
+from ..engine import analytics
+from ..engine.compare import compare_runs, diff_outputs
+from ..engine.repeats import job_challenge_stats
 from ..engine.run import run_experiment
-from ..engine.storage import ProjectModel, JobModel, TaskModel, TaskStatus
+from ..engine.storage import (
+    ProjectModel,
+    JobModel,
+    TaskModel,
+    TaskStatus,
+    encode_cursor,
+)
+from ..engine.blobs import resolve_blob
+from ..utils.capture import decompress_logs
+from ..utils.fastjson import dumps
 
 
 def background_job(project_id: str, job_id: str):
@@ -45,8 +66,10 @@ def background_job(project_id: str, job_id: str):
                 details=update
             )
 
-        # Mark the job as finished upon successful completion
-        job.finish()
+        # Mark the job as finished upon successful completion (or early stop)
+        job.finish(
+            TaskStatus.STOPPED if job.status == TaskStatus.STOPPED else TaskStatus.COMPLETED
+        )
     except Exception as e:
         # Handle exceptions and update the job as failed
         print(f"Error running experiment API: {e}")
@@ -60,12 +83,30 @@ def background_job(project_id: str, job_id: str):
         )
 
 
-# Create the FastAPI router for API endpoints with the prefix '/api'
+# Create the FastAPI router for API endpoints with the prefix '/api'.
+# Endpoints are plain (not async) functions, as database access is
+# synchronous: FastAPI runs them in its thread pool (sized in main.py), so a
+# slow query doesn't block the event loop and other requests.
 api_router = APIRouter(prefix="/api")
 
 
+# Part of the ETag of run details: bump when their format changes, so that
+# clients and the response cache don't serve the old format
+RUN_DETAILS_FORMAT = 2
+
+
+def _require_project(project_id: str) -> ProjectModel:
+    """
+    Find a project (see `ProjectModel.find_cached`), or respond with 404.
+    """
+    project = ProjectModel.find_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects():
+def get_projects():
     """
     Retrieve the list of all available projects.
 
@@ -79,7 +120,7 @@ async def get_projects():
 
 
 @api_router.post("/jobs/{project_id}", response_model=JobDetails)
-async def create_job(project_id: str, background_tasks: BackgroundTasks):
+def create_job(project_id: str, background_tasks: BackgroundTasks):
     """
     Create a new job for the specified project and initiate it in the background.
 
@@ -94,9 +135,7 @@ async def create_job(project_id: str, background_tasks: BackgroundTasks):
     Raises:
         HTTPException: If the specified project does not exist.
     """
-    # Verify that the project exists
-    if not ProjectModel.find(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+    _require_project(project_id)
 
     # Start a new job and enqueue it as a background task
     job_id = JobModel.start(project_id)
@@ -113,7 +152,7 @@ async def create_job(project_id: str, background_tasks: BackgroundTasks):
 
 
 @api_router.get("/jobs/{project_id}/{job_id}/status", response_model=JobDetails)
-async def get_job_status(project_id: str, job_id: str):
+def get_job_status(project_id: str, job_id: str):
     """
     Retrieve the current status of a specific job.
 
@@ -127,9 +166,7 @@ async def get_job_status(project_id: str, job_id: str):
     Raises:
         HTTPException: If the project or job is not found.
     """
-    # Verify that the project exists
-    if not ProjectModel.find(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+    _require_project(project_id)
 
     # Retrieve the job status, ensuring it belongs to the specified project
     job = JobModel.get_status(project_id, job_id)
@@ -149,10 +186,11 @@ async def get_job_status(project_id: str, job_id: str):
 
 
 @api_router.get("/runs/{project_id}", response_model=RecentRunsResponse)
-async def get_recent_runs(
+def get_recent_runs(
     project_id: str,
     limit: int = Query(5, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ):
     """
     Retrieve a paginated list of recent runs for a specific project.
@@ -161,22 +199,29 @@ async def get_recent_runs(
         project_id (str): The ID of the project.
         limit (int, optional): Number of runs to retrieve. Defaults to 5.
         offset (int, optional): Number of runs to skip for pagination. Defaults to 0.
+        cursor (str, optional): `next_cursor` of the previous page. Preferred
+            over `offset` for deep pages.
 
     Returns:
-        RecentRunsResponse: A response containing recent runs and total count.
+        RecentRunsResponse: A response containing recent runs, total count and
+        the cursor of the next page.
 
     Raises:
-        HTTPException: If the project does not exist.
+        HTTPException: If the project does not exist or the cursor is invalid.
     """
-    # Verify that the project exists
-    if not ProjectModel.find(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+    _require_project(project_id)
 
-    # Get total count of runs for this project
+    # Get total count of runs for this project (cached)
     total_runs = JobModel.count_jobs(project_id)
 
-    # Retrieve recent jobs based on limit and offset for pagination
-    recent_jobs = JobModel.list_recent(project_id, limit, offset)
+    # Retrieve recent jobs based on limit and offset/cursor for pagination
+    try:
+        recent_jobs = JobModel.list_recent(project_id, limit, offset, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Regressions against the previous run, for the whole page at once
+    regressions = analytics.count_regressions(project_id, recent_jobs)
 
     runs = []
     for job in recent_jobs:
@@ -196,7 +241,9 @@ async def get_recent_runs(
             failed = sum(
                 1 for status in task_status_map.values() if status == TaskStatus.FAILED
             )
-            regression = total - passed - failed
+            # Regressions are failures too; report the rest as plain failures
+            regression = min(regressions.get(job.id, 0), failed)
+            failed -= regression
             if total > 0:
                 score = (passed / total)
 
@@ -210,78 +257,127 @@ async def get_recent_runs(
                     if job.finished_at
                     else None
                 ),
-                "revision": job_data.get("git_revision", ""),
+                "revision": job_data.get("git_revision") or "",
                 "model": model,
                 "score": score,
                 "totalTests": total,
                 "pass": passed,
                 "fail": failed,
                 "regression": regression,
-                # "bookmarked": False,
+                "bookmarked": bool(job.pinned),
                 # "noted": False
             }
         )
 
-    return RecentRunsResponse(runs=runs, total=total_runs)
+    next_cursor = encode_cursor(recent_jobs[-1]) if len(recent_jobs) == limit else None
+    return RecentRunsResponse(runs=runs, total=total_runs, next_cursor=next_cursor)
+
+
+@api_router.post("/jobs/{project_id}/{job_id}/pin", response_model=JobDetails)
+def pin_job(project_id: str, job_id: str, pinned: bool = Query(True)):
+    """
+    Pin or unpin a job. Pinned jobs are kept by the retention policy (`gc`).
+
+    Args:
+        project_id (str): The ID of the project.
+        job_id (str): The ID of the job to pin.
+        pinned (bool, optional): Whether to pin or unpin the job. Defaults to True.
+
+    Returns:
+        JobDetails: Current status and details of the job.
+
+    Raises:
+        HTTPException: If the job is not found.
+    """
+    job = JobModel.get_status(project_id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.set_pinned(pinned)
+
+    details = job.details or {}
+    return JobDetails(
+        project_id=project_id,
+        job_id=job_id,
+        status=job.status,
+        total_tasks=job.total_tasks,
+        current_task=job.current_task,
+        task_status_map=details.get("status_map", {}),
+        details=details
+    )
 
 
-def _get_task_details(task: TaskModel):
+def _get_task_details(task: TaskModel) -> dict:
     """
-    Helper function to convert a TaskModel instance to the TaskDetails schema.
+    Helper function to convert a TaskModel instance to a dict in the
+    TaskDetails format. Payloads offloaded to the blob store are resolved here,
+    only when serialized.
+
+    The dict is not validated against the schema: its values come from the
+    database, and validating thousands of tasks dominates the time to load
+    large runs.
 
     Args:
         task (TaskModel): The task instance to convert.
 
     Returns:
-        TaskDetails: The schema representation of the task.
-    """
-    return TaskDetails(
-        id=task.id,
-        job_id=task.job_id,
-        challenge_id=task.challenge_id,
-        status=task.status,
-        error=task.error,
-        task_input=(
-            {'str': task.task_input}
-            if isinstance(task.task_input, str)
-            else task.task_input
+        dict: The task in the TaskDetails format.
+    """
+    task_input = resolve_blob(task.task_input)
+    task_output = resolve_blob(task.task_output)
+    task_logs = decompress_logs(resolve_blob(task.task_logs))
+    eval_logs = decompress_logs(resolve_blob(task.eval_logs))
+
+    return {
+        "id": task.id,
+        "job_id": task.job_id,
+        "challenge_id": task.challenge_id,
+        "variant": task.variant,
+        "repeat_index": task.repeat_index,
+        "status": task.status,
+        "error": task.error,
+        "task_input": (
+            {'str': task_input} if isinstance(task_input, str) else task_input
         ),
-        task_output=(
-            {'str': task.task_output}
-            if isinstance(task.task_output, str)
-            else task.task_output
+        "task_output": (
+            {'str': task_output} if isinstance(task_output, str) else task_output
         ),
-        task_details=task.task_details,
-        task_logs={'logs': task.task_logs} if task.task_logs else None,
-        eval_spec=task.eval_spec,
-        eval_passed=task.eval_passed,
-        eval_score=task.eval_score,
-        eval_details=task.eval_details,
-        eval_logs={'logs': task.eval_logs} if task.eval_logs else None,
-        created_at=task.created_at.replace(tzinfo=timezone.utc).isoformat(),
-        executed_at=(
+        "task_details": task.task_details,
+        "task_logs": {'logs': task_logs} if task_logs else None,
+        "eval_spec": task.eval_spec,
+        "eval_passed": task.eval_passed,
+        "eval_score": task.eval_score,
+        "eval_details": task.eval_details,
+        "eval_logs": {'logs': eval_logs} if eval_logs else None,
+        "timings": task.timings,
+        "created_at": task.created_at.replace(tzinfo=timezone.utc).isoformat(),
+        "executed_at": (
             task.executed_at.replace(tzinfo=timezone.utc).isoformat()
             if task.executed_at
             else None
         ),
-        evaluated_at=(
+        "evaluated_at": (
             task.evaluated_at.replace(tzinfo=timezone.utc).isoformat()
             if task.evaluated_at
             else None
         ),
-        finished_at=(
+        "finished_at": (
             task.finished_at.replace(tzinfo=timezone.utc).isoformat()
             if task.finished_at
             else None
         ),
-    )
+    }
 
 
 @api_router.get("/run-details/{run_id}", response_model=FullRunDetails)
-async def get_run_details(run_id: str):
+def get_run_details(run_id: str, request: Request):
     """
     Retrieve detailed information about a specific run, including all associated tasks.
 
+    Finished runs never change: their responses have a strong ETag (from the
+    run ID, finish time and content coding), are cacheable forever by
+    clients, and are kept serialized and compressed in memory for the next
+    requests.
+
     Args:
         run_id (str): The ID of the run.
 
@@ -291,43 +387,99 @@ async def get_run_details(run_id: str):
     Raises:
         HTTPException: If the run or associated project is not found.
     """
-    # Retrieve the job corresponding to the run_id
-    job = JobModel.find(run_id)
-    if not job:
+    # Retrieve the state of the job corresponding to the run_id
+    state = JobModel.find_state(run_id)
+    if not state:
         raise HTTPException(status_code=404, detail="Run not found")
+    project_id, status, finished_at = state
 
     # Retrieve project details associated with the job
-    project = ProjectModel.find(job.project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = _require_project(project_id)
+
+    if finished_at is None:
+        return FastJSONResponse(_build_run_details(run_id, project))
+
+    # Compressed here rather than by the middleware, so that the cache holds
+    # the compressed body of each coding
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    etag = make_etag(
+        RUN_DETAILS_FORMAT, run_id, finished_at.isoformat(), status,
+        project.name, project.description, encoding,
+    )
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE, "Vary": "Accept-Encoding"}
+    response = not_modified(request, etag, IMMUTABLE)
+    if response:
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+    body = run_details_cache.get(etag)
+    if body is None:
+        body = dumps(_build_run_details(run_id, project))
+        if encoding:
+            body = compress(body, encoding)
+        run_details_cache.put(etag, body)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _build_run_details(run_id: str, project: ProjectModel) -> dict:
+    job = JobModel.find(run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Run not found")
 
     # Retrieve all tasks associated with the job
     tasks = TaskModel.list(run_id)
     task_details = [_get_task_details(task) for task in tasks]
 
-    # Construct and return the full run details
-    return FullRunDetails(
-        id=run_id,
-        project=Project(
-            id=project.id,
-            name=project.name,
-            description=project.description
-        ),
-        details=job.details or {},
-        date=job.created_at.replace(tzinfo=timezone.utc).isoformat(),
-        status=job.status,
-        tasks=task_details
-    )
+    # Construct and return the full run details, in the FullRunDetails format
+    return {
+        "id": run_id,
+        "project": {
+            "id": project.id,
+            "name": project.name,
+            "description": project.description,
+        },
+        "details": job.details or {},
+        "date": job.created_at.replace(tzinfo=timezone.utc).isoformat(),
+        "status": job.status,
+        "tasks": task_details,
+    }
+
+
+@api_router.get("/run-challenges/{run_id}", response_model=List[ChallengeStats])
+def get_run_challenges(run_id: str, k: Optional[int] = Query(None, ge=1)):
+    """
+    Retrieve the statistics of each challenge of a run with repeated tasks:
+    pass rate, pass@k, and mean and variance of the scores over its samples.
+
+    Args:
+        run_id (str): The ID of the run.
+        k (int, optional): The k of pass@k. Defaults to the run's.
+
+    Returns:
+        List[ChallengeStats]: Statistics per challenge (and matrix variant).
+
+    Raises:
+        HTTPException: If the run is not found.
+    """
+    job = JobModel.find(run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if k is None:
+        k = ((job.details or {}).get("repeats") or {}).get("k", 1)
+    return job_challenge_stats(run_id, k)
 
 
 @api_router.get(
     "/same-tasks/{project_id}/{challenge_id}", response_model=List[TaskDetails]
 )
-async def get_same_tasks(
+def get_same_tasks(
     project_id: str,
     challenge_id: str,
+    request: Request,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ):
     """
     Find and retrieve tasks within a project that share the same challenge ID.
@@ -337,10 +489,168 @@ async def get_same_tasks(
         challenge_id (str): The challenge ID to search for.
         limit (int, optional): Maximum number of tasks to retrieve. Defaults to 10.
         offset (int, optional): Number of tasks to skip for pagination. Defaults to 0.
+        cursor (str, optional): Value of the `X-Next-Cursor` header of the
+            previous page.
 
     Returns:
         List[TaskDetails]: A list of task details matching the challenge ID.
+        The cursor of the next page is sent in the `X-Next-Cursor` header.
+        An unchanged page gets a 304 response when its ETag is sent back in
+        `If-None-Match`.
     """
     # Retrieve tasks that have the specified challenge ID within the project
-    tasks = TaskModel.find_same_tasks(project_id, challenge_id, limit, offset)
-    return [_get_task_details(task) for task in tasks]
+    try:
+        tasks = TaskModel.find_same_tasks(
+            project_id, challenge_id, limit, offset, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {}
+    if len(tasks) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(tasks[-1])
+
+    # New runs change the list, so clients revalidate, but an unchanged page
+    # is not serialized again
+    etag = make_etag(*(
+        f"{task.id}:{task.status}:{task.finished_at}" for task in tasks
+    ))
+    headers.update({"ETag": etag, "Cache-Control": REVALIDATE})
+    cached = not_modified(request, etag, REVALIDATE)
+    if cached:
+        cached.headers.update(headers)
+        return cached
+    return FastJSONResponse(
+        [_get_task_details(task) for task in tasks], headers=headers
+    )
+
+
+@api_router.get(
+    "/analytics/{project_id}/regressions", response_model=RegressionReport
+)
+def get_regressions(
+    project_id: str,
+    run_id: str,
+    baseline_id: Optional[str] = Query(None),
+):
+    """
+    Compare a run against a baseline run, listing regressed and improved challenges.
+
+    Args:
+        project_id (str): The ID of the project.
+        run_id (str): The ID of the run to check.
+        baseline_id (str, optional): The ID of the baseline run. Defaults to the
+            run before `run_id`.
+
+    Returns:
+        RegressionReport: Challenges that regressed or improved.
+
+    Raises:
+        HTTPException: If a run is not found or there is no baseline.
+    """
+    job = JobModel.get_status(project_id, run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Run not found")
+    baseline_id = baseline_id or analytics.previous_run_id(project_id, job)
+    if not baseline_id:
+        raise HTTPException(status_code=404, detail="No baseline run found")
+
+    matrix = analytics.load_results(project_id, job_ids=[run_id, baseline_id])
+    try:
+        return analytics.compare_runs(matrix, run_id, baseline_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@api_router.get(
+    "/analytics/{project_id}/flaky", response_model=List[FlakyChallenge]
+)
+def get_flaky_challenges(
+    project_id: str,
+    runs: int = Query(50, ge=2, le=1000),
+    limit: int = Query(20, ge=1, le=1000),
+):
+    """
+    Retrieve the most flaky challenges over the recent runs of a project.
+
+    Args:
+        project_id (str): The ID of the project.
+        runs (int, optional): Number of recent runs to analyze. Defaults to 50.
+        limit (int, optional): Maximum number of challenges. Defaults to 20.
+
+    Returns:
+        List[FlakyChallenge]: Challenges ranked by flakiness.
+    """
+    _require_project(project_id)
+    matrix = analytics.load_results(project_id, last_runs=runs)
+    return analytics.flaky_challenges(matrix, limit)
+
+
+@api_router.get(
+    "/analytics/{project_id}/trends", response_model=List[ChallengeTrend]
+)
+def get_score_trends(
+    project_id: str,
+    runs: int = Query(50, ge=2, le=1000),
+    challenge_id: Optional[List[str]] = Query(None),
+):
+    """
+    Retrieve per-challenge score trends over the recent runs of a project.
+
+    Args:
+        project_id (str): The ID of the project.
+        runs (int, optional): Number of recent runs to analyze. Defaults to 50.
+        challenge_id (List[str], optional): Restrict to these challenges.
+
+    Returns:
+        List[ChallengeTrend]: Score series and trend for each challenge.
+    """
+    _require_project(project_id)
+    matrix = analytics.load_results(project_id, last_runs=runs)
+    return analytics.score_trends(matrix, challenge_id)
+
+
+@api_router.get("/compare/{run_a}/{run_b}", response_model=CompareResponse)
+def get_comparison(run_a: str, run_b: str):
+    """
+    Compare two runs task by task (matched on challenge ID).
+
+    Only IDs, statuses, scores and per-criterion changes are returned; use the
+    `/compare-diff` endpoint to diff the outputs of a single pair of tasks.
+
+    Args:
+        run_a (str): The ID of the base run.
+        run_b (str): The ID of the run compared to the base.
+
+    Returns:
+        CompareResponse: Newly failing and passing tasks, score changes and
+        challenges present in only one run.
+
+    Raises:
+        HTTPException: If a run is not found.
+    """
+    for run_id in (run_a, run_b):
+        if not JobModel.find(run_id):
+            raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return compare_runs(run_a, run_b)
+
+
+@api_router.get("/compare-diff/{task_a}/{task_b}", response_model=OutputDiff)
+def get_output_diff(task_a: str, task_b: str):
+    """
+    Compute the unified diff between the outputs of two tasks.
+
+    Args:
+        task_a (str): The ID of the base task.
+        task_b (str): The ID of the compared task.
+
+    Returns:
+        OutputDiff: The unified diff (empty if the outputs are identical).
+
+    Raises:
+        HTTPException: If a task is not found.
+    """
+    try:
+        diff = diff_outputs(task_a, task_b)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return OutputDiff(task_a=task_a, task_b=task_b, diff=diff)
@@ -34,8 +34,8 @@ class RecentRun(BaseModel):
     score: float
     totalTests: int
     pass_: int = Field(alias='pass')  # 'pass' is a Python keyword, so we use an alias
-    fail: int
-    regression: int
+    fail: int  # Failed tasks that are not regressions
+    regression: int  # Tasks that passed in the previous run and fail now
     bookmarked: Optional[bool] = False
     noted: Optional[bool] = False
     created_at: str
@@ -48,6 +48,8 @@ class TaskDetails(BaseModel):
     """
     id: str
     challenge_id: str
+    variant: Optional[str] = None
+    repeat_index: Optional[int] = None
     job_id: str
     status: str
     error: Optional[str] = None
@@ -60,6 +62,7 @@ class TaskDetails(BaseModel):
     eval_score: Optional[float] = None
     eval_details: Optional[Dict] = None
     eval_logs: Optional[Dict] = None
+    timings: Optional[Dict] = None
     created_at: str
     executed_at: Optional[str] = None
     evaluated_at: Optional[str] = None
@@ -84,3 +87,115 @@ class RecentRunsResponse(BaseModel):
     """
     runs: List[RecentRun]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class RegressionReport(BaseModel):
+    """
+    Schema representing regressions and improvements of a run against a baseline.
+    """
+    run_id: str
+    baseline_id: str
+    compared: int
+    regressions: List[str]
+    improvements: List[str]
+
+
+class FlakyChallenge(BaseModel):
+    """
+    Schema representing the flakiness of a challenge across runs.
+    """
+    challenge_id: str
+    runs: int
+    pass_rate: float
+    variance: float
+    flips: int
+    flip_rate: float
+
+
+class ChallengeTrend(BaseModel):
+    """
+    Schema representing the score trend of a challenge across runs.
+    """
+    challenge_id: str
+    runs: int
+    mean: Optional[float] = None
+    latest: Optional[float] = None
+    slope: float
+    scores: List[Optional[float]]
+
+
+class ChallengeStats(BaseModel):
+    """
+    Schema representing the samples of a repeated task in a run.
+    """
+    challenge_id: str
+    variant: Optional[str] = None
+    samples: int
+    passes: int
+    pass_rate: float
+    pass_at_k: Optional[float] = None
+    mean_score: float
+    score_variance: float
+
+
+class CriterionChange(BaseModel):
+    """
+    Schema representing the score change of one checklist criterion.
+    """
+    criterion: Optional[str] = None
+    score_a: Optional[float] = None
+    score_b: Optional[float] = None
+
+
+class TaskComparison(BaseModel):
+    """
+    Schema representing a task matched between two runs.
+    """
+    challenge_id: str
+    variant: Optional[str] = None
+    repeat_index: Optional[int] = None
+    task_a: str
+    task_b: str
+    status_a: str
+    status_b: str
+    score_a: Optional[float] = None
+    score_b: Optional[float] = None
+    delta: Optional[float] = None
+    criteria: Optional[List[CriterionChange]] = None
+
+
+class CompareSummary(BaseModel):
+    """
+    Schema representing the summary of a run comparison.
+    """
+    compared: int
+    newly_failing: int
+    newly_passing: int
+    score_changes: int
+    added: int
+    removed: int
+    mean_delta: float
+
+
+class CompareResponse(BaseModel):
+    """
+    Schema representing the comparison of two runs.
+    """
+    run_a: str
+    run_b: str
+    summary: CompareSummary
+    newly_failing: List[TaskComparison]
+    newly_passing: List[TaskComparison]
+    score_changes: List[TaskComparison]
+    added: List[str]
+    removed: List[str]
+
+
+class OutputDiff(BaseModel):
+    """
+    Schema representing a unified diff between two task outputs.
+    """
+    task_a: str
+    task_b: str
+    diff: str
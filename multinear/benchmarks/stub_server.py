@@ -0,0 +1,155 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class StubLLMServer:
+    """
+    Local OpenAI-compatible chat completions server for benchmarks.
+
+    Responds to `POST /v1/chat/completions` after a configurable latency (plus
+    uniform jitter), failing a configurable share of requests with HTTP 500.
+    Requests for the `evaluate_checklist` tool get a tool call that passes every
+    checklist item, so the checklist judge can be benchmarked offline.
+
+    Args:
+        latency: Base response time in seconds.
+        jitter: Maximum extra random response time in seconds.
+        error_rate: Share of requests (0-1) answered with an error.
+        seed: Seed for jitter and errors, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _next_request(self):
+        """
+        Count a request and decide its delay and whether it fails.
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                delay, failed = server._next_request()
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    self._send(500, {"error": {"message": "Stub error", "type": "server_error"}})
+                elif self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(200, _completion(request))
+                else:
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def _completion(request: dict) -> dict:
+    """
+    Build a chat completion response for a request.
+    """
+    messages = request.get("messages", [])
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    tool_names = [
+        tool.get("function", {}).get("name") for tool in request.get("tools") or []
+    ]
+
+    message = {"role": "assistant", "content": None}
+    if "evaluate_checklist" in tool_names:
+        message["tool_calls"] = [{
+            "id": "call_stub",
+            "type": "function",
+            "function": {
+                "name": "evaluate_checklist",
+                "arguments": json.dumps(_checklist_evaluation(prompt)),
+            },
+        }]
+        finish_reason = "tool_calls"
+    else:
+        message["content"] = f"Stub answer to: {prompt[:200]}"
+        finish_reason = "stop"
+
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 10,
+                  "total_tokens": len(prompt) // 4 + 10},
+    }
+
+
+def _checklist_evaluation(prompt: str) -> dict:
+    """
+    Pass every item of the YAML checklist rendered into the judge prompt.
+    """
+    match = re.search(r"Checklist:\s*(.*?)\s*Submission:", prompt, re.S)
+    items = re.findall(r"^- (.+)$", match.group(1), re.M) if match else []
+    evaluations = [
+        {"criterion": item.strip(), "score": 1, "rationale": "Stub evaluation"}
+        for item in items
+    ]
+    return {"evaluations": evaluations, "overall_score": 1 if evaluations else 0}
@@ -0,0 +1,398 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .stub_server import StubLLMServer
+from .synthetic import create_project, populate_run
+from ..utils.stats import summarize
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process, if it can be measured.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# Dependencies that the CLI must not import at startup (they are only needed
+# by some commands, which import them lazily)
+HEAVY_MODULES = (
+    "autoevals", "openai", "braintrust_core", "uvicorn", "fastapi",
+    "sqlalchemy", "numpy", "jinja2", "prometheus_client",
+)
+
+_STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import multinear.cli.main
+print(time.perf_counter() - start)
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def measure_cli_startup(runs: int = 5) -> Dict[str, Any]:
+    """
+    Time importing the CLI entry point in fresh interpreters.
+
+    Returns:
+        Import time percentiles (seconds) and the heavy dependencies imported
+        at startup (should be empty).
+    """
+    script = _STARTUP_SCRIPT.format(modules=HEAVY_MODULES)
+    durations = []
+    heavy = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+        durations.append(float(output[0]))
+        if len(output) > 1:
+            heavy.update(m for m in output[1].split(",") if m)
+    return {"import_seconds": summarize(durations), "heavy_modules": sorted(heavy)}
+
+
+def _dir_size(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+@contextmanager
+def _working_directory(path: Path):
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _stage_latencies(job_id: str) -> Dict[str, Dict[str, float]]:
+    """
+    Per-task stage durations of a job, from the timestamps stored with each task.
+    """
+    from ..engine.storage import TaskModel, db_context
+
+    with db_context() as db:
+        rows = (db.query(
+                    TaskModel.created_at,
+                    TaskModel.executed_at,
+                    TaskModel.evaluated_at,
+                    TaskModel.finished_at,
+                )
+                .filter(TaskModel.job_id == job_id)
+                .all())
+
+    execute, evaluate, total = [], [], []
+    for created_at, executed_at, evaluated_at, finished_at in rows:
+        if executed_at:
+            execute.append((executed_at - created_at).total_seconds())
+        if executed_at and evaluated_at:
+            evaluate.append((evaluated_at - executed_at).total_seconds())
+        if finished_at:
+            total.append((finished_at - created_at).total_seconds())
+    return {
+        "execute": summarize(execute),
+        "evaluate": summarize(evaluate),
+        "task": summarize(total),
+    }
+
+
+def _bench_api(
+    project_id: str, job_id: str, requests: int, concurrency: int
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure API endpoint latencies with in-process clients.
+    """
+    from fastapi.testclient import TestClient
+    from ..main import app
+
+    endpoints = {
+        "runs": f"/api/runs/{project_id}?limit=10",
+        "job_status": f"/api/jobs/{project_id}/{job_id}/status",
+        "run_details": f"/api/run-details/{job_id}",
+        "same_tasks": f"/api/same-tasks/{project_id}/task-0",
+    }
+
+    def worker(path: str, count: int) -> List[float]:
+        client = TestClient(app)
+        durations = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get(path)
+            durations.append(time.perf_counter() - start)
+            response.raise_for_status()
+        return durations
+
+    results = {}
+    for name, path in endpoints.items():
+        per_worker = max(1, requests // concurrency)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(worker, path, per_worker) for _ in range(concurrency)]
+            durations = [d for future in futures for d in future.result()]
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            **summarize(durations),
+            "requests_per_sec": len(durations) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+@contextmanager
+def _api_server():
+    """
+    Serve the API with uvicorn on a free local port, in a background thread.
+
+    Yields:
+        The base URL of the server.
+    """
+    import socket
+    import threading
+    import uvicorn
+    from ..main import app
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+def _bench_dashboard(
+    project_id: str, job_id: str, users: int, requests: int
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure API latencies under concurrent dashboard users, against a real
+    server (a single event loop, unlike the in-process clients of `_bench_api`).
+
+    Each user opens the run page (run details) and then polls the job status
+    and the recent runs, as the frontend does, so slow run details requests
+    show up in the latency of the polls if they block other requests.
+    """
+    import httpx
+
+    status_path = f"/api/jobs/{project_id}/{job_id}/status"
+    page = [
+        ("run_details", f"/api/run-details/{job_id}"),
+        ("status", status_path),
+        ("runs", f"/api/runs/{project_id}?limit=10"),
+        ("status", status_path),
+    ]
+
+    def user(base_url: str) -> Dict[str, List[float]]:
+        durations: Dict[str, List[float]] = {}
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            for i in range(requests):
+                name, path = page[i % len(page)]
+                start = time.perf_counter()
+                client.get(path).raise_for_status()
+                durations.setdefault(name, []).append(time.perf_counter() - start)
+        return durations
+
+    with _api_server() as base_url:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            per_user = [f.result() for f in [pool.submit(user, base_url) for _ in range(users)]]
+        elapsed = time.perf_counter() - start
+
+    results = {}
+    for name, _ in page:
+        durations = [d for durations in per_user for d in durations.get(name, [])]
+        results[name] = {
+            **summarize(durations),
+            "requests_per_sec": len(durations) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def run_benchmark(
+    tasks: int,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    output_size: int = 500,
+    api_requests: int = 20,
+    api_concurrency: int = 1,
+    dashboard_users: int = 0,
+    seed: int = 0,
+    workdir: Optional[Path] = None,
+    keep: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run one benchmark scenario end to end.
+
+    Starts a stub LLM server, creates a synthetic project with `tasks` tasks,
+    runs a job through the same code path as the web server (run_experiment,
+    checklist evaluation, storage), then exercises the read API endpoints,
+    in process and, with `dashboard_users`, through a server with concurrent
+    users.
+
+    Returns:
+        A JSON-serializable dict with the scenario parameters, throughput,
+        per-stage latency percentiles (seconds), storage sizes and peak RSS.
+    """
+    from ..api.router import background_job
+    from ..engine.storage import JobModel, TaskStatus, DATABASE_PATH, init_project_db
+
+    folder = Path(workdir or tempfile.mkdtemp(prefix="multinear-bench-"))
+    result: Dict[str, Any] = {
+        "scenario": {
+            "tasks": tasks,
+            "latency": latency,
+            "jitter": jitter,
+            "error_rate": error_rate,
+            "output_size": output_size,
+            "api_concurrency": api_concurrency,
+            "dashboard_users": dashboard_users,
+            "seed": seed,
+        },
+    }
+
+    previous_env = {k: os.environ.get(k) for k in ("OPENAI_BASE_URL", "OPENAI_API_KEY")}
+    server = StubLLMServer(latency, jitter, error_rate, seed=seed).start()
+    try:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ["OPENAI_API_KEY"] = "stub"
+        create_project(folder, tasks, output_size=output_size, seed=seed)
+
+        with _working_directory(folder):
+            project_id = init_project_db()
+            job_id = JobModel.start(project_id)
+
+            # Task prints are still captured, but not echoed to the terminal
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                start = time.perf_counter()
+                background_job(project_id, job_id)
+                elapsed = time.perf_counter() - start
+
+            job = JobModel.find(job_id)
+            status_map = (job.details or {}).get("status_map", {})
+            result["run"] = {
+                "status": job.status,
+                "seconds": elapsed,
+                "tasks_per_sec": tasks / elapsed if elapsed else 0.0,
+                "failed_tasks": sum(
+                    1 for status in status_map.values() if status == TaskStatus.FAILED
+                ),
+            }
+            result["stages"] = _stage_latencies(job_id)
+            # Stage timings measured in-process by the run itself
+            result["timings"] = (job.details or {}).get("timings")
+            if api_requests:
+                result["api"] = _bench_api(
+                    project_id, job_id, api_requests, api_concurrency
+                )
+            if api_requests and dashboard_users:
+                result["dashboard"] = _bench_dashboard(
+                    project_id, job_id, dashboard_users, api_requests
+                )
+            result["storage"] = {
+                "db_bytes": DATABASE_PATH.stat().st_size,
+                "blob_bytes": _dir_size(Path(".multinear") / "blobs"),
+            }
+        result["llm"] = {"requests": server.requests, "errors": server.errors}
+        result["peak_rss_bytes"] = peak_rss_bytes()
+        if keep:
+            result["workdir"] = str(folder)
+    finally:
+        server.stop()
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if not keep and workdir is None:
+            shutil.rmtree(folder, ignore_errors=True)
+    return result
+
+
+def measure_run_details(
+    tasks: int = 10000,
+    output_size: int = 500,
+    requests: int = 5,
+    workdir: Optional[Path] = None,
+    keep: bool = False,
+) -> Dict[str, Any]:
+    """
+    Benchmark loading the details of a finished run with `tasks` tasks, stored
+    directly in the database (see `populate_run`) rather than run.
+
+    For each content coding the client can accept, measures requests served
+    cold (the response cache is cleared before each one, so the payload is
+    built, serialized and compressed) and from the response cache.
+
+    Returns:
+        A JSON-serializable dict with the number of tasks and, per coding, the
+        response size in bytes and the cold and cached latency percentiles
+        (seconds).
+    """
+    from fastapi.testclient import TestClient
+    from ..api.cache import run_details_cache
+    from ..api.compression import brotli
+    from ..engine.storage import JobModel, init_project_db
+
+    folder = Path(workdir or tempfile.mkdtemp(prefix="multinear-bench-"))
+    result: Dict[str, Any] = {"tasks": tasks, "output_size": output_size, "codings": {}}
+    try:
+        create_project(folder, 1, output_size=output_size)
+        with _working_directory(folder):
+            project_id = init_project_db()
+            job_id = JobModel.start(project_id)
+            populate_run(job_id, tasks, output_size=output_size)
+            JobModel.find(job_id).finish()
+
+            from ..main import app
+
+            client = TestClient(app)
+            path = f"/api/run-details/{job_id}"
+            codings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+            for coding in codings:
+                headers = {"Accept-Encoding": coding}
+                cold, cached = [], []
+                for _ in range(requests):
+                    run_details_cache.clear()
+                    start = time.perf_counter()
+                    response = client.get(path, headers=headers)
+                    cold.append(time.perf_counter() - start)
+                    response.raise_for_status()
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    client.get(path, headers=headers).raise_for_status()
+                    cached.append(time.perf_counter() - start)
+                result["codings"][coding] = {
+                    "bytes": int(response.headers["content-length"]),
+                    "cold": summarize(cold),
+                    "cached": summarize(cached),
+                }
+        if keep:
+            result["workdir"] = str(folder)
+    finally:
+        if not keep and workdir is None:
+            shutil.rmtree(folder, ignore_errors=True)
+    return result
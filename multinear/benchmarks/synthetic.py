@@ -0,0 +1,145 @@
+import random
+from pathlib import Path
+
+import yaml
+
+
+TASK_RUNNER = '''\
+import os
+from openai import OpenAI
+
+# The benchmark points OPENAI_BASE_URL to the stub LLM server
+_client = OpenAI(base_url=os.environ["OPENAI_BASE_URL"], api_key="stub")
+OUTPUT_SIZE = {output_size}
+
+
+def run_task(input):
+    response = _client.chat.completions.create(
+        model="stub-model",
+        messages=[{{"role": "user", "content": input}}],
+    )
+    output = response.choices[0].message.content
+    # Pad the output to the configured size
+    if len(output) < OUTPUT_SIZE:
+        output = (output + " ") * (OUTPUT_SIZE // (len(output) + 1) + 1)
+    output = output[:OUTPUT_SIZE]
+    print(f"Answered with {{len(output)}} characters")
+    return {{"output": output, "details": {{"model": "stub-model"}}}}
+'''
+
+
+def create_project(
+    folder: Path,
+    n_tasks: int,
+    output_size: int = 500,
+    checklist_items: int = 3,
+    seed: int = 0,
+) -> Path:
+    """
+    Create a synthetic multinear project with `n_tasks` checklist tasks.
+
+    The task runner calls an OpenAI-compatible server at `OPENAI_BASE_URL`
+    (see `StubLLMServer`) and returns an output of `output_size` characters.
+
+    Returns:
+        The project folder.
+    """
+    rng = random.Random(seed)
+    folder = Path(folder)
+    multinear_dir = folder / ".multinear"
+    multinear_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    for i in range(n_tasks):
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 20)))
+        tasks.append({
+            "id": f"task-{i}",
+            "input": f"Question {i}: {words}?",
+            "min_score": 1.0,
+            "checklist": [
+                f"The answer mentions {rng.choice(_WORDS)}"
+                for _ in range(checklist_items)
+            ],
+        })
+
+    config = {
+        "project": {
+            "id": "benchmark",
+            "name": "Benchmark",
+            "description": f"Synthetic benchmark project with {n_tasks} tasks",
+        },
+        "tasks": tasks,
+    }
+    with open(multinear_dir / "config.yaml", "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    with open(multinear_dir / "task_runner.py", "w") as f:
+        f.write(TASK_RUNNER.format(output_size=output_size))
+    return folder
+
+
+def populate_run(
+    job_id: str,
+    n_tasks: int,
+    output_size: int = 500,
+    checklist_items: int = 3,
+    seed: int = 0,
+):
+    """
+    Store `n_tasks` finished checklist tasks for a job directly in the
+    database, shaped like those of a real run, without running them. Used to
+    benchmark reading large runs without waiting for them to execute.
+    """
+    from datetime import datetime, timezone
+    from ..engine.storage import TaskModel, TaskStatus, db_context
+    from ..utils.capture import compress_logs
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n_tasks):
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 20)))
+        question = f"Question {i}: {words}?"
+        output = (f"Stub answer to: {question} " * (output_size // len(question) + 1))
+        criteria = [
+            f"The answer mentions {rng.choice(_WORDS)}" for _ in range(checklist_items)
+        ]
+        evaluations = [
+            {"criterion": c, "score": float(rng.random() < 0.9), "rationale": "Stub evaluation"}
+            for c in criteria
+        ]
+        score = sum(e["score"] for e in evaluations) / checklist_items
+        rows.append({
+            "id": f"{job_id}-{i}",
+            "job_id": job_id,
+            "challenge_id": f"task-{i}",
+            "task_number": i + 1,
+            "status": TaskStatus.COMPLETED if score >= 1.0 else TaskStatus.FAILED,
+            "task_input": question,
+            "task_output": output[:output_size],
+            "task_details": {"model": "stub-model"},
+            "task_logs": compress_logs([{
+                "level": "INFO",
+                "message": f"Answered with {output_size} characters",
+                "timestamp": now.timestamp(),
+                "module": "task_runner",
+            }]),
+            "eval_spec": {"id": f"task-{i}", "input": question, "checklist": criteria},
+            "eval_passed": score >= 1.0,
+            "eval_score": score,
+            "eval_details": {"evaluations": evaluations, "overall_score": score},
+            "timings": {"execute": rng.uniform(0.5, 2.0), "evaluate": rng.uniform(0.1, 0.5)},
+            "created_at": now,
+            "executed_at": now,
+            "evaluated_at": now,
+            "finished_at": now,
+        })
+    with db_context() as db:
+        db.bulk_insert_mappings(TaskModel, rows)
+        db.commit()
+
+
+_WORDS = (
+    "model prompt latency token answer question context summary policy "
+    "customer refund invoice shipping account password language translation "
+    "weather recipe schedule meeting contract budget report"
+).split()
@@ -0,0 +1,139 @@
+from rich.console import Console
+from rich.table import Table
+
+from .details import find_run_by_partial_id
+from ..utils import get_current_project, get_score_color
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'analytics', help='Analyze results across runs'
+    )
+    parser.add_argument(
+        'report', choices=['regressions', 'flaky', 'trends'],
+        help='regressions: compare a run to a baseline; flaky: tasks that flip '
+             'between pass and fail; trends: score trend per task'
+    )
+    parser.add_argument(
+        '--run', type=str, default=None,
+        help='Run to check for regressions (default: the latest run)'
+    )
+    parser.add_argument(
+        '--baseline', type=str, default=None,
+        help='Baseline run for regressions (default: the run before --run)'
+    )
+    parser.add_argument(
+        '--runs', type=int, default=50,
+        help='Number of recent runs to analyze for flaky and trends'
+    )
+    parser.add_argument(
+        '--limit', type=int, default=20, help='Maximum number of tasks to show'
+    )
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    from ...engine import analytics
+
+    project = get_current_project()
+    if not project:
+        return
+    console = Console()
+
+    if args.report == 'regressions':
+        _print_regressions(console, project, args)
+    elif args.report == 'flaky':
+        matrix = analytics.load_results(project.id, last_runs=args.runs)
+        _print_flaky(console, analytics.flaky_challenges(matrix, args.limit))
+    else:
+        matrix = analytics.load_results(project.id, last_runs=args.runs)
+        trends = analytics.score_trends(matrix)
+        # Show the tasks that degrade the most first
+        trends.sort(key=lambda trend: trend["slope"])
+        _print_trends(console, trends[:args.limit])
+
+
+def _find_run(console, project, partial_id):
+    from ...engine.storage import JobModel
+
+    if partial_id:
+        job = find_run_by_partial_id(partial_id)
+    else:
+        jobs = JobModel.list_recent(project.id, limit=1)
+        job = jobs[0] if jobs else None
+    if not job:
+        console.print(f"[red]Error:[/red] No run found matching ID '{partial_id}'")
+    return job
+
+
+def _print_regressions(console, project, args):
+    from ...engine import analytics
+
+    job = _find_run(console, project, args.run)
+    if not job:
+        return
+    if args.baseline:
+        baseline = _find_run(console, project, args.baseline)
+        if not baseline:
+            return
+        baseline_id = baseline.id
+    else:
+        baseline_id = analytics.previous_run_id(project.id, job)
+        if not baseline_id:
+            console.print("[red]Error:[/red] No baseline run found")
+            return
+
+    matrix = analytics.load_results(project.id, job_ids=[job.id, baseline_id])
+    report = analytics.compare_runs(matrix, job.id, baseline_id)
+
+    console.print(
+        f"\n[bold]Run {job.id[-8:]} vs baseline {baseline_id[-8:]}[/bold] "
+        f"({report['compared']} tasks compared)"
+    )
+    for title, color, key in [
+        ("Regressions", "red", "regressions"),
+        ("Improvements", "green", "improvements"),
+    ]:
+        console.print(f"\n[bold {color}]{title}: {len(report[key])}[/bold {color}]")
+        for challenge_id in report[key][:args.limit]:
+            console.print(f"  {challenge_id}")
+        if len(report[key]) > args.limit:
+            console.print(f"  ... and {len(report[key]) - args.limit} more")
+
+
+def _print_flaky(console, flaky):
+    table = Table(title="Flaky Tasks", show_header=True, header_style="bold cyan")
+    table.add_column("Task", style="dim")
+    table.add_column("Runs", justify="right")
+    table.add_column("Pass Rate", justify="right")
+    table.add_column("Flips", justify="right")
+    table.add_column("Flip Rate", justify="right")
+    for item in flaky:
+        table.add_row(
+            item["challenge_id"],
+            str(item["runs"]),
+            f"[{get_score_color(item['pass_rate'])}]{item['pass_rate']:.2f}[/]",
+            str(item["flips"]),
+            f"{item['flip_rate']:.2f}",
+        )
+    console.print(table)
+
+
+def _print_trends(console, trends):
+    table = Table(title="Score Trends", show_header=True, header_style="bold cyan")
+    table.add_column("Task", style="dim")
+    table.add_column("Runs", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Latest", justify="right")
+    table.add_column("Trend / Run", justify="right")
+    for item in trends:
+        slope = item["slope"]
+        slope_color = "red" if slope < 0 else "green" if slope > 0 else "white"
+        table.add_row(
+            item["challenge_id"],
+            str(item["runs"]),
+            f"{item['mean']:.2f}" if item["mean"] is not None else "-",
+            f"{item['latest']:.2f}" if item["latest"] is not None else "-",
+            f"[{slope_color}]{slope:+.3f}[/]",
+        )
+    console.print(table)
@@ -0,0 +1,211 @@
+import json
+import sys
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+from ..utils import format_bytes
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'bench', help="Benchmark multinear's own overhead against a stub LLM server"
+    )
+    parser.add_argument(
+        '--tasks', type=int, nargs='+', default=[100],
+        help='Number of synthetic tasks; several values run several scenarios'
+    )
+    parser.add_argument(
+        '--latency', type=float, default=0.0,
+        help='Stub LLM response time in seconds'
+    )
+    parser.add_argument(
+        '--jitter', type=float, default=0.0,
+        help='Maximum extra random stub response time in seconds'
+    )
+    parser.add_argument(
+        '--error-rate', type=float, default=0.0,
+        help='Share of stub LLM requests that fail (0-1)'
+    )
+    parser.add_argument(
+        '--output-size', type=int, default=500,
+        help='Size of each task output in characters'
+    )
+    parser.add_argument(
+        '--api-requests', type=int, default=20,
+        help='Requests per API endpoint (0 to skip the API benchmark)'
+    )
+    parser.add_argument(
+        '--api-concurrency', type=int, default=1,
+        help='Concurrent clients for the API benchmark'
+    )
+    parser.add_argument(
+        '--dashboard-users', type=int, default=0,
+        help=(
+            'Concurrent dashboard users (run page and status polls) against a '
+            'local server; each sends --api-requests requests'
+        )
+    )
+    parser.add_argument(
+        '--run-details', type=int, default=0, metavar='TASKS',
+        help=(
+            'Also benchmark loading a finished run with this many tasks '
+            '(e.g. 10000), per response coding'
+        )
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument(
+        '--json', type=Path, default=None, metavar='PATH',
+        help='Write machine-readable results to this file'
+    )
+    parser.add_argument(
+        '--keep', action='store_true',
+        help='Keep the synthetic project folders for inspection'
+    )
+    parser.add_argument(
+        '--startup-budget', type=float, default=None, metavar='SECONDS',
+        help=(
+            'Fail if importing the CLI takes longer than this (median) or pulls '
+            'in heavy dependencies'
+        )
+    )
+    parser.add_argument(
+        '--startup-only', action='store_true',
+        help=(
+            'Only measure CLI startup (and check --startup-budget), without '
+            'running the benchmark; fast enough for CI'
+        )
+    )
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    # Imported here, as the benchmark pulls in the whole engine and API
+    from ...benchmarks.suite import measure_cli_startup, measure_run_details, run_benchmark
+
+    console = Console()
+
+    startup = measure_cli_startup()
+    median = startup["import_seconds"]["p50"]
+    console.print(
+        f"CLI import time: {_ms(median)} ms (p50), heavy modules: "
+        f"{', '.join(startup['heavy_modules']) or 'none'}"
+    )
+    over_budget = args.startup_budget is not None and (
+        median > args.startup_budget or startup["heavy_modules"]
+    )
+    if args.startup_only:
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"startup": startup}, f, indent=2)
+        _check_startup_budget(console, args.startup_budget, over_budget)
+        return
+
+    results = []
+    for tasks in args.tasks:
+        console.print(f"Running benchmark with {tasks} tasks...")
+        result = run_benchmark(
+            tasks,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            output_size=args.output_size,
+            api_requests=args.api_requests,
+            api_concurrency=args.api_concurrency,
+            dashboard_users=args.dashboard_users,
+            seed=args.seed,
+            keep=args.keep,
+        )
+        results.append(result)
+        _print_result(console, result)
+
+    run_details = None
+    if args.run_details:
+        console.print(f"\nBenchmarking run details with {args.run_details} tasks...")
+        run_details = measure_run_details(
+            args.run_details,
+            output_size=args.output_size,
+            requests=max(1, min(args.api_requests, 5)),
+            keep=args.keep,
+        )
+        _print_run_details(console, run_details)
+
+    if args.json:
+        output = {"startup": startup, "results": results}
+        if run_details:
+            output["run_details"] = run_details
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+        console.print(f"\nResults written to {args.json}")
+
+    _check_startup_budget(console, args.startup_budget, over_budget)
+
+
+def _check_startup_budget(console, budget, over_budget):
+    if over_budget:
+        console.print(
+            f"[red]CLI startup exceeds the budget of {budget}s "
+            "or imports heavy dependencies[/red]"
+        )
+        sys.exit(1)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}"
+
+
+def _print_result(console, result):
+    run = result["run"]
+    console.print(
+        f"\n[bold]{result['scenario']['tasks']} tasks[/bold]: "
+        f"{run['tasks_per_sec']:.1f} tasks/s, {run['seconds']:.2f}s total, "
+        f"status {run['status']}, {run['failed_tasks']} failed tasks"
+    )
+
+    table = Table(title="Latency (ms)", show_header=True, header_style="bold cyan")
+    table.add_column("Stage")
+    for column in ["p50", "p95", "p99", "max"]:
+        table.add_column(column, justify="right")
+    table.add_column("req/s", justify="right")
+
+    for name, stats in result["stages"].items():
+        table.add_row(
+            name, *[_ms(stats[k]) for k in ["p50", "p95", "p99", "max"]], ""
+        )
+    for group in ("api", "dashboard"):
+        for name, stats in result.get(group, {}).items():
+            table.add_row(
+                f"{group}:{name}",
+                *[_ms(stats[k]) for k in ["p50", "p95", "p99", "max"]],
+                f"{stats['requests_per_sec']:.1f}",
+            )
+    console.print(table)
+
+    storage = result["storage"]
+    rss = result["peak_rss_bytes"]
+    console.print(
+        f"DB size: {format_bytes(storage['db_bytes'])}, "
+        f"blobs: {format_bytes(storage['blob_bytes'])}, "
+        f"peak RSS: {format_bytes(rss) if rss else 'n/a'}, "
+        f"LLM requests: {result['llm']['requests']} ({result['llm']['errors']} errors)"
+    )
+
+
+def _print_run_details(console, result):
+    table = Table(
+        title=f"Run details ({result['tasks']} tasks)",
+        show_header=True,
+        header_style="bold cyan",
+    )
+    table.add_column("Coding")
+    table.add_column("Size", justify="right")
+    table.add_column("cold p50 (ms)", justify="right")
+    table.add_column("cached p50 (ms)", justify="right")
+    for coding, stats in result["codings"].items():
+        table.add_row(
+            coding,
+            format_bytes(stats["bytes"]),
+            _ms(stats["cold"]["p50"]),
+            _ms(stats["cached"]["p50"]),
+        )
+    console.print(table)
@@ -0,0 +1,115 @@
+from rich.console import Console
+from rich.table import Table
+
+from .details import find_run_by_partial_id
+from ..utils import format_task_status
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'compare', help='Compare two runs task by task'
+    )
+    parser.add_argument('run_a', help='Partial or full ID of the base run')
+    parser.add_argument('run_b', help='Partial or full ID of the compared run')
+    parser.add_argument(
+        '--diff', type=str, metavar='CHALLENGE_ID', default=None,
+        help='Show the output diff for this task (challenge ID)'
+    )
+    parser.add_argument(
+        '--variant', type=str, default=None,
+        help='Matrix variant of the task to diff (for matrix runs)'
+    )
+    parser.add_argument(
+        '--limit', type=int, default=20,
+        help='Maximum number of tasks to show per section'
+    )
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    from rich.syntax import Syntax
+    from ...engine.compare import compare_runs, diff_challenge
+
+    console = Console()
+    jobs = []
+    for partial_id in (args.run_a, args.run_b):
+        job = find_run_by_partial_id(partial_id)
+        if not job:
+            console.print(f"[red]Error:[/red] No run found matching ID '{partial_id}'")
+            return
+        jobs.append(job)
+    job_a, job_b = jobs
+
+    if args.diff:
+        try:
+            diff = diff_challenge(job_a.id, job_b.id, args.diff, variant=args.variant)
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            return
+        if diff:
+            console.print(Syntax(diff, "diff", word_wrap=True))
+        else:
+            console.print("Outputs are identical")
+        return
+
+    result = compare_runs(job_a.id, job_b.id)
+
+    summary = result["summary"]
+    console.print(
+        f"\n[bold]Run {job_a.id[-8:]} -> {job_b.id[-8:]}[/bold] "
+        f"({summary['compared']} tasks compared, "
+        f"mean score change {summary['mean_delta']:+.3f})"
+    )
+    console.print(
+        f"[red]Newly failing: {summary['newly_failing']}[/red]  "
+        f"[green]Newly passing: {summary['newly_passing']}[/green]  "
+        f"Score changes: {summary['score_changes']}  "
+        f"Added: {summary['added']}  Removed: {summary['removed']}"
+    )
+
+    for title, key in [
+        ("Newly Failing", "newly_failing"),
+        ("Newly Passing", "newly_passing"),
+        ("Score Changes", "score_changes"),
+    ]:
+        entries = result[key]
+        if not entries:
+            continue
+        table = Table(title=f"\n{title}", show_header=True, header_style="bold cyan")
+        table.add_column("Task", style="dim")
+        table.add_column("Status")
+        table.add_column("Score", justify="right")
+        table.add_column("Criteria Changed")
+        for entry in entries[:args.limit]:
+            table.add_row(
+                _task_label(entry),
+                f"{format_task_status(entry['status_a'])} -> "
+                f"{format_task_status(entry['status_b'])}",
+                f"{entry['score_a'] or 0:.2f} -> {entry['score_b'] or 0:.2f}",
+                "\n".join(
+                    f"{c['criterion']}: {_score(c['score_a'])} -> {_score(c['score_b'])}"
+                    for c in entry.get("criteria", [])
+                ),
+            )
+        console.print(table)
+        if len(entries) > args.limit:
+            console.print(f"... and {len(entries) - args.limit} more")
+
+    console.print(
+        "\nShow an output diff with: multinear compare "
+        f"{job_a.id[-8:]} {job_b.id[-8:]} --diff <task>",
+        highlight=False,
+    )
+
+
+def _score(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def _task_label(entry):
+    label = entry["challenge_id"]
+    if entry.get("variant"):
+        label += f" [{entry['variant']}]"
+    if entry.get("repeat_index") is not None:
+        label += f" #{entry['repeat_index'] + 1}"
+    return label
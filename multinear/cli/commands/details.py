@@ -1,15 +1,24 @@
 from datetime import timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from rich.console import Console
 from rich.table import Table
 
 from ..utils import (
     format_duration,
+    format_estimate,
+    format_repeats,
     get_score_color,
     format_task_status,
-    get_current_project
+    get_current_project,
+    variants_table,
 )
-from ...engine.storage import JobModel, ProjectModel, TaskModel
+
+if TYPE_CHECKING:
+    from ...engine.storage import JobModel
+
+
+# Rows of the tasks overview loaded and printed at a time
+OVERVIEW_BATCH = 500
 
 
 def add_parser(subparsers):
@@ -32,9 +41,17 @@ def handle(args):
 
 
 def print_details(console, job):
-    """Extracted function to print all details to the given console"""
+    """
+    Print all details of a run to the given console.
+
+    Tasks are loaded from the database in batches and printed a batch at a
+    time (the overview table too), so with a console writing to a file, the
+    report is streamed to disk.
+    """
+    from ...engine.storage import ProjectModel, TaskModel
+
     project = ProjectModel.find(job.project_id)
-    tasks = TaskModel.list(job.id)
+    overview = TaskModel.overview(job.id)
 
     # Header
     console.print(f"\n[bold]Run: {job.id[-8:]} (Full ID: {job.id})[/bold]")
@@ -47,141 +64,272 @@ def print_details(console, job):
     summary.add_column("Value")
 
     summary.add_row("Status", format_task_status(job.status))
-    summary.add_row("Total Tasks", str(len(tasks)))
+    summary.add_row("Total Tasks", str(overview["tasks"]))
     summary.add_row("Model", job.details.get("model", "N/A") if job.details else "N/A")
+    if job.details and job.details.get("git_revision"):
+        revision = job.details["git_revision"][:12]
+        if job.details.get("git_dirty"):
+            revision += " (dirty)"
+        summary.add_row("Revision", revision)
+    if job.details and job.details.get("config_hash"):
+        summary.add_row("Config Hash", job.details["config_hash"][:12])
+    if job.details and job.details.get("profile_dir"):
+        summary.add_row("Profile", job.details["profile_dir"])
+    if job.details and job.details.get("early_stop"):
+        early_stop = job.details["early_stop"]
+        summary.add_row("Stopped Early", early_stop["reason"])
+        summary.add_row("Tasks Not Run", str(early_stop["skipped"]))
+    if job.details and job.details.get("sample"):
+        sample = job.details["sample"]
+        summary.add_row(
+            "Sample",
+            f"{sample['size']} of {sample['population']} tasks, "
+            f"{len(sample['strata'])} strata, seed {sample['seed']}"
+            + (", by variance" if sample.get("by_variance") else ""),
+        )
+    if job.details and job.details.get("estimate"):
+        summary.add_row("Estimated Pass Rate", format_estimate(job.details["estimate"]))
+    if job.details and job.details.get("repeats"):
+        summary.add_row("Repeated Tasks", format_repeats(job.details["repeats"]))
+    if job.details and job.details.get("evaluation"):
+        evaluation = job.details["evaluation"]
+        summary.add_row(
+            "Decided By",
+            ", ".join(
+                f"{tier} {count}" for tier, count in evaluation["tiers"].items() if count
+            ) or "-",
+        )
+        summary.add_row("Judge Calls Avoided", str(evaluation["judge_calls_avoided"]))
+        if "criteria_cached" in evaluation:
+            summary.add_row("Cached Criteria", str(evaluation["criteria_cached"]))
 
     console.print("\n[bold]Summary[/bold]")
     console.print(summary)
 
-    # Tasks Table
-    tasks_table = Table(
-        title="\nTasks",
-        show_header=True,
-        header_style="bold cyan"
-    )
-
-    tasks_table.add_column("Task ID", style="dim")
-    tasks_table.add_column("Started")
-    tasks_table.add_column("Duration")
-    tasks_table.add_column("Model")
-    tasks_table.add_column("Status")
-    tasks_table.add_column("Score", justify="right")
-
-    for task in tasks:
-        # Format duration
-        duration = format_duration(
-            task.created_at.replace(tzinfo=timezone.utc).isoformat(),
-            (
-                task.finished_at.replace(tzinfo=timezone.utc).isoformat()
-                if task.finished_at
-                else None
-            ),
+    # Scoreboard of a matrix run
+    if job.details and job.details.get("variants"):
+        console.print(variants_table(job.details["variants"]))
+
+    # Samples of repeated tasks, aggregated per challenge
+    if job.details and job.details.get("repeats"):
+        print_challenge_stats(console, job)
+
+    # Stage timings
+    timings = (job.details or {}).get("timings")
+    if timings and timings.get("stages"):
+        timings_table = Table(
+            title="\nTimings (seconds)",
+            show_header=True,
+            header_style="bold cyan"
         )
+        timings_table.add_column("Stage")
+        for column in ("Tasks", "Mean", "p50", "p95", "p99", "Max"):
+            timings_table.add_column(column, justify="right")
+        for stage, stats in timings["stages"].items():
+            timings_table.add_row(
+                stage,
+                str(stats["count"]),
+                *(f"{stats[key]:.3f}" for key in ("mean", "p50", "p95", "p99", "max"))
+            )
+        console.print(timings_table)
+        if "load" in timings:
+            console.print(f"Task runner loaded in {timings['load']:.3f}s")
+
+    # Tasks Table, printed in chunks with fixed column widths so that they
+    # line up as a single table
+    has_variants = overview["variant_width"] > 0
+    has_repeats = overview["repeats"] > 0
+    columns = [("Task ID", 8, {"style": "dim"})]
+    if has_variants:
+        columns.append(("Variant", max(overview["variant_width"], 7), {}))
+    if has_repeats:
+        columns.append(("Sample", 6, {"justify": "right"}))
+    columns += [
+        ("Started", 8, {}),
+        ("Duration", 8, {}),
+        ("Model", max(overview["model_width"], 5), {}),
+        ("Status", 10, {}),
+        ("Score", 5, {"justify": "right"}),
+    ]
 
-        # Format score with color
-        score = task.eval_score or 0
-        score_color = get_score_color(score)
-        score_text = f"[{score_color}]{score:.2f}[/]"
-
-        tasks_table.add_row(
-            task.id[-8:],
-            task.created_at.strftime("%H:%M:%S"),
-            duration,
-            task.task_details.get("model", "N/A") if task.task_details else "N/A",
-            format_task_status(task.status),
-            score_text
+    for i, batch in enumerate(TaskModel.iter_batches(job.id, OVERVIEW_BATCH, summary=True)):
+        tasks_table = Table(
+            title="\nTasks" if i == 0 else None,
+            show_header=i == 0,
+            header_style="bold cyan"
         )
+        for name, width, options in columns:
+            tasks_table.add_column(name, width=width, no_wrap=True, **options)
 
-    console.print(tasks_table)
-
-    # Detailed Task View
-    for task in tasks:
-        console.print(f"\n[bold cyan]Task Details: {task.id[-8:]}[/bold cyan]")
-
-        # Task Information
-        task_details = Table(show_header=False, box=None)
-        task_details.add_column("Field", style="cyan")
-        task_details.add_column("Value")
-
-        task_details.add_row("Status", format_task_status(task.status))
-        task_details.add_row("Created", task.created_at.strftime("%Y-%m-%d %H:%M:%S"))
-        if task.finished_at:
-            task_details.add_row(
-                "Finished", task.finished_at.strftime("%Y-%m-%d %H:%M:%S")
-            )
-        task_details.add_row(
-            "Duration",
-            format_duration(
+        for task in batch:
+            # Format duration
+            duration = format_duration(
                 task.created_at.replace(tzinfo=timezone.utc).isoformat(),
                 (
                     task.finished_at.replace(tzinfo=timezone.utc).isoformat()
                     if task.finished_at
                     else None
                 ),
-            ),
+            )
+
+            # Format score with color
+            score = task.eval_score or 0
+            score_color = get_score_color(score)
+            score_text = f"[{score_color}]{score:.2f}[/]"
+
+            tasks_table.add_row(
+                task.id[-8:],
+                *([task.variant or "-"] if has_variants else []),
+                *([_sample_label(task.repeat_index)] if has_repeats else []),
+                task.created_at.strftime("%H:%M:%S"),
+                duration,
+                str(task.task_details.get("model", "N/A")) if task.task_details else "N/A",
+                format_task_status(task.status),
+                score_text
+            )
+
+        console.print(tasks_table)
+
+    # Detailed Task View
+    for batch in TaskModel.iter_batches(job.id):
+        for task in batch:
+            print_task_details(console, task)
+
+
+def print_challenge_stats(console, job):
+    """
+    Print the pass rate, pass@k and score mean and variance of each repeated
+    task, over its samples.
+    """
+    from ...engine.repeats import job_challenge_stats
+
+    k = job.details["repeats"]["k"]
+    stats = [s for s in job_challenge_stats(job.id, k) if s["samples"] > 1]
+    table = Table(title="\nRepeated Tasks", show_header=True, header_style="bold cyan")
+    has_variants = any(s["variant"] for s in stats)
+    table.add_column("Challenge", style="dim")
+    if has_variants:
+        table.add_column("Variant")
+    for column in ("Samples", "Pass Rate", f"pass@{k}", "Mean Score", "Variance"):
+        table.add_column(column, justify="right")
+    for s in stats:
+        table.add_row(
+            s["challenge_id"],
+            *([s["variant"] or "-"] if has_variants else []),
+            str(s["samples"]),
+            f"{s['pass_rate']:.0%}",
+            "-" if s["pass_at_k"] is None else f"{s['pass_at_k']:.0%}",
+            f"{s['mean_score']:.2f}",
+            f"{s['score_variance']:.3f}",
         )
+    console.print(table)
 
-        console.print(task_details)
 
-        # Input
-        if task.task_input:
-            console.print("\n[bold]Input:[/bold]")
-            input_text = (
-                task.task_input['str']
-                if isinstance(task.task_input, dict) and 'str' in task.task_input
-                else str(task.task_input)
-            )
-            console.print(input_text)
-
-        # Output
-        if task.task_output:
-            console.print("\n[bold]Output:[/bold]")
-            output_text = (
-                task.task_output['str']
-                if isinstance(task.task_output, dict) and 'str' in task.task_output
-                else str(task.task_output)
-            )
-            console.print(output_text)
+def _sample_label(repeat_index):
+    return "-" if repeat_index is None else f"#{repeat_index + 1}"
 
-        # Evaluation Results
-        if task.eval_details:
-            console.print("\n[bold]Evaluation Results:[/bold]")
-            eval_table = Table(show_header=True)
-            eval_table.add_column("Criterion")
-            eval_table.add_column("Score", justify="right")
-            eval_table.add_column("Rationale")
 
-            for ev in task.eval_details.get("evaluations", []):
-                score = ev["score"]
-                score_color = get_score_color(score)
-                eval_table.add_row(
-                    ev["criterion"],
-                    f"[{score_color}]{score:.2f}[/]",
-                    ev["rationale"]
-                )
+def print_task_details(console, task):
+    """
+    Print the status, input, output and evaluation results of a task.
+    """
+    from ...engine.blobs import resolve_blob
+
+    console.print(f"\n[bold cyan]Task Details: {task.id[-8:]}[/bold cyan]")
+
+    # Task Information
+    task_details = Table(show_header=False, box=None)
+    task_details.add_column("Field", style="cyan")
+    task_details.add_column("Value")
+
+    task_details.add_row("Status", format_task_status(task.status))
+    if task.variant:
+        task_details.add_row("Variant", task.variant)
+    if task.repeat_index is not None:
+        task_details.add_row("Sample", _sample_label(task.repeat_index))
+    task_details.add_row("Created", task.created_at.strftime("%Y-%m-%d %H:%M:%S"))
+    if task.finished_at:
+        task_details.add_row(
+            "Finished", task.finished_at.strftime("%Y-%m-%d %H:%M:%S")
+        )
+    task_details.add_row(
+        "Duration",
+        format_duration(
+            task.created_at.replace(tzinfo=timezone.utc).isoformat(),
+            (
+                task.finished_at.replace(tzinfo=timezone.utc).isoformat()
+                if task.finished_at
+                else None
+            ),
+        ),
+    )
 
-            console.print(eval_table)
+    if task.eval_details and task.eval_details.get("tier"):
+        decided_by = task.eval_details["tier"]
+        if task.eval_details.get("skipped"):
+            decided_by += f" (skipped {', '.join(task.eval_details['skipped'])})"
+        task_details.add_row("Decided By", decided_by)
 
+    if task.timings:
+        task_details.add_row(
+            "Timings",
+            ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in task.timings.items())
+        )
+
+    console.print(task_details)
+
+    # Input
+    task_input = resolve_blob(task.task_input)
+    if task_input:
+        console.print("\n[bold]Input:[/bold]")
+        input_text = (
+            task_input['str']
+            if isinstance(task_input, dict) and 'str' in task_input
+            else str(task_input)
+        )
+        console.print(input_text)
+
+    # Output
+    task_output = resolve_blob(task.task_output)
+    if task_output:
+        console.print("\n[bold]Output:[/bold]")
+        output_text = (
+            task_output['str']
+            if isinstance(task_output, dict) and 'str' in task_output
+            else str(task_output)
+        )
+        console.print(output_text)
+
+    # Evaluation Results
+    if task.eval_details:
+        console.print("\n[bold]Evaluation Results:[/bold]")
+        eval_table = Table(show_header=True)
+        eval_table.add_column("Criterion")
+        eval_table.add_column("Score", justify="right")
+        eval_table.add_column("Rationale")
+
+        for ev in task.eval_details.get("evaluations", []):
+            score = ev["score"]
+            score_color = get_score_color(score)
+            eval_table.add_row(
+                ev["criterion"],
+                f"[{score_color}]{score:.2f}[/]",
+                ev["rationale"]
+            )
+
+        console.print(eval_table)
 
-def find_run_by_partial_id(partial_id: str) -> Optional[JobModel]:
+
+def find_run_by_partial_id(partial_id: str) -> Optional["JobModel"]:
     """
     Find a run by partial ID (last N characters).
     Returns the most recent matching run if multiple found.
     """
+    from ...engine.storage import JobModel
+
     project = get_current_project()
     if not project:
         return None
 
-    # Get recent jobs and find one with matching partial ID
-    jobs = JobModel.list_recent(project.id, limit=100)
-
-    matching_jobs = [
-        job for job in jobs
-        if job.id.endswith(partial_id) or job.id == partial_id
-    ]
-
-    if not matching_jobs:
-        return None
-
-    # Return the most recent matching job
-    return matching_jobs[0]
+    # Indexed suffix lookup across the whole history
+    return JobModel.find_by_partial_id(project.id, partial_id)
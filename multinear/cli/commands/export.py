@@ -0,0 +1,42 @@
+from pathlib import Path
+from rich.console import Console
+
+from .details import find_run_by_partial_id
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'export', help='Export the tasks of a run to a machine-readable file'
+    )
+    parser.add_argument('run_id', help='Partial or full ID of the run to export')
+    parser.add_argument(
+        '--format', choices=['jsonl', 'junit', 'csv', 'parquet'], default='jsonl',
+        help='Output format (parquet requires pyarrow)'
+    )
+    parser.add_argument(
+        '--output', type=Path, default=None, metavar='PATH',
+        help='Output file (default: .multinear/exports/<run-id>.<ext>)'
+    )
+    parser.add_argument(
+        '--include-logs', action='store_true',
+        help='Include the captured logs of each task (jsonl and junit only)'
+    )
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    from ...engine.export import EXPORT_DIR, EXPORT_FORMATS, export_run
+
+    console = Console()
+    job = find_run_by_partial_id(args.run_id)
+    if not job:
+        console.print(f"[red]Error:[/red] No run found matching ID '{args.run_id}'")
+        return
+
+    output = args.output or EXPORT_DIR / f"{job.id}{EXPORT_FORMATS[args.format]}"
+    try:
+        path = export_run(job, args.format, output, include_logs=args.include_logs)
+    except RuntimeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        return
+    console.print(f"Exported run {job.id[-8:]} to {path}")
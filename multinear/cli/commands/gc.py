@@ -0,0 +1,130 @@
+from pathlib import Path
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from ..utils import format_bytes, get_current_project
+
+
+# Number of runs kept when neither --keep nor meta.retention.keep_last is set
+DEFAULT_KEEP = 100
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'gc', help='Archive and delete old runs, then compact the database'
+    )
+    parser.add_argument(
+        '--keep', type=int, default=None,
+        help=f'Number of recent runs to keep (default: meta.retention.keep_last '
+             f'or {DEFAULT_KEEP}); pinned runs are always kept'
+    )
+    parser.add_argument(
+        '--no-archive', action='store_true',
+        help='Delete old runs without archiving them'
+    )
+    parser.add_argument(
+        '--archive-dir', type=Path, default=None,
+        help='Directory for run archives (default: .multinear/archive)'
+    )
+    parser.add_argument(
+        '--criterion-cache-days', type=float, default=None, metavar='DAYS',
+        help=(
+            'Delete cached checklist criteria not used for this many days '
+            '(default: meta.retention.criterion_cache_days or 30)'
+        )
+    )
+    parser.add_argument(
+        '--criterion-cache', action='store_true',
+        help='Clear the cache of checklist criteria entirely'
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help='Only show which runs would be removed'
+    )
+    parser.add_argument(
+        '--restore', type=Path, metavar='ARCHIVE',
+        help='Re-import a run from an archive file instead of collecting garbage'
+    )
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    from ...engine.retention import (
+        collect_garbage, restore_archive, ARCHIVE_DIR, CRITERION_CACHE_DAYS
+    )
+
+    project = get_current_project()
+    if not project:
+        return
+    console = Console()
+
+    if args.restore:
+        try:
+            job_id = restore_archive(args.restore)
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            return
+        console.print(f"[green]Restored run {job_id[-8:]} (Full ID: {job_id})[/green]")
+        return
+
+    # Defaults come from the retention policy in config.yaml
+    with open(Path('.multinear') / 'config.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    retention = (config.get('meta') or {}).get('retention') or {}
+    keep = args.keep if args.keep is not None else retention.get(
+        'keep_last', DEFAULT_KEEP
+    )
+    archive = not args.no_archive and retention.get('archive', True)
+    archive_dir = args.archive_dir or Path(retention.get('archive_dir', ARCHIVE_DIR))
+    if args.criterion_cache:
+        criterion_cache_days = 0
+    elif args.criterion_cache_days is not None:
+        criterion_cache_days = args.criterion_cache_days
+    else:
+        criterion_cache_days = retention.get('criterion_cache_days', CRITERION_CACHE_DAYS)
+
+    report = collect_garbage(
+        project.id,
+        keep=keep,
+        archive=archive,
+        archive_dir=archive_dir,
+        dry_run=args.dry_run,
+        criterion_cache_days=criterion_cache_days,
+    )
+
+    expired = report['runs_expired']
+    if args.dry_run:
+        console.print(
+            f"{len(expired)} run(s) would be removed (keeping the last {keep} "
+            "and pinned runs):"
+        )
+        for job_id in expired:
+            console.print(f"  {job_id[-8:]}  {job_id}")
+        console.print(
+            f"{report['criterion_results_removed']} cached checklist criteria "
+            "would be removed"
+        )
+        return
+
+    summary = Table(title="Garbage Collection", show_header=False)
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="magenta")
+    summary.add_row("Runs removed", str(len(expired)))
+    summary.add_row("Runs archived", str(len(report['archives'])))
+    summary.add_row("Blobs removed", str(report['blobs_removed']))
+    summary.add_row("Cached criteria removed", str(report['criterion_results_removed']))
+    summary.add_row(
+        "Database size",
+        f"{format_bytes(report['db_bytes_before'])} -> "
+        f"{format_bytes(report['db_bytes_after'])}"
+    )
+    summary.add_row("Space reclaimed", format_bytes(report['bytes_reclaimed']))
+    console.print(summary)
+    if report['db_bytes_after'] > report['db_bytes_before']:
+        console.print(
+            "The database grew slightly, as it was switched to incremental "
+            "auto-vacuum; later runs of gc only release freed pages."
+        )
+    if report['archives']:
+        console.print(f"\nArchives written to {archive_dir}")
@@ -1,5 +1,4 @@
 from pathlib import Path
-from jinja2 import Template
 from rich.console import Console
 
 from ..utils import slugify
@@ -11,6 +10,8 @@ def add_parser(subparsers):
 
 
 def handle(args):
+    from jinja2 import Template
+
     MULTINEAR_CONFIG_DIR = '.multinear'
     console = Console()
 
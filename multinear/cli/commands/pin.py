@@ -0,0 +1,24 @@
+from rich.console import Console
+
+from .details import find_run_by_partial_id
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        'pin', help='Pin a run so that it is never removed by gc'
+    )
+    parser.add_argument('run_id', help='Partial or full ID of the run to pin')
+    parser.add_argument('--unpin', action='store_true', help='Unpin the run')
+    parser.set_defaults(func=handle)
+
+
+def handle(args):
+    console = Console()
+    job = find_run_by_partial_id(args.run_id)
+    if not job:
+        console.print(f"[red]Error:[/red] No run found matching ID '{args.run_id}'")
+        return
+
+    job.set_pinned(not args.unpin)
+    action = "Unpinned" if args.unpin else "Pinned"
+    console.print(f"{action} run {job.id[-8:]} (Full ID: {job.id})")
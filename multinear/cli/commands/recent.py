@@ -3,24 +3,37 @@ from rich.table import Table
 from datetime import timezone
 
 from ..utils import format_duration, get_score_color, get_current_project
-from ...engine.storage import JobModel, TaskStatus
 
 
 def add_parser(subparsers):
     parser = subparsers.add_parser('recent', help='Show recent experiment runs')
+    parser.add_argument(
+        '--limit', type=int, default=10, help='Number of runs to show'
+    )
+    parser.add_argument(
+        '--cursor', type=str, default=None,
+        help='Show runs older than this cursor (printed below the table)'
+    )
     parser.set_defaults(func=handle)
 
 
 def handle(args):
+    from ...engine.analytics import count_regressions
+    from ...engine.storage import JobModel, TaskStatus, encode_cursor
+
     project = get_current_project()
     if not project:
         return
+    console = Console()
 
     # Get recent jobs
-    jobs = JobModel.list_recent(project.id, limit=10)
+    try:
+        jobs = JobModel.list_recent(project.id, limit=args.limit, cursor=args.cursor)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        return
 
     # Create and configure the table
-    console = Console()
     table = Table(
         title=f"Recent Experiments for {project.name}",
         show_header=True,
@@ -36,6 +49,9 @@ def handle(args):
     table.add_column("Score", justify="center")
     table.add_column("Results")
 
+    # Regressions against the previous run, for all listed runs at once
+    regressions = count_regressions(project.id, jobs)
+
     # Add rows
     for job in jobs:
         details = job.details or {}
@@ -47,7 +63,9 @@ def handle(args):
             1 for status in status_map.values() if status == TaskStatus.COMPLETED
         )
         failed = sum(1 for status in status_map.values() if status == TaskStatus.FAILED)
-        regression = total - passed - failed
+        # Regressions are failures too; show the rest as plain failures
+        regression = min(regressions.get(job.id, 0), failed)
+        failed -= regression
         score = (passed / total) if total > 0 else 0
 
         # Get model info
@@ -112,3 +130,11 @@ def handle(args):
         "[green]█[/green] Pass", "[red]█[/red] Fail", "[yellow]█[/yellow] Regression"
     )
     console.print("\nLegend:", legend)
+
+    # Print how to get the next page
+    if len(jobs) == args.limit:
+        console.print(
+            f"\nOlder runs: multinear recent --cursor {encode_cursor(jobs[-1])}",
+            soft_wrap=True,
+            highlight=False,
+        )
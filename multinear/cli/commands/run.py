@@ -1,86 +1,136 @@
-import tqdm
+import sys
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
 from .details import print_details
-from ..utils import get_current_project
-from ...engine.run import run_experiment
-from ...engine.storage import JobModel, TaskModel
+from ..progress import RunProgress
+from ..utils import format_estimate, format_repeats, get_current_project, variants_table
+from ...utils.profiling import PROFILE_MODES, PROFILES_DIR
 
 
 def add_parser(subparsers):
     parser = subparsers.add_parser('run', help='Run experiment and track progress')
+    parser.add_argument(
+        '--metrics-port', type=int, default=None,
+        help='Expose Prometheus metrics on this port while the run is in progress'
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const='sample', choices=PROFILE_MODES, default=None,
+        help=(
+            'Profile run_task and evaluation of each task (default mode: sample); '
+            'results are written to .multinear/profiles/<run-id>/'
+        )
+    )
+    parser.add_argument(
+        '--quiet', action='store_true',
+        help=(
+            'Print a one-line progress summary periodically instead of a live '
+            'display (the default when output is not a terminal)'
+        )
+    )
+    parser.add_argument(
+        '--sample', type=str, default=None, metavar='N|PCT%',
+        help=(
+            'Run a random sample of the tasks (e.g. 200 or 5%%), stratified by '
+            'task group or tags, and estimate the pass rate of all tasks'
+        )
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Random seed of the sample (the same seed picks the same tasks)'
+    )
+    parser.add_argument(
+        '--sample-by-variance', action='store_true',
+        help='Favor tasks whose outcome varied in past runs when sampling'
+    )
+    parser.add_argument(
+        '--confidence', type=float, default=0.95,
+        help='Confidence level of the estimated pass rate (default: 0.95)'
+    )
     parser.set_defaults(func=handle)
 
 
 def handle(args):
+    from ...engine.run import run_experiment
+    from ...engine.storage import JobModel, TaskModel, TaskStatus
+    from ...utils import metrics
+
     project = get_current_project()
     if not project:
         return
+
+    sample = None
+    if args.sample:
+        from ...engine.sampling import parse_sample_size
+
+        try:
+            parse_sample_size(args.sample)
+        except ValueError as e:
+            Console().print(f"[red]Error:[/red] {e}")
+            return
+        sample = {
+            "size": args.sample,
+            "seed": args.seed,
+            "by_variance": args.sample_by_variance,
+            "confidence": args.confidence,
+        }
+
+    # Initialize Rich consoles. The main one is bound to the real stdout, as
+    # output of tasks is captured by replacing sys.stdout while they run.
+    console = Console(file=sys.stdout)
+
+    # Serve metrics for the duration of the run
+    if args.metrics_port:
+        try:
+            metrics.start_metrics_server(args.metrics_port)
+            metrics.instrument_database()
+        except (RuntimeError, OSError) as e:
+            console.print(f"[red]Error starting metrics server: {e}[/red]")
+            return
+
     job_id = JobModel.start(project.id)
     job = JobModel.find(job_id)
 
-    # Initialize Rich consoles
-    console = Console()
-    console_plain = Console(no_color=True, force_terminal=False, width=120)
-
     # Execute the experiment with progress tracking
     results = []
-    pbar = None
 
-    try:
-        for update in run_experiment(project.to_dict(), job):
-            results.append(update)
-
-            # Add status map from TaskModel to the update
-            update["status_map"] = TaskModel.get_status_map(job_id)
-
-            # Update job status in the database
-            job.update(
-                status=update["status"],
-                total_tasks=update.get("total", 0),
-                current_task=update.get("current"),
-                details=update
+    # The display is refreshed at a fixed rate, independently of the updates
+    with RunProgress(console, quiet=args.quiet) as progress:
+        try:
+            for update in run_experiment(
+                project.to_dict(), job, profile=args.profile, sample=sample
+            ):
+                results.append(update)
+
+                # Add status map from TaskModel to the update
+                update["status_map"] = TaskModel.get_status_map(job_id)
+
+                # Update job status in the database
+                job.update(
+                    status=update["status"],
+                    total_tasks=update.get("total", 0),
+                    current_task=update.get("current"),
+                    details=update
+                )
+
+                progress.update(update)
+
+            # Mark the job as finished upon successful completion (or early stop)
+            job.finish(
+                TaskStatus.STOPPED if job.status == TaskStatus.STOPPED else TaskStatus.COMPLETED
             )
 
-            # Initialize progress bar when we get total tasks
-            if pbar is None and update.get("total") is not None:
-                pbar = tqdm.tqdm(total=update["total"], desc="Running Experiment")
-
-            # Update progress bar if initialized
-            if pbar is not None and update.get("current") is not None:
-                pbar.n = update["current"]
-                pbar.refresh()
-
-            # Update Rich console with status
-            status_table = Table(title="Experiment Status")
-            status_table.add_column(
-                "Status", justify="left", style="cyan", no_wrap=True
+        except Exception as e:
+            # Handle exceptions and update the job as failed
+            console.print(f"[red]Error running experiment: {e}[/red]")
+            job.update(
+                status="failed",
+                details={
+                    "error": str(e),
+                    "status_map": TaskModel.get_status_map(job_id)
+                }
             )
-            status_table.add_column("Details", style="magenta")
-
-            status_table.add_row(update["status"], update.get("details", ""))
-            console.clear()
-            console.print(status_table)
-
-        # Mark the job as finished upon successful completion
-        job.finish()
-
-    except Exception as e:
-        # Handle exceptions and update the job as failed
-        console.print(f"[red]Error running experiment: {e}[/red]")
-        job.update(
-            status="failed",
-            details={
-                "error": str(e),
-                "status_map": TaskModel.get_status_map(job_id)
-            }
-        )
-    finally:
-        # Close progress bar if it was initialized
-        if pbar is not None:
-            pbar.close()
 
     # Generate summary
     summary_table = Table(title="Experiment Summary")
@@ -91,28 +141,35 @@ def handle(args):
     summary_table.add_row("Final Status", results[-1]["status"])
     summary_table.add_row("Total Tasks", str(results[-1].get("total", 0)))
     summary_table.add_row("Completed Tasks", str(results[-1].get("current", 0)))
+    if results[-1].get("early_stop"):
+        summary_table.add_row("Stopped Early", results[-1]["early_stop"]["reason"])
+    if results[-1].get("estimate"):
+        summary_table.add_row("Estimated Pass Rate", format_estimate(results[-1]["estimate"]))
+    if results[-1].get("repeats"):
+        summary_table.add_row("Repeated Tasks", format_repeats(results[-1]["repeats"]))
 
     details_message = (
         f"For detailed information about this run, use: multinear details {job_id[-8:]}"
     )
 
+    scoreboard = variants_table(results[-1]["variants"]) if results[-1].get("variants") else None
+
     console.print(summary_table)
+    if scoreboard:
+        console.print(scoreboard)
     console.print(f"\n[bold cyan]{details_message}[/bold cyan]")
+    if args.profile:
+        console.print(
+            f"Profiles written to {PROFILES_DIR / job_id} (hot spots in top.txt)"
+        )
 
-    # Write summary and details to .multinear/last_output.txt
-    with console_plain.capture() as capture:
+    # Write summary and details to .multinear/last_output.txt, streamed to the
+    # file task by task rather than rendered in memory first
+    with open(Path('.multinear') / "last_output.txt", "w") as f:
+        console_plain = Console(file=f, no_color=True, force_terminal=False, width=120)
         console_plain.print(summary_table)
+        if scoreboard:
+            console_plain.print(scoreboard)
         console_plain.print(f"\n{details_message}")
-    plain_output = capture.get()
-
-    with open(Path('.multinear') / "last_output.txt", "w") as f:
-        f.write(plain_output)
-
-    # Append detailed information
-    console_plain = Console(no_color=True, force_terminal=False, width=120)
-    with console_plain.capture() as capture:
+        console_plain.print()
         print_details(console_plain, job)
-    details_output = capture.get()
-
-    with open(Path('.multinear') / "last_output.txt", "a") as f:
-        f.write("\n\n" + details_output)
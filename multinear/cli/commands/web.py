@@ -1,6 +1,5 @@
 from pathlib import Path
 from rich.console import Console
-import uvicorn
 
 from ..utils import get_current_project
 
@@ -20,6 +19,8 @@ def add_parser(subparsers):
 
 
 def handle(args):
+    import uvicorn
+
     project = get_current_project()
     if not project:
         return
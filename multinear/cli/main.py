@@ -1,36 +1,76 @@
 import argparse
-from .commands import init, run, recent, details, web
+import importlib
+import sys
+from typing import List, Optional
 
 
-def get_parser() -> argparse.ArgumentParser:
+# Command -> (module in .commands, handler function, help). Command modules
+# are imported only for the command being run, so that quick commands and
+# `--help` don't pay for the others' imports.
+COMMANDS = {
+    'init': ('init', 'handle', 'Initialize a new Multinear project'),
+    'run': ('run', 'handle', 'Run experiment and track progress'),
+    'recent': ('recent', 'handle', 'Show recent experiment runs'),
+    'details': ('details', 'handle', 'Show detailed information about a specific run'),
+    'web': ('web', 'handle', 'Start platform web server'),
+    'web_dev': ('web', 'handle_dev', 'Start development web server with auto-reload'),
+    'gc': ('gc', 'handle', 'Archive and delete old runs, then compact the database'),
+    'pin': ('pin', 'handle', 'Pin a run so that it is never removed by gc'),
+    'analytics': ('analytics', 'handle', 'Analyze results across runs'),
+    'compare': ('compare', 'handle', 'Compare two runs task by task'),
+    'bench': (
+        'bench', 'handle', "Benchmark multinear's own overhead against a stub LLM server"
+    ),
+    'export': ('export', 'handle', 'Export the tasks of a run to a machine-readable file'),
+}
+
+
+def _load_command(module_name: str):
+    return importlib.import_module(f".commands.{module_name}", __package__)
+
+
+def get_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the argument parser. Only the module of `command` is imported to
+    define its arguments; other commands are listed with their help only.
+    All modules are imported when `command` is None.
+    """
     parser = argparse.ArgumentParser(description="Multinear CLI tool")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
     # Define commands
-    init.add_parser(subparsers)
-    run.add_parser(subparsers)
-    recent.add_parser(subparsers)
-    details.add_parser(subparsers)
-    web.add_parser(subparsers)
+    loaded = set()
+    for name, (module_name, _, help) in COMMANDS.items():
+        if module_name in loaded:
+            continue  # Defined with another command of its module
+        if command is None or COMMANDS.get(command, (None,))[0] == module_name:
+            _load_command(module_name).add_parser(subparsers)
+            loaded.add(module_name)
+        else:
+            subparsers.add_parser(name, help=help)
 
     return parser
 
 
+def _requested_command(argv: List[str]) -> Optional[str]:
+    """
+    The command named on the command line, if any (the first positional argument).
+    """
+    for arg in argv:
+        if not arg.startswith('-'):
+            return arg if arg in COMMANDS else None
+    return None
+
+
 def main():
-    parser = get_parser()
-    args = parser.parse_args()
-
-    command_handlers = {
-        'init': init.handle,
-        'run': run.handle,
-        'recent': recent.handle,
-        'details': details.handle,
-        'web': web.handle,
-        'web_dev': web.handle_dev,
-    }
-
-    if args.command in command_handlers:
-        command_handlers[args.command](args)
+    argv = sys.argv[1:]
+    command = _requested_command(argv)
+    parser = get_parser(command or '')
+    args = parser.parse_args(argv)
+
+    if args.command in COMMANDS:
+        module_name, handler, _ = COMMANDS[args.command]
+        getattr(_load_command(module_name), handler)(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,138 @@
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress_bar import ProgressBar
+from rich.table import Table
+from rich.text import Text
+
+
+# Statuses of tasks that have started but not finished
+_IN_FLIGHT = ("running", "evaluating")
+
+
+class RunProgress:
+    """
+    Progress display for `multinear run`.
+
+    Updates from the experiment only record the latest state; rendering happens
+    separately, so its cost doesn't depend on how often updates arrive:
+
+    - On a terminal, a single Rich Live region is redrawn `refresh_per_second`
+      times per second.
+    - In quiet mode (or when output isn't a terminal, e.g. CI logs), a one-line
+      summary is printed every `interval` seconds and when the run ends.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        quiet: bool = False,
+        refresh_per_second: float = 4,
+        interval: float = 10.0,
+    ):
+        self.console = console
+        self.quiet = quiet or not console.is_terminal
+        self.interval = interval
+        self._start = time.monotonic()
+        self._last_summary = self._start
+        self.status = "starting"
+        self.current = 0
+        self.total: Optional[int] = None
+        self.counts: Dict[str, int] = {"passed": 0, "failed": 0, "errors": 0}
+        self.in_flight = 0
+        self._live = None if self.quiet else Live(
+            get_renderable=self._render,
+            console=console,
+            refresh_per_second=refresh_per_second,
+        )
+
+    def __enter__(self):
+        if self._live:
+            self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._live:
+            self._live.stop()
+        else:
+            self.console.print(self.summary(), highlight=False)
+
+    def update(self, update: Dict[str, Any]):
+        """
+        Record an update yielded by `run_experiment` (with its status map).
+        """
+        self.status = update["status"]
+        if update.get("total") is not None:
+            self.total = update["total"]
+        if update.get("current") is not None:
+            self.current = update["current"]
+        if update.get("counts"):
+            self.counts = update["counts"]
+        if update.get("status_map") is not None:
+            self.in_flight = sum(
+                1 for status in update["status_map"].values() if status in _IN_FLIGHT
+            )
+
+        if self.quiet and time.monotonic() - self._last_summary >= self.interval:
+            self._last_summary = time.monotonic()
+            self.console.print(self.summary(), highlight=False)
+
+    @property
+    def finished(self) -> int:
+        return sum(self.counts.values())
+
+    def _rates(self):
+        elapsed = time.monotonic() - self._start
+        throughput = self.finished / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if throughput > 0 and self.total:
+            eta = timedelta(seconds=int((self.total - self.finished) / throughput))
+        evaluated = self.counts["passed"] + self.counts["failed"]
+        pass_rate = self.counts["passed"] / evaluated if evaluated else None
+        return elapsed, throughput, eta, pass_rate
+
+    def summary(self) -> str:
+        """
+        One-line summary of the progress.
+        """
+        elapsed, throughput, eta, pass_rate = self._rates()
+        total = self.total if self.total is not None else "?"
+        return (
+            f"[{timedelta(seconds=int(elapsed))}] {self.status}: "
+            f"{self.finished}/{total} tasks, {throughput:.2f} tasks/s, "
+            f"ETA {eta if eta is not None else '-'}, "
+            f"pass rate {f'{pass_rate:.0%}' if pass_rate is not None else '-'}, "
+            f"in flight {self.in_flight}, errors {self.counts['errors']}"
+        )
+
+    def _render(self):
+        elapsed, throughput, eta, pass_rate = self._rates()
+        total = self.total or 0
+
+        header = Table.grid(padding=(0, 1))
+        header.add_row(
+            Text(f"{self.status.capitalize()}", style="cyan"),
+            ProgressBar(total=total or None, completed=self.finished, width=40),
+            Text(f"{self.finished}/{total or '?'}"),
+        )
+
+        stats = Table.grid(padding=(0, 3))
+        stats.add_row(
+            f"Throughput [bold]{throughput:.2f}[/bold] tasks/s",
+            f"Elapsed {timedelta(seconds=int(elapsed))}",
+            f"ETA {eta if eta is not None else '-'}",
+        )
+        stats.add_row(
+            "Pass rate " + (
+                f"[bold]{pass_rate:.0%}[/bold] "
+                f"({self.counts['passed']}/{self.counts['passed'] + self.counts['failed']})"
+                if pass_rate is not None else "-"
+            ),
+            f"In flight {self.in_flight}",
+            f"Errors [{'red' if self.counts['errors'] else 'green'}]"
+            f"{self.counts['errors']}[/]",
+        )
+        return Group(header, stats)
@@ -1,10 +1,14 @@
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from rich.console import Console
+from rich.table import Table
 
-from ..engine.storage import ProjectModel, TaskStatus, init_project_db
+# The engine (and SQLAlchemy) is imported by the functions that need it, to keep
+# CLI startup fast
+if TYPE_CHECKING:
+    from ..engine.storage import ProjectModel
 
 
 def slugify(text: str) -> str:
@@ -30,6 +34,77 @@ def format_duration(created_at: str, finished_at: Optional[str]) -> str:
     return f"{seconds}s"
 
 
+def format_bytes(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ['B', 'KB', 'MB']:
+        if abs(size) < 1024:
+            return f"{size} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_estimate(estimate: dict) -> str:
+    """Format a pass rate estimated from a sample, with its interval."""
+    missing = estimate.get("missing_strata")
+    return (
+        f"{estimate['pass_rate']:.1%} "
+        f"({estimate['confidence']:.0%} CI {estimate['low']:.1%}-{estimate['high']:.1%}, "
+        f"{estimate['tasks']} tasks"
+        + (
+            f"; {len(missing)} strata without results, "
+            f"{1 - estimate['coverage']:.0%} of tasks" if missing else ""
+        )
+        + ")"
+    )
+
+
+def format_repeats(repeats: dict) -> str:
+    """Format the summary of repeated tasks: pass@1, pass@k and score variance."""
+    pass_at_k = "-" if repeats["pass_at_k"] is None else f"{repeats['pass_at_k']:.1%}"
+    return (
+        f"pass@1 {repeats['pass_rate']:.1%}, pass@{repeats['k']} {pass_at_k}, "
+        f"mean score {repeats['mean_score']:.2f} (variance {repeats['score_variance']:.3f}), "
+        f"{repeats['samples']} samples of {repeats['challenges']} tasks"
+    )
+
+
+def variants_table(variants: dict) -> Table:
+    """Build the scoreboard of a matrix run: results of each variant."""
+    table = Table(title="\nVariants", show_header=True, header_style="bold cyan")
+    table.add_column("Variant")
+    for column in ("Tasks", "Passed", "Failed", "Errors", "Pass Rate", "Mean Score"):
+        table.add_column(column, justify="right")
+    repeated = any(entry.get("repeats") for entry in variants.values())
+    if repeated:
+        k = next(entry["repeats"]["k"] for entry in variants.values() if entry.get("repeats"))
+        table.add_column(f"pass@{k}", justify="right")
+        table.add_column("Score Variance", justify="right")
+    for name, entry in variants.items():
+        pass_rate = "-" if entry["pass_rate"] is None else f"{entry['pass_rate']:.1%}"
+        if entry.get("estimate"):
+            pass_rate = format_estimate(entry["estimate"])
+        table.add_row(
+            name,
+            str(entry["tasks"]),
+            str(entry["passed"]),
+            str(entry["failed"]),
+            str(entry["errors"]),
+            pass_rate,
+            "-" if entry["mean_score"] is None else f"{entry['mean_score']:.2f}",
+            *(_repeats_columns(entry.get("repeats")) if repeated else []),
+        )
+    return table
+
+
+def _repeats_columns(repeats: Optional[dict]):
+    if not repeats:
+        return ["-", "-"]
+    return [
+        "-" if repeats["pass_at_k"] is None else f"{repeats['pass_at_k']:.1%}",
+        f"{repeats['score_variance']:.3f}",
+    ]
+
+
 def get_score_color(score: float) -> str:
     """Get color for score based on value."""
     if score >= 0.9:
@@ -41,6 +116,8 @@ def get_score_color(score: float) -> str:
 
 def format_task_status(status: str) -> str:
     """Get colored status string."""
+    from ..engine.storage import TaskStatus
+
     if status == TaskStatus.COMPLETED:
         return f"[green]{status}[/green]"
     elif status == TaskStatus.FAILED:
@@ -48,11 +125,13 @@ def format_task_status(status: str) -> str:
     return f"[yellow]{status}[/yellow]"
 
 
-def get_current_project() -> Optional[ProjectModel]:
+def get_current_project() -> Optional["ProjectModel"]:
     """
     Ensure the project is initialized and return the current ProjectModel.
     Returns None if the project is not initialized.
     """
+    from ..engine.storage import ProjectModel, init_project_db
+
     MULTINEAR_CONFIG_DIR = '.multinear'
     console = Console()
 
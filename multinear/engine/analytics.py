@@ -0,0 +1,275 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .storage import JobModel, TaskModel, TaskStatus, db_context, encode_cursor
+
+
+class RunMatrix:
+    """
+    Results of many runs of a project as dense (runs x challenges) arrays.
+
+    Rows are runs in chronological order, columns are challenge IDs. Cells hold
+    the mean score and pass rate of the finished tasks of that challenge in that
+    run (several tasks per cell are possible, e.g. with repeats), or NaN when
+    the challenge wasn't part of the run.
+    """
+
+    def __init__(
+        self,
+        run_ids: List[str],
+        challenge_ids: np.ndarray,
+        scores: np.ndarray,
+        passed: np.ndarray,
+    ):
+        self.run_ids = run_ids
+        self.challenge_ids = challenge_ids
+        self.scores = scores
+        self.passed = passed
+
+    def run_index(self, run_id: str) -> int:
+        try:
+            return self.run_ids.index(run_id)
+        except ValueError:
+            raise ValueError(f"Run {run_id} not found")
+
+
+def load_results(
+    project_id: str,
+    job_ids: Optional[List[str]] = None,
+    last_runs: Optional[int] = None,
+) -> RunMatrix:
+    """
+    Load the results of a project's runs in bulk.
+
+    Args:
+        project_id: The project to load.
+        job_ids: Restrict to these runs.
+        last_runs: Restrict to the most recent N runs.
+
+    Returns:
+        A RunMatrix with all selected runs.
+    """
+    with db_context() as db:
+        query = (db.query(JobModel.id)
+                 .filter(JobModel.project_id == project_id)
+                 .order_by(JobModel.created_at.desc()))
+        if job_ids is not None:
+            query = query.filter(JobModel.id.in_(job_ids))
+        if last_runs is not None:
+            query = query.limit(last_runs)
+        run_ids = [job_id for (job_id,) in query.all()][::-1]
+
+        # Only the few columns needed, no payloads
+        rows = (db.query(
+                    TaskModel.job_id,
+                    TaskModel.challenge_id,
+                    TaskModel.eval_score,
+                    TaskModel.status,
+                )
+                .filter(
+                    TaskModel.job_id.in_(run_ids),
+                    TaskModel.status.in_([TaskStatus.COMPLETED, TaskStatus.FAILED]),
+                )
+                .all())
+
+    if not rows:
+        empty = np.empty((len(run_ids), 0))
+        return RunMatrix(run_ids, np.array([], dtype=object), empty, empty.copy())
+
+    job_col, challenge_col, score_col, status_col = zip(*rows)
+    run_lookup = {run_id: i for i, run_id in enumerate(run_ids)}
+    run_idx = np.fromiter((run_lookup[j] for j in job_col), dtype=np.int64,
+                          count=len(rows))
+    challenge_ids, challenge_idx = np.unique(
+        np.array(challenge_col, dtype=object), return_inverse=True
+    )
+    scores = np.array([s if s is not None else 0.0 for s in score_col])
+    passed = np.array(status_col, dtype=object) == TaskStatus.COMPLETED
+
+    # Aggregate tasks into cells
+    shape = (len(run_ids), len(challenge_ids))
+    counts = np.zeros(shape)
+    score_sums = np.zeros(shape)
+    pass_sums = np.zeros(shape)
+    np.add.at(counts, (run_idx, challenge_idx), 1)
+    np.add.at(score_sums, (run_idx, challenge_idx), scores)
+    np.add.at(pass_sums, (run_idx, challenge_idx), passed)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cell_scores = np.where(counts > 0, score_sums / counts, np.nan)
+        cell_passed = np.where(counts > 0, pass_sums / counts, np.nan)
+    return RunMatrix(run_ids, challenge_ids, cell_scores, cell_passed)
+
+
+def _passed_mask(values: np.ndarray) -> np.ndarray:
+    """A cell passes when most of its tasks passed."""
+    return values >= 0.5
+
+
+def compare_runs(matrix: RunMatrix, run_id: str, baseline_id: str) -> Dict:
+    """
+    Find regressions and improvements of a run against a baseline run.
+
+    A regression is a challenge that passed in the baseline and fails in the run.
+
+    Returns:
+        Dict with lists of regressed and improved challenge IDs, and the number
+        of challenges present in both runs.
+    """
+    run = matrix.passed[matrix.run_index(run_id)]
+    baseline = matrix.passed[matrix.run_index(baseline_id)]
+    both = ~np.isnan(run) & ~np.isnan(baseline)
+    run_pass = _passed_mask(np.nan_to_num(run))
+    baseline_pass = _passed_mask(np.nan_to_num(baseline))
+    return {
+        "run_id": run_id,
+        "baseline_id": baseline_id,
+        "compared": int(both.sum()),
+        "regressions": matrix.challenge_ids[both & baseline_pass & ~run_pass].tolist(),
+        "improvements": matrix.challenge_ids[both & ~baseline_pass & run_pass].tolist(),
+    }
+
+
+def regression_counts(matrix: RunMatrix) -> Dict[str, int]:
+    """
+    Count regressions of every run against the run before it.
+
+    Returns:
+        Mapping of run ID to its number of regressions (0 for the first run).
+    """
+    if len(matrix.run_ids) == 0:
+        return {}
+    present = ~np.isnan(matrix.passed)
+    passing = _passed_mask(np.nan_to_num(matrix.passed))
+    regressed = present[1:] & present[:-1] & passing[:-1] & ~passing[1:]
+    counts = np.concatenate([[0], regressed.sum(axis=1)])
+    return dict(zip(matrix.run_ids, counts.astype(int).tolist()))
+
+
+def flaky_challenges(matrix: RunMatrix, limit: Optional[int] = 20) -> List[Dict]:
+    """
+    Rank challenges by flakiness across runs.
+
+    For each challenge, computes the pass rate over the runs it appears in, its
+    variance p * (1 - p), and the number of pass/fail flips between consecutive
+    appearances. Challenges that always pass or always fail are left out.
+
+    Returns:
+        List of dicts sorted by flip rate, then variance (most flaky first).
+    """
+    n_runs, n_challenges = matrix.passed.shape
+    if n_runs == 0 or n_challenges == 0:
+        return []
+    valid = ~np.isnan(matrix.passed)
+    passing = _passed_mask(np.nan_to_num(matrix.passed))
+    appearances = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pass_rate = np.where(
+            appearances > 0, np.nansum(matrix.passed, axis=0) / appearances, np.nan
+        )
+    variance = pass_rate * (1 - pass_rate)
+
+    # Compare every cell to the previous run in which the challenge appeared
+    rows = np.arange(n_runs)[:, None]
+    last_valid = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    previous = np.vstack([np.full((1, n_challenges), -1), last_valid[:-1]])
+    has_previous = valid & (previous >= 0)
+    previous_passing = passing[np.clip(previous, 0, None), np.arange(n_challenges)]
+    flips = (has_previous & (passing != previous_passing)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        flip_rate = np.where(appearances > 1, flips / (appearances - 1), 0.0)
+
+    flaky = np.nonzero((variance > 0) & (appearances > 1))[0]
+    order = flaky[np.lexsort((-variance[flaky], -flip_rate[flaky]))]
+    if limit is not None:
+        order = order[:limit]
+    return [
+        {
+            "challenge_id": matrix.challenge_ids[i],
+            "runs": int(appearances[i]),
+            "pass_rate": float(pass_rate[i]),
+            "variance": float(variance[i]),
+            "flips": int(flips[i]),
+            "flip_rate": float(flip_rate[i]),
+        }
+        for i in order
+    ]
+
+
+def score_trends(
+    matrix: RunMatrix, challenge_ids: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Compute the score trend of each challenge across runs.
+
+    The slope is a least-squares fit of score against run number (score change
+    per run), computed for all challenges at once.
+
+    Returns:
+        List of dicts with mean, latest score, slope and the score series
+        (None where the challenge wasn't part of a run).
+    """
+    scores = matrix.scores
+    columns = np.arange(scores.shape[1])
+    if challenge_ids is not None:
+        columns = np.nonzero(np.isin(matrix.challenge_ids, challenge_ids))[0]
+    scores = scores[:, columns]
+    if scores.size == 0:
+        return []
+
+    valid = ~np.isnan(scores)
+    n = valid.sum(axis=0)
+    x = np.broadcast_to(np.arange(scores.shape[0])[:, None], scores.shape)
+    y = np.nan_to_num(scores)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (x * valid).sum(axis=0) / n
+        y_mean = (y * valid).sum(axis=0) / n
+        dx = (x - x_mean) * valid
+        slope = (dx * (y - y_mean)).sum(axis=0) / (dx * dx).sum(axis=0)
+    slope = np.where(n > 1, np.nan_to_num(slope), 0.0)
+
+    # Latest available score per challenge
+    last_row = np.maximum.accumulate(
+        np.where(valid, np.arange(scores.shape[0])[:, None], -1), axis=0
+    )[-1]
+    latest = scores[np.clip(last_row, 0, None), np.arange(scores.shape[1])]
+
+    trends = []
+    for j, column in enumerate(columns):
+        series = scores[:, j]
+        trends.append({
+            "challenge_id": matrix.challenge_ids[column],
+            "runs": int(n[j]),
+            "mean": float(y_mean[j]) if n[j] else None,
+            "latest": float(latest[j]) if n[j] else None,
+            "slope": float(slope[j]),
+            "scores": [None if np.isnan(v) else float(v) for v in series],
+        })
+    return trends
+
+
+def previous_run_id(project_id: str, job: JobModel) -> Optional[str]:
+    """
+    Get the ID of the run created right before `job`, if any.
+    """
+    previous = JobModel.list_recent(project_id, limit=1, cursor=encode_cursor(job))
+    return previous[0].id if previous else None
+
+
+def count_regressions(project_id: str, jobs: List[JobModel]) -> Dict[str, int]:
+    """
+    Count regressions of consecutive runs (e.g. a page of `list_recent`),
+    each compared to the run before it, with a single bulk query.
+    """
+    if not jobs:
+        return {}
+    job_ids = [job.id for job in jobs]
+    oldest = min(jobs, key=lambda job: (job.created_at, job.id))
+    previous_id = previous_run_id(project_id, oldest)
+    if previous_id:
+        job_ids.append(previous_id)
+    counts = regression_counts(load_results(project_id, job_ids=job_ids))
+    counts.pop(previous_id, None)
+    return counts
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+from ..utils import fastjson
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, fall back to zlib
+    zstandard = None
+
+
+# Payloads larger than this (in bytes of JSON) are moved out of the database
+DEFAULT_THRESHOLD = 16 * 1024
+
+# Key marking a reference to a blob in a JSON column
+BLOB_REF_KEY = "$blob"
+
+_EXTENSIONS = {"zstd": ".zst", "zlib": ".zz"}
+
+# Keys of a reference dict (see `BlobStore.put`)
+_REF_KEYS = {BLOB_REF_KEY, "codec", "size"}
+
+
+class EncodedJSON:
+    """
+    A value for a JSON column that is already encoded, so that the database
+    stores the bytes as they are instead of serializing the value again (see
+    `storage.json_serializer`).
+    """
+    __slots__ = ("value", "data")
+
+    def __init__(self, value: Any, data: bytes):
+        self.value = value
+        self.data = data
+
+
+class BlobStore:
+    """
+    Content-addressed store for large task payloads.
+
+    Payloads are serialized to JSON, compressed and written once under
+    `<root>/<first two hex chars>/<sha256>.<ext>`, so identical outputs produced
+    by different tasks or runs share a single file. Database rows only keep a
+    small reference dict (see `offload`).
+    """
+
+    def __init__(self, root: Path, threshold: int = DEFAULT_THRESHOLD):
+        self.root = Path(root)
+        self.threshold = threshold
+        self.codec = "zstd" if zstandard is not None else "zlib"
+
+    def _path(self, digest: str, codec: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{_EXTENSIONS[codec]}"
+
+    def put(self, data: bytes) -> dict:
+        """
+        Store raw bytes (if not stored yet) and return the reference dict.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, self.codec)
+        ref = {BLOB_REF_KEY: digest, "codec": self.codec, "size": len(data)}
+        if path.exists():
+            # Reused blobs count as new for the grace period of `sweep_blobs`,
+            # as the row referencing them may not be committed yet
+            try:
+                os.utime(path)
+                return ref
+            except FileNotFoundError:
+                pass  # Swept in the meantime: write it again
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial blobs
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_compress(data, self.codec))
+        os.replace(tmp_path, path)
+        return ref
+
+    def get(self, ref: dict) -> bytes:
+        """
+        Read the raw bytes for a reference created by `put`.
+        """
+        path = self._path(ref[BLOB_REF_KEY], ref["codec"])
+        with open(path, "rb") as f:
+            return _decompress(f.read(), ref["codec"])
+
+    def offload(self, value: Any, packer=None) -> Any:
+        """
+        Prepare a value for a JSON column.
+
+        Values whose JSON encoding exceeds the threshold are written to the store
+        and replaced by a reference. Smaller values are passed through `packer`
+        if one is given (e.g. to compress logs inline), or returned with their
+        encoding as `EncodedJSON`, so that it is not done twice.
+        """
+        if value is None:
+            return None
+        data = json.dumps(value, separators=(",", ":")).encode()
+        if len(data) > self.threshold:
+            return self.put(data)
+        return packer(value) if packer else EncodedJSON(value, data)
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Return the original value for a (possibly) offloaded JSON column value.
+        """
+        if is_blob_ref(value):
+            return fastjson.loads(self.get(value))
+        return value
+
+
+def is_blob_ref(value: Any) -> bool:
+    """
+    Check whether a JSON column value is a reference to a blob: a dict with
+    exactly the keys of one, so that user data with a "$blob" key isn't
+    mistaken for a reference.
+    """
+    return (
+        isinstance(value, dict)
+        and value.keys() == _REF_KEYS
+        and isinstance(value[BLOB_REF_KEY], str)
+        and value["codec"] in _EXTENSIONS
+        and isinstance(value["size"], int)
+    )
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "This blob is zstd-compressed; install the 'zstandard' package"
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+
+# Global blob store, created on first use (mirrors the database session setup)
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get the blob store of the current project (`.multinear/blobs`).
+    """
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(Path(".multinear") / "blobs")
+    return _blob_store
+
+
+def configure_blob_store(threshold: Optional[int] = None) -> BlobStore:
+    """
+    Adjust the blob store settings, e.g. from the project's `meta` config.
+    """
+    store = get_blob_store()
+    if threshold is not None:
+        store.threshold = threshold
+    return store
+
+
+def resolve_blob(value: Any) -> Any:
+    """
+    Shortcut for resolving a column value with the project's blob store.
+    """
+    if is_blob_ref(value):
+        return get_blob_store().resolve(value)
+    return value
@@ -0,0 +1,229 @@
+import difflib
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import aliased
+
+from .blobs import resolve_blob
+from .storage import TaskModel, TaskStatus, db_context
+
+
+# Number of tasks whose evaluation details are loaded per query
+_BATCH_SIZE = 500
+
+
+def compare_runs(run_a: str, run_b: str) -> Dict[str, Any]:
+    """
+    Compare two runs task by task, matching tasks on their challenge ID,
+    matrix variant and sample (of repeated tasks).
+
+    Only IDs, scores and statuses are read for the comparison; evaluation
+    details are loaded just for tasks whose score changed, to report
+    per-criterion changes. Outputs are never loaded (see `diff_outputs`).
+
+    Args:
+        run_a: The ID of the base run.
+        run_b: The ID of the run compared to the base.
+
+    Returns:
+        Dict with a summary, newly failing and newly passing tasks, score changes
+        and challenges present in only one of the runs.
+    """
+    task_a = aliased(TaskModel)
+    task_b = aliased(TaskModel)
+    with db_context() as db:
+        pairs = (db.query(
+                    task_a.challenge_id, task_a.variant, task_a.repeat_index,
+                    task_a.id, task_a.eval_score, task_a.status,
+                    task_b.id, task_b.eval_score, task_b.status,
+                 )
+                 .join(task_b, and_(
+                     task_a.challenge_id == task_b.challenge_id,
+                     func.coalesce(task_a.variant, "") == func.coalesce(task_b.variant, ""),
+                     func.coalesce(task_a.repeat_index, 0)
+                     == func.coalesce(task_b.repeat_index, 0),
+                 ))
+                 .filter(task_a.job_id == run_a, task_b.job_id == run_b)
+                 .order_by(task_a.task_number)
+                 .all())
+        removed = _only_in(db, run_a, run_b)
+        added = _only_in(db, run_b, run_a)
+
+    newly_failing = []
+    newly_passing = []
+    score_changes = []
+    for (
+        challenge_id, variant, repeat_index, id_a, score_a, status_a, id_b, score_b, status_b
+    ) in pairs:
+        entry = {
+            "challenge_id": challenge_id,
+            "variant": variant,
+            "repeat_index": repeat_index,
+            "task_a": id_a,
+            "task_b": id_b,
+            "status_a": status_a,
+            "status_b": status_b,
+            "score_a": score_a,
+            "score_b": score_b,
+        }
+        passed_a = status_a == TaskStatus.COMPLETED
+        passed_b = status_b == TaskStatus.COMPLETED
+        if passed_a and status_b == TaskStatus.FAILED:
+            newly_failing.append(entry)
+        elif status_a == TaskStatus.FAILED and passed_b:
+            newly_passing.append(entry)
+        if (score_a or 0) != (score_b or 0):
+            entry["delta"] = (score_b or 0) - (score_a or 0)
+            score_changes.append(entry)
+
+    _add_criteria_changes(score_changes)
+    score_changes.sort(key=lambda entry: entry["delta"])
+
+    return {
+        "run_a": run_a,
+        "run_b": run_b,
+        "summary": {
+            "compared": len(pairs),
+            "newly_failing": len(newly_failing),
+            "newly_passing": len(newly_passing),
+            "score_changes": len(score_changes),
+            "added": len(added),
+            "removed": len(removed),
+            "mean_delta": (
+                sum(entry["delta"] for entry in score_changes) / len(pairs)
+                if pairs else 0.0
+            ),
+        },
+        "newly_failing": newly_failing,
+        "newly_passing": newly_passing,
+        "score_changes": score_changes,
+        "added": added,
+        "removed": removed,
+    }
+
+
+def _only_in(db, run_id: str, other_run_id: str) -> List[str]:
+    """
+    Challenge IDs of `run_id` that are missing from `other_run_id`, with the
+    variant in brackets for tasks of a matrix run.
+    """
+    other = aliased(TaskModel)
+    in_other = (db.query(other.id)
+                .filter(
+                    other.job_id == other_run_id,
+                    other.challenge_id == TaskModel.challenge_id,
+                    func.coalesce(other.variant, "") == func.coalesce(TaskModel.variant, ""),
+                )
+                .exists())
+    rows = (db.query(TaskModel.challenge_id, TaskModel.variant)
+            .filter(TaskModel.job_id == run_id, ~in_other)
+            .group_by(TaskModel.challenge_id, TaskModel.variant)
+            .order_by(func.min(TaskModel.task_number))
+            .all())
+    return [
+        f"{challenge_id} [{variant}]" if variant else challenge_id
+        for challenge_id, variant in rows
+    ]
+
+
+def _add_criteria_changes(entries: List[Dict[str, Any]]):
+    """
+    Add per-criterion score changes (from `eval_details.evaluations`) to entries.
+    """
+    for start in range(0, len(entries), _BATCH_SIZE):
+        batch = entries[start:start + _BATCH_SIZE]
+        task_ids = [e["task_a"] for e in batch] + [e["task_b"] for e in batch]
+        with db_context() as db:
+            details = dict(
+                db.query(TaskModel.id, TaskModel.eval_details)
+                .filter(TaskModel.id.in_(task_ids))
+                .all()
+            )
+        for entry in batch:
+            scores_a = _criteria_scores(details.get(entry["task_a"]))
+            scores_b = _criteria_scores(details.get(entry["task_b"]))
+            entry["criteria"] = [
+                {
+                    "criterion": criterion,
+                    "score_a": scores_a.get(criterion),
+                    "score_b": scores_b.get(criterion),
+                }
+                for criterion in list(scores_a) + [
+                    c for c in scores_b if c not in scores_a
+                ]
+                if scores_a.get(criterion) != scores_b.get(criterion)
+            ]
+
+
+def _criteria_scores(eval_details: Any) -> Dict[str, float]:
+    if not isinstance(eval_details, dict):
+        return {}
+    return {
+        evaluation.get("criterion"): evaluation.get("score")
+        for evaluation in eval_details.get("evaluations", [])
+    }
+
+
+def _output_text(output: Any) -> str:
+    output = resolve_blob(output)
+    if isinstance(output, str):
+        return output
+    if isinstance(output, dict) and isinstance(output.get("str"), str):
+        return output["str"]
+    return json.dumps(output, indent=2, sort_keys=True)
+
+
+def diff_outputs(task_a_id: str, task_b_id: str, context: int = 3) -> str:
+    """
+    Unified diff between the outputs of two tasks.
+
+    Computed on demand, e.g. when a task of a comparison is expanded.
+
+    Raises:
+        ValueError: If a task is not found.
+    """
+    with db_context() as db:
+        outputs = dict(
+            db.query(TaskModel.id, TaskModel.task_output)
+            .filter(TaskModel.id.in_([task_a_id, task_b_id]))
+            .all()
+        )
+    for task_id in (task_a_id, task_b_id):
+        if task_id not in outputs:
+            raise ValueError(f"Task {task_id} not found")
+
+    lines_a = (_output_text(outputs[task_a_id]) + "\n").splitlines(keepends=True)
+    lines_b = (_output_text(outputs[task_b_id]) + "\n").splitlines(keepends=True)
+    return "".join(difflib.unified_diff(
+        lines_a, lines_b,
+        fromfile=task_a_id[-8:], tofile=task_b_id[-8:],
+        n=context,
+    ))
+
+
+def diff_challenge(
+    run_a: str, run_b: str, challenge_id: str, variant: Optional[str] = None
+) -> str:
+    """
+    Unified diff between the outputs of a challenge in two runs (for one
+    variant of matrix runs).
+
+    Raises:
+        ValueError: If the challenge is missing from one of the runs.
+    """
+    with db_context() as db:
+        task_ids = dict(
+            db.query(TaskModel.job_id, TaskModel.id)
+            .filter(
+                TaskModel.job_id.in_([run_a, run_b]),
+                TaskModel.challenge_id == challenge_id,
+                func.coalesce(TaskModel.variant, "") == (variant or ""),
+            )
+            .order_by(TaskModel.task_number.desc())  # The first sample wins
+            .all()
+        )
+    for run_id in (run_a, run_b):
+        if run_id not in task_ids:
+            raise ValueError(f"Task {challenge_id} not found in run {run_id}")
+    return diff_outputs(task_ids[run_a], task_ids[run_b])
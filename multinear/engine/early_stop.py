@@ -0,0 +1,93 @@
+from typing import Any, Dict, Optional
+
+from ..utils.stats import sequential_upper_bound
+
+
+class EarlyStop:
+    """
+    Policy ending a run once its outcome is decided, configured in `meta`:
+
+        early_stop:
+          min_pass_rate: 0.9    # the gate the run is checked against
+          confidence: 0.95      # of the sequential test (default 0.95)
+          min_tasks: 20         # tasks before the test applies (default 20)
+          max_failures: 50      # stop after this many failed tasks
+
+    The run stops when any of these holds:
+
+    - the pass rate can't reach `min_pass_rate` even if all remaining tasks pass
+    - an upper confidence bound on the pass rate is below `min_pass_rate`; the
+      bound stays valid although it's checked after every task
+    - `max_failures` tasks failed (failed evaluations and errors)
+
+    The samples of a repeated task are correlated, so a task counts once, with
+    its share of passing samples: the bounds hold for outcomes between 0 and 1.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        min_pass_rate: Optional[float] = None,
+        confidence: float = 0.95,
+        min_tasks: int = 20,
+        max_failures: Optional[int] = None,
+    ):
+        self.total = total
+        self.min_pass_rate = min_pass_rate
+        self.confidence = confidence
+        self.min_tasks = min_tasks
+        self.max_failures = max_failures
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], total: int) -> Optional["EarlyStop"]:
+        """
+        Build the policy from the `meta.early_stop` config, if any.
+
+        Raises:
+            ValueError: If the config sets neither a pass rate nor a failure limit.
+        """
+        if not config:
+            return None
+        if config.get("min_pass_rate") is None and config.get("max_failures") is None:
+            raise ValueError("early_stop needs min_pass_rate or max_failures")
+        return cls(
+            total,
+            min_pass_rate=config.get("min_pass_rate"),
+            confidence=config.get("confidence", 0.95),
+            min_tasks=config.get("min_tasks", 20),
+            max_failures=config.get("max_failures"),
+        )
+
+    def check(self, passed: float, failed: float) -> Optional[str]:
+        """
+        Check the outcomes so far.
+
+        Args:
+            passed: Number of tasks that passed (shares of passing samples of
+                repeated tasks included).
+            failed: Number of tasks that failed or raised an error.
+
+        Returns:
+            Why the run should stop, or None to continue.
+        """
+        finished = passed + failed
+        if self.max_failures is not None and failed >= self.max_failures:
+            return f"{failed:g} tasks failed (max_failures: {self.max_failures})"
+        if self.min_pass_rate is None or finished == 0:
+            return None
+
+        best_case = (passed + self.total - finished) / self.total
+        if best_case < self.min_pass_rate:
+            return (
+                f"pass rate can't reach {self.min_pass_rate:.0%} "
+                f"(at most {best_case:.1%} with {self.total - finished:g} tasks left)"
+            )
+
+        if finished >= self.min_tasks:
+            upper = sequential_upper_bound(passed, finished, self.confidence)
+            if upper < self.min_pass_rate:
+                return (
+                    f"pass rate {passed / finished:.1%} after {finished} tasks is below "
+                    f"{self.min_pass_rate:.0%} ({self.confidence:.0%} upper bound {upper:.1%})"
+                )
+        return None
@@ -1,10 +1,35 @@
-from .checklist import ChecklistClassifier2
+import hashlib
+import time
+
+from .evaluators import evaluator_names, get_evaluator, is_judge, output_text, result
+from ..utils import metrics
+
+
+# Tiers of the evaluation cascade, from the cheapest. The tier that decided a
+# task is saved as `tier` in its evaluation details.
+TIERS = ("empty", "local", "approved", "judge")
 
 
 def evaluate(spec: dict, input: any, output: any):
     """
     Evaluate an output against a specification.
 
+    Every key of the spec naming an evaluator (`checklist`, `exact`, `regex`,
+    `json_schema`, `numeric`, `snapshot` or a third-party one, see
+    `evaluators.py`) is evaluated. The task passes if all evaluators pass, and
+    its score is the mean of their scores.
+
+    Evaluation is a cascade, and LLM judges such as `checklist` only run when
+    the cheaper tiers leave the outcome undecided:
+
+    - empty: an empty output fails (unless the spec sets `allow_empty`)
+    - local: any failing local evaluator fails the task
+    - approved: an output listed in the spec's `approved` outputs (text, or
+      "sha256:<hex digest>") passes
+    - judge: the LLM judges decide
+
+    Judges that were not run are listed as `skipped` in the details.
+
     Args:
         spec: The evaluation specification from the task.
         input: The input to the task.
@@ -12,21 +37,102 @@ def evaluate(spec: dict, input: any, output: any):
 
     Returns:
         A dictionary containing the evaluation result.
+
+    Raises:
+        ValueError: If the spec names no evaluator.
     """
+    names = evaluator_names(spec)
+    if not names:
+        raise ValueError("No evaluator specified")
+    judges = [name for name in names if is_judge(name)]
+    local = [name for name in names if name not in judges]
 
-    # Set the minimum score required to pass
-    min_score = spec.get('min_score', 1.0)
+    results = {}
+    tier = "local"
+    if judges and not spec.get("allow_empty", False) and not output_text(output).strip():
+        tier = "empty"
+        results["empty"] = result(False, "non-empty output", "Output is empty")
+    else:
+        for name in local:
+            results[name] = _run_evaluator(name, spec, input, output)
+        if judges and all(r["passed"] for r in results.values()):
+            if _is_approved(spec.get("approved"), output):
+                tier = "approved"
+                results["approved"] = result(
+                    True, "approved output", "Output matches an approved output"
+                )
+            else:
+                tier = "judge"
+                for name in judges:
+                    results[name] = _run_evaluator(name, spec, input, output)
+
+    skipped = judges if tier != "judge" else []
+    for name in skipped:
+        metrics.EVALUATIONS.labels(name, "skipped").inc()
 
-    evaluator = None
-    if 'checklist' in spec:
-        # Use the ChecklistClassifier2 for evaluation
-        evaluator = ChecklistClassifier2()
-        result = evaluator(output, spec['checklist'], input=input)
+    score = sum(r["score"] for r in results.values()) / len(results)
+    if len(results) == 1:
+        # A single evaluator's details are kept as is
+        details = dict(next(iter(results.values()))["details"])
     else:
-        raise ValueError("No evaluator specified")
+        details = {
+            "evaluations": [
+                evaluation
+                for r in results.values()
+                for evaluation in r["details"].get("evaluations", [])
+            ],
+            "overall_score": score,
+            "evaluators": {
+                name: {"score": r["score"], "passed": r["passed"]}
+                for name, r in results.items()
+            },
+        }
+        cached = sum(r["details"].get("cached", 0) for r in results.values())
+        if cached:
+            details["cached"] = cached
+    details["tier"] = tier
+    if skipped:
+        details["skipped"] = skipped
 
     return {
-        'score': result.score,
-        'passed': result.score >= min_score,
-        'details': result.metadata
+        'score': score,
+        'passed': all(r["passed"] for r in results.values()),
+        'details': details,
     }
+
+
+def _is_approved(approved, output) -> bool:
+    """
+    Whether the output is one of the approved outputs, given as text or as
+    "sha256:<hex digest>" of the whitespace-stripped text.
+    """
+    if not approved:
+        return False
+    if not isinstance(approved, list):
+        approved = [approved]
+    text = output_text(output).strip()
+    digest = None
+    for entry in approved:
+        entry = str(entry)
+        if entry.startswith("sha256:"):
+            if digest is None:
+                digest = hashlib.sha256(text.encode()).hexdigest()
+            if entry[len("sha256:"):].lower() == digest:
+                return True
+        elif entry.strip() == text:
+            return True
+    return False
+
+
+def _run_evaluator(name: str, spec: dict, input: any, output: any):
+    evaluator = get_evaluator(name)
+    start = time.perf_counter()
+    try:
+        outcome = evaluator(spec[name], input, output, spec)
+    except Exception:
+        metrics.EVALUATIONS.labels(name, "error").inc()
+        raise
+    finally:
+        metrics.EVALUATION_SECONDS.labels(name).observe(time.perf_counter() - start)
+    metrics.EVALUATIONS.labels(name, "ok").inc()
+    return outcome
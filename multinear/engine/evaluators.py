@@ -0,0 +1,352 @@
+import hashlib
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+
+# Entry point group for third-party evaluators
+ENTRY_POINT_GROUP = "multinear.evaluators"
+
+# Evaluators by the task spec key that selects them. Each is called with the
+# value of its key, the task input and output, and the whole spec, and returns
+# a dict with `score`, `passed` and `details` (like `evaluate`). Evaluators
+# with a true `judge` attribute call an LLM; they are only run when the cheap
+# ones leave the outcome undecided (see `evaluate`).
+EVALUATORS: Dict[str, Callable[..., Dict[str, Any]]] = {}
+
+# Third-party evaluators found but not imported yet
+_entry_points: Optional[Dict[str, Any]] = None
+
+
+def register_evaluator(name: str, judge: bool = False):
+    """
+    Decorator registering an evaluator under a task spec key. Set `judge` for
+    evaluators that are slow or costly, such as LLM judges.
+
+    Example:
+        @register_evaluator("max_words")
+        def max_words(config, input, output, spec):
+            words = len(output_text(output).split())
+            return result(words <= config, f"max_words: {config}", f"{words} words")
+    """
+    def decorator(func):
+        func.judge = judge
+        EVALUATORS[name] = func
+        return func
+    return decorator
+
+
+def _discover_entry_points() -> Dict[str, Any]:
+    from importlib.metadata import entry_points
+
+    found = entry_points()
+    if hasattr(found, "select"):
+        group = found.select(group=ENTRY_POINT_GROUP)
+    else:  # Python < 3.10
+        group = found.get(ENTRY_POINT_GROUP, [])
+    return {ep.name: ep for ep in group}
+
+
+def get_evaluator(name: str) -> Optional[Callable[..., Dict[str, Any]]]:
+    """
+    Find the evaluator for a task spec key. Third-party evaluators are
+    discovered once, and their module is only imported when first used.
+    """
+    global _entry_points
+
+    evaluator = EVALUATORS.get(name)
+    if evaluator is not None:
+        return evaluator
+    if _entry_points is None:
+        _entry_points = _discover_entry_points()
+    entry_point = _entry_points.pop(name, None)
+    if entry_point is None:
+        return None
+    EVALUATORS[name] = entry_point.load()
+    return EVALUATORS[name]
+
+
+def is_judge(name: str) -> bool:
+    return getattr(get_evaluator(name), "judge", False)
+
+
+def evaluator_names(spec: dict):
+    """
+    The keys of a task spec that select an evaluator, in spec order.
+    """
+    return [key for key in spec if key != "input" and get_evaluator(key)]
+
+
+def output_text(output: Any) -> str:
+    """
+    The text of a task output, as compared by the local evaluators.
+    """
+    if isinstance(output, dict) and "str" in output:
+        output = output["str"]
+    if isinstance(output, str):
+        return output
+    return json.dumps(output, sort_keys=True)
+
+
+def result(passed: bool, criterion: str, rationale: str, score: float = None, **details):
+    """
+    Build an evaluator result with a single criterion, in the shape of the
+    checklist judge's results.
+    """
+    if score is None:
+        score = 1.0 if passed else 0.0
+    return {
+        "score": score,
+        "passed": passed,
+        "details": {
+            "evaluations": [
+                {"criterion": criterion, "score": score, "rationale": rationale}
+            ],
+            "overall_score": score,
+            **details,
+        },
+    }
+
+
+def _options(config, key: str) -> dict:
+    """
+    Evaluator options are either a value or a dict with the value under `key`.
+    """
+    return config if isinstance(config, dict) else {key: config}
+
+
+# Whether checklist results are cached per criterion (see `configure_criterion_cache`)
+_criterion_cache_enabled = True
+
+
+def configure_criterion_cache(enabled: bool = True):
+    """
+    Enable or disable the per-criterion cache of checklist results, e.g. from
+    the project's `meta` config.
+    """
+    global _criterion_cache_enabled
+    _criterion_cache_enabled = enabled
+
+
+def _parse_checklist(config) -> list:
+    """
+    Checklist items from a task spec, given as a list or a YAML string.
+    """
+    if isinstance(config, str):
+        import yaml
+
+        try:
+            config = yaml.safe_load(config)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML checklist: {e}")
+    return config if isinstance(config, list) else [config]
+
+
+def _criterion_key(input: Any, output: Any, criterion: str, model: str) -> str:
+    payload = json.dumps([input, output, criterion, model], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@register_evaluator("checklist", judge=True)
+def checklist(config, input, output, spec):
+    """
+    LLM judge scoring each checklist item; passes at `min_score` (default 1.0).
+
+    Judged criteria are cached on (input, output, criterion, judge model), and
+    only criteria without a cached result are sent to the judge. The
+    evaluations and overall score (their mean) are then rebuilt from cached
+    and new results, in checklist order.
+    """
+    from .checklist import ChecklistClassifier2
+    from .storage import CriterionResultModel
+    from ..utils.tracing import span
+
+    evaluator = ChecklistClassifier2()
+    min_score = spec.get("min_score", 1.0)
+    items = _parse_checklist(config)
+
+    def judge(items_to_judge):
+        with span("checklist", model=evaluator.model, criteria=len(items_to_judge)):
+            return evaluator(output, items_to_judge, input=input)
+
+    if not _criterion_cache_enabled or not items:
+        score = judge(items)
+        return {
+            "score": score.score,
+            "passed": score.score >= min_score,
+            "details": score.metadata,
+        }
+
+    criteria = [
+        item if isinstance(item, str) else json.dumps(item, sort_keys=True)
+        for item in items
+    ]
+    keys = [_criterion_key(input, output, c, evaluator.model) for c in criteria]
+    cached = CriterionResultModel.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+
+    judged = {}
+    if missing:
+        score = judge([items[i] for i in missing])
+        new_evaluations = score.metadata["evaluations"]
+        if len(new_evaluations) != len(missing):
+            # Results can't be matched to criteria: judge the whole checklist
+            # again, without caching
+            score = judge(items) if cached else score
+            return {
+                "score": score.score,
+                "passed": score.score >= min_score,
+                "details": score.metadata,
+            }
+        judged = {
+            i: {"score": ev["score"], "rationale": ev.get("rationale", "")}
+            for i, ev in zip(missing, new_evaluations)
+        }
+        CriterionResultModel.save_many([
+            {
+                "key": keys[i],
+                "model": evaluator.model,
+                "criterion": criteria[i],
+                "score": judged[i]["score"],
+                "rationale": judged[i]["rationale"],
+            }
+            for i in missing
+        ])
+
+    evaluations = []
+    for i, (criterion, key) in enumerate(zip(criteria, keys)):
+        found = judged.get(i) or {
+            "score": cached[key].score, "rationale": cached[key].rationale
+        }
+        evaluations.append({"criterion": criterion, **found})
+    overall_score = sum(ev["score"] for ev in evaluations) / len(evaluations)
+    return {
+        "score": overall_score,
+        "passed": overall_score >= min_score,
+        "details": {
+            "evaluations": evaluations,
+            "overall_score": overall_score,
+            "cached": len(criteria) - len(missing),
+        },
+    }
+
+
+@register_evaluator("exact")
+def exact(config, input, output, spec):
+    """
+    The output equals `value`, optionally ignoring case and surrounding whitespace.
+    """
+    options = _options(config, "value")
+    expected, actual = str(options["value"]), output_text(output)
+    if options.get("strip", True):
+        expected, actual = expected.strip(), actual.strip()
+    if options.get("ignore_case", False):
+        expected, actual = expected.casefold(), actual.casefold()
+    passed = expected == actual
+    return result(
+        passed,
+        f"exact: {options['value']!r}",
+        "Output matches" if passed else f"Output {actual[:200]!r} doesn't match",
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str, flags: int):
+    return re.compile(pattern, flags)
+
+
+@register_evaluator("regex")
+def regex(config, input, output, spec):
+    """
+    The output matches `pattern` (searched anywhere unless `full: true`), or
+    doesn't when `negate: true`.
+    """
+    options = _options(config, "pattern")
+    flags = re.IGNORECASE if options.get("ignore_case", False) else 0
+    compiled = _compile(options["pattern"], flags | re.DOTALL | re.MULTILINE)
+    text = output_text(output)
+    found = (compiled.fullmatch if options.get("full", False) else compiled.search)(text)
+    passed = bool(found) != bool(options.get("negate", False))
+    return result(
+        passed,
+        f"regex: {options['pattern']}",
+        f"Pattern {'found' if found else 'not found'} in output",
+    )
+
+
+@register_evaluator("json_schema")
+def json_schema(config, input, output, spec):
+    """
+    The output is JSON (or already structured) and valid against the schema.
+    Validation requires the jsonschema package.
+    """
+    if isinstance(output, dict) and "str" in output:
+        output = output["str"]
+    if isinstance(output, str):
+        try:
+            output = json.loads(output)
+        except ValueError as e:
+            return result(False, "json_schema", f"Output is not valid JSON: {e}")
+
+    try:
+        import jsonschema
+    except ImportError:
+        raise RuntimeError("The json_schema evaluator requires the jsonschema package")
+
+    validator_class = jsonschema.validators.validator_for(config)
+    errors = list(validator_class(config).iter_errors(output))
+    if errors:
+        rationale = "; ".join(
+            f"{'/'.join(map(str, e.path)) or '(root)'}: {e.message}" for e in errors[:5]
+        )
+        return result(False, "json_schema", rationale)
+    return result(True, "json_schema", "Output matches the schema")
+
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+@register_evaluator("numeric")
+def numeric(config, input, output, spec):
+    """
+    The first number in the output is within `tolerance` of `value` (absolute,
+    or relative with `relative: true`).
+    """
+    options = _options(config, "value")
+    expected = float(options["value"])
+    tolerance = float(options.get("tolerance", 0.0))
+    criterion = f"numeric: {expected} ± {tolerance}"
+    if options.get("relative", False):
+        criterion += " (relative)"
+
+    if isinstance(output, (int, float)) and not isinstance(output, bool):
+        actual = float(output)
+    else:
+        match = _NUMBER.search(output_text(output).replace(",", ""))
+        if not match:
+            return result(False, criterion, "No number found in output")
+        actual = float(match.group())
+
+    if options.get("relative", False):
+        passed = math.isclose(actual, expected, rel_tol=tolerance, abs_tol=0.0)
+    else:
+        passed = abs(actual - expected) <= tolerance
+    return result(passed, criterion, f"Output value is {actual}")
+
+
+@register_evaluator("snapshot")
+def snapshot(config, input, output, spec):
+    """
+    The SHA-256 of the output (whitespace-stripped) equals the approved `hash`.
+    """
+    options = _options(config, "hash")
+    digest = hashlib.sha256(output_text(output).strip().encode()).hexdigest()
+    passed = digest == str(options["hash"]).lower()
+    return result(
+        passed,
+        f"snapshot: {str(options['hash'])[:12]}",
+        "Output matches the snapshot" if passed else f"Output hash is {digest[:12]}",
+        digest=digest,
+    )
@@ -0,0 +1,245 @@
+import csv
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, TextIO
+from xml.sax import saxutils
+
+from sqlalchemy import and_, case, func
+
+from .blobs import resolve_blob
+from .storage import JobModel, ProjectModel, TaskModel, db_context
+from ..utils.capture import decompress_logs
+
+
+EXPORT_DIR = Path(".multinear") / "exports"
+
+EXPORT_FORMATS = {
+    "jsonl": ".jsonl",
+    "junit": ".xml",
+    "csv": ".csv",
+    "parquet": ".parquet",
+}
+
+# Columns of the flat formats (CSV and Parquet); payload columns are JSON-encoded
+# unless they hold a plain string
+SCALAR_COLUMNS = (
+    "task_id", "task_number", "challenge_id", "variant",
+    "repeat_index", "status", "passed", "score",
+    "error", "created_at", "finished_at", "duration",
+)
+PAYLOAD_COLUMNS = ("input", "output", "details", "eval_spec", "eval_details", "timings")
+FLAT_COLUMNS = SCALAR_COLUMNS + PAYLOAD_COLUMNS
+
+# Tasks loaded from the database per query
+BATCH_SIZE = 200
+
+
+def _isoformat(value: datetime):
+    return value.isoformat() if value else None
+
+
+def task_record(task: TaskModel, include_logs: bool = False) -> Dict[str, Any]:
+    """
+    Convert a task to a JSON-serializable dict, with payloads resolved.
+    """
+    duration = None
+    if task.finished_at and task.created_at:
+        duration = (task.finished_at - task.created_at).total_seconds()
+    record = {
+        "task_id": task.id,
+        "task_number": task.task_number,
+        "challenge_id": task.challenge_id,
+        "variant": task.variant,
+        "repeat_index": task.repeat_index,
+        "status": task.status,
+        "passed": task.eval_passed,
+        "score": task.eval_score,
+        "error": task.error,
+        "created_at": _isoformat(task.created_at),
+        "finished_at": _isoformat(task.finished_at),
+        "duration": duration,
+        "input": resolve_blob(task.task_input),
+        "output": resolve_blob(task.task_output),
+        "details": task.task_details,
+        "eval_spec": task.eval_spec,
+        "eval_details": task.eval_details,
+        "timings": task.timings,
+    }
+    if include_logs:
+        record["logs"] = decompress_logs(resolve_blob(task.task_logs))
+        record["eval_logs"] = decompress_logs(resolve_blob(task.eval_logs))
+    return record
+
+
+def iter_records(job_id: str, include_logs: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a job's tasks, loading them from the database in batches.
+    """
+    for batch in TaskModel.iter_batches(job_id, batch_size=BATCH_SIZE):
+        for task in batch:
+            yield task_record(task, include_logs=include_logs)
+
+
+def _flat(record: Dict[str, Any]) -> Dict[str, Any]:
+    flat = {column: record[column] for column in SCALAR_COLUMNS}
+    for column in PAYLOAD_COLUMNS:
+        value = record[column]
+        flat[column] = value if value is None or isinstance(value, str) else json.dumps(value)
+    return flat
+
+
+def _write_jsonl(job: JobModel, f: TextIO, include_logs: bool):
+    for record in iter_records(job.id, include_logs=include_logs):
+        f.write(json.dumps(record) + "\n")
+
+
+def _write_csv(job: JobModel, f: TextIO, include_logs: bool):
+    writer = csv.DictWriter(f, fieldnames=FLAT_COLUMNS)
+    writer.writeheader()
+    for record in iter_records(job.id):
+        writer.writerow(_flat(record))
+
+
+def _job_counts(job_id: str) -> Dict[str, int]:
+    """
+    Number of tasks, failed evaluations and errors of a job, in one query.
+    """
+    with db_context() as db:
+        tests, failures, errors = db.query(
+            func.count(TaskModel.id),
+            func.sum(case(
+                (and_(TaskModel.error.is_(None), TaskModel.eval_passed.isnot(True)), 1),
+                else_=0,
+            )),
+            func.sum(case((TaskModel.error.isnot(None), 1), else_=0)),
+        ).filter(TaskModel.job_id == job_id).one()
+    return {"tests": tests, "failures": failures or 0, "errors": errors or 0}
+
+
+# Characters outside the XML 1.0 Char range (e.g. ANSI escapes, NUL), which XML
+# parsers reject even when escaped
+_XML_INVALID = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+def _xml_escape(text: str) -> str:
+    """
+    Escape text for XML content, replacing characters XML can't contain with U+FFFD.
+    """
+    return saxutils.escape(_XML_INVALID.sub("\ufffd", text))
+
+
+def _xml_attr(text: str) -> str:
+    """
+    Quote text as an XML attribute value, replacing characters XML can't
+    contain with U+FFFD.
+    """
+    return saxutils.quoteattr(_XML_INVALID.sub("\ufffd", text))
+
+
+def _write_junit(job: JobModel, f: TextIO, include_logs: bool):
+    """
+    One test suite for the run, one test case per task. Tasks that raised an
+    error are errors, other tasks that didn't pass their evaluation are failures.
+    """
+    project = ProjectModel.find(job.project_id)
+    counts = _job_counts(job.id)
+    suite = f"{project.name if project else job.project_id} run {job.id[-8:]}"
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(
+        f"<testsuites><testsuite name={_xml_attr(suite)} tests=\"{counts['tests']}\" "
+        f"failures=\"{counts['failures']}\" errors=\"{counts['errors']}\" "
+        f"timestamp={_xml_attr(_isoformat(job.created_at) or '')}>\n"
+    )
+    classname = _xml_attr(f"multinear.{job.project_id}")
+    for record in iter_records(job.id, include_logs=include_logs):
+        name = str(record["challenge_id"])
+        if record["variant"]:
+            name += f" [{record['variant']}]"
+        if record["repeat_index"] is not None:
+            name += f" #{record['repeat_index'] + 1}"
+        f.write(
+            f"  <testcase classname={classname} "
+            f"name={_xml_attr(name)} "
+            f"time=\"{record['duration'] or 0:.3f}\">"
+        )
+        if record["error"] is not None:
+            f.write(f"<error message={_xml_attr(record['error'])}/>")
+        elif not record["passed"]:
+            message = _xml_attr(f"score {record['score']}")
+            details = _xml_escape(json.dumps(record["eval_details"], indent=2))
+            f.write(f"<failure message={message}>{details}</failure>")
+        if include_logs and record.get("logs"):
+            output = "\n".join(str(log.get("message", "")) for log in record["logs"])
+            f.write(f"<system-out>{_xml_escape(output)}</system-out>")
+        f.write("</testcase>\n")
+    f.write("</testsuite></testsuites>\n")
+
+
+def _write_parquet(job: JobModel, path: Path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires the pyarrow package")
+
+    schema = pa.schema([
+        ("task_id", pa.string()),
+        ("task_number", pa.int64()),
+        ("challenge_id", pa.string()),
+        ("variant", pa.string()),
+        ("repeat_index", pa.int64()),
+        ("status", pa.string()),
+        ("passed", pa.bool_()),
+        ("score", pa.float64()),
+        ("error", pa.string()),
+        ("created_at", pa.string()),
+        ("finished_at", pa.string()),
+        ("duration", pa.float64()),
+    ] + [(column, pa.string()) for column in PAYLOAD_COLUMNS])
+
+    # Each batch of tasks becomes a row group
+    with pq.ParquetWriter(path, schema) as writer:
+        rows: List[Dict[str, Any]] = []
+        for record in iter_records(job.id):
+            rows.append(_flat(record))
+            if len(rows) >= BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+
+def export_run(
+    job: JobModel, fmt: str, path: Path, include_logs: bool = False
+) -> Path:
+    """
+    Export the tasks of a run to a file, streaming them from the database.
+
+    Args:
+        job: The run to export.
+        fmt: One of EXPORT_FORMATS.
+        path: The output file.
+        include_logs: Include captured logs (JSONL and JUnit only).
+
+    Returns:
+        The path of the written file.
+
+    Raises:
+        ValueError: If the format is unknown.
+        RuntimeError: If the format needs a package that isn't installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == "parquet":
+        _write_parquet(job, path)
+        return path
+
+    writers = {"jsonl": _write_jsonl, "csv": _write_csv, "junit": _write_junit}
+    with open(path, "w", encoding="utf-8", newline="" if fmt == "csv" else None) as f:
+        writers[fmt](job, f, include_logs)
+    return path
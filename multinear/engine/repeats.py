@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .storage import TaskModel
+from ..utils.stats import pass_at_k
+
+
+def get_repeats(task: Dict[str, Any], default: int = 1) -> int:
+    """
+    Number of samples to run of a task: its `repeats`, else the default
+    (`meta.repeats` of the config).
+
+    Raises:
+        ValueError: If the number is not a positive integer.
+    """
+    repeats = task.get("repeats", default)
+    try:
+        if int(repeats) >= 1 and int(repeats) == float(repeats):
+            return int(repeats)
+    except (TypeError, ValueError):
+        pass
+    raise ValueError(f"Invalid repeats: {repeats!r} (expected a positive integer)")
+
+
+class SampleStats:
+    """
+    Running aggregate of the samples of one challenge (and variant).
+    """
+    def __init__(self):
+        self.samples = 0
+        self.passes = 0
+        self.score_sum = 0.0
+        self.score_sq_sum = 0.0
+
+    def add(self, passed: bool, score: float):
+        self.samples += 1
+        self.passes += 1 if passed else 0
+        self.score_sum += score
+        self.score_sq_sum += score * score
+
+    def as_dict(self, k: int) -> Dict[str, Any]:
+        return challenge_stats(
+            self.samples, self.passes, self.score_sum, self.score_sq_sum, k
+        )
+
+
+def challenge_stats(
+    samples: int, passes: int, score_sum: float, score_sq_sum: float, k: int
+) -> Dict[str, Any]:
+    """
+    Statistics of the samples of a challenge: pass rate (pass@1), pass@k,
+    and the mean and sample variance of the scores.
+
+    pass@k is None for challenges with fewer than k samples.
+    """
+    mean = score_sum / samples
+    variance = 0.0
+    if samples > 1:
+        # Clamped, as rounding can make it slightly negative
+        variance = max(0.0, (score_sq_sum - samples * mean * mean) / (samples - 1))
+    return {
+        "samples": samples,
+        "passes": passes,
+        "pass_rate": passes / samples,
+        "pass_at_k": pass_at_k(samples, passes, k) if samples >= k else None,
+        "mean_score": mean,
+        "score_variance": variance,
+    }
+
+
+def summarize_challenges(stats: Iterable[Dict[str, Any]], k: int) -> Optional[Dict[str, Any]]:
+    """
+    Mean of the per-challenge statistics over challenges, each challenge
+    counting once whatever its number of samples.
+
+    Returns:
+        A dict with `k`, the number of `challenges` and `samples`, and the
+        mean `pass_rate`, `pass_at_k`, `mean_score` and `score_variance`;
+        None if there are no samples.
+    """
+    stats = list(stats)
+    if not stats:
+        return None
+    with_k = [s["pass_at_k"] for s in stats if s["pass_at_k"] is not None]
+
+    def mean(key):
+        return sum(s[key] for s in stats) / len(stats)
+
+    return {
+        "k": k,
+        "challenges": len(stats),
+        "samples": sum(s["samples"] for s in stats),
+        "pass_rate": mean("pass_rate"),
+        "pass_at_k": sum(with_k) / len(with_k) if with_k else None,
+        "mean_score": mean("mean_score"),
+        "score_variance": mean("score_variance"),
+    }
+
+
+def job_challenge_stats(job_id: str, k: int) -> List[Dict[str, Any]]:
+    """
+    Statistics of each challenge (and variant) of a job, from its stored tasks.
+    """
+    rows: List[Tuple] = TaskModel.challenge_stats(job_id)
+    return [
+        {
+            "challenge_id": challenge_id,
+            "variant": variant,
+            **challenge_stats(samples, passes or 0, score_sum or 0.0, score_sq_sum or 0.0, k),
+        }
+        for challenge_id, variant, samples, passes, score_sum, score_sq_sum in rows
+    ]
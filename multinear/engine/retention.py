@@ -0,0 +1,226 @@
+import gzip
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from sqlalchemy import DateTime, text
+
+from .blobs import get_blob_store, is_blob_ref, BLOB_REF_KEY
+from .storage import (
+    CriterionResultModel,
+    JobModel,
+    TaskModel,
+    DATABASE_PATH,
+    db_context,
+    get_engine,
+)
+
+
+ARCHIVE_DIR = Path(".multinear") / "archive"
+
+# Task columns that may hold blob references
+PAYLOAD_COLUMNS = ("task_input", "task_output", "task_logs", "eval_logs")
+
+# Blobs newer than this are never swept, as a running job may not have
+# committed the row referencing them yet
+BLOB_GRACE_SECONDS = 3600
+
+# Cached checklist criteria not used for this many days are deleted
+CRITERION_CACHE_DAYS = 30
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """
+    Convert a model instance to a JSON-serializable dict of its columns.
+    """
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data[column.name] = value
+    return data
+
+
+def _dict_to_row(cls, data: Dict[str, Any]):
+    """
+    Create a model instance from a dict produced by `_row_to_dict`.
+    Unknown keys (e.g. from newer versions) are ignored.
+    """
+    values = {}
+    for column in cls.__table__.columns:
+        if column.name not in data:
+            continue
+        value = data[column.name]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.name] = value
+    return cls(**values)
+
+
+def archive_job(job: JobModel, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """
+    Write a job and its tasks to a gzip-compressed JSONL file.
+
+    The first line holds the job, each following line one task. Payloads stored
+    in the blob store are inlined, so the archive is self-contained.
+
+    Returns:
+        The path of the archive file.
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{job.created_at.strftime('%Y%m%d')}-{job.id}.jsonl.gz"
+    blobs = get_blob_store()
+
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "job", "data": _row_to_dict(job)}) + "\n")
+        for task in TaskModel.list(job.id):
+            data = _row_to_dict(task)
+            for column in PAYLOAD_COLUMNS:
+                data[column] = blobs.resolve(data[column])
+            f.write(json.dumps({"type": "task", "data": data}) + "\n")
+    return path
+
+
+def restore_archive(path: Path) -> str:
+    """
+    Re-import a job archived by `archive_job`.
+
+    Returns:
+        The ID of the restored job.
+
+    Raises:
+        ValueError: If the archive is invalid or the job already exists.
+    """
+    blobs = get_blob_store()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        first = json.loads(f.readline() or "null")
+        if not first or first.get("type") != "job":
+            raise ValueError(f"Not a run archive: {path}")
+        job_id = first["data"]["id"]
+        if JobModel.find(job_id):
+            raise ValueError(f"Run {job_id} already exists")
+
+        with db_context() as db:
+            db.add(_dict_to_row(JobModel, first["data"]))
+            for line in f:
+                record = json.loads(line)
+                data = record["data"]
+                for column in PAYLOAD_COLUMNS:
+                    data[column] = blobs.offload(data.get(column))
+                db.add(_dict_to_row(TaskModel, data))
+            db.commit()
+    return job_id
+
+
+def sweep_blobs() -> Dict[str, int]:
+    """
+    Delete blobs that are no longer referenced by any task.
+
+    Returns:
+        Number of removed blobs and bytes freed.
+    """
+    store = get_blob_store()
+    if not store.root.exists():
+        return {"blobs_removed": 0, "blob_bytes_freed": 0}
+
+    # Collect referenced digests, reading only the payload columns
+    referenced = set()
+    with db_context() as db:
+        columns = [getattr(TaskModel, name) for name in PAYLOAD_COLUMNS]
+        for row in db.query(*columns).yield_per(500):
+            for value in row:
+                if is_blob_ref(value):
+                    referenced.add(value[BLOB_REF_KEY])
+
+    removed = freed = 0
+    cutoff = time.time() - BLOB_GRACE_SECONDS
+    for path in store.root.glob("*/*"):
+        digest = path.name.split(".", 1)[0]
+        if digest in referenced:
+            continue
+        stat = path.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        path.unlink()
+        removed += 1
+        freed += stat.st_size
+    return {"blobs_removed": removed, "blob_bytes_freed": freed}
+
+
+def vacuum() -> None:
+    """
+    Return free database pages to the filesystem.
+
+    The first call switches the database to incremental auto-vacuum (which
+    needs one full VACUUM); afterwards only freed pages are released.
+    """
+    engine = get_engine()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:  # 2 = INCREMENTAL
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+        else:
+            conn.execute(text("PRAGMA incremental_vacuum"))
+
+
+def collect_garbage(
+    project_id: str,
+    keep: int,
+    archive: bool = True,
+    archive_dir: Path = ARCHIVE_DIR,
+    dry_run: bool = False,
+    criterion_cache_days: Optional[float] = CRITERION_CACHE_DAYS,
+) -> Dict[str, Any]:
+    """
+    Apply the retention policy to a project.
+
+    Keeps the `keep` most recent runs and all pinned runs. Older runs are
+    archived (unless `archive` is False) and deleted, cached checklist
+    criteria not used for `criterion_cache_days` days (all of them with 0,
+    none with None) are deleted, unreferenced blobs are removed and the
+    database is vacuumed.
+
+    Returns:
+        A report with the affected runs and the space reclaimed.
+    """
+    expired = JobModel.list_expired(project_id, keep)
+    report: Dict[str, Any] = {
+        "runs_expired": [job.id for job in expired],
+        "archives": [],
+        "db_bytes_before": _file_size(DATABASE_PATH),
+        "criterion_results_removed": 0,
+    }
+    unused_since = None
+    if criterion_cache_days:
+        unused_since = datetime.now(timezone.utc) - timedelta(days=criterion_cache_days)
+    if criterion_cache_days is not None:
+        report["criterion_results_removed"] = CriterionResultModel.prune(
+            unused_since, dry_run=dry_run
+        )
+    if dry_run:
+        return report
+
+    for job in expired:
+        if archive:
+            report["archives"].append(str(archive_job(job, archive_dir)))
+        JobModel.delete(job.id)
+
+    report.update(sweep_blobs())
+    vacuum()
+    report["db_bytes_after"] = _file_size(DATABASE_PATH)
+    # The first vacuum switches the database to incremental auto-vacuum,
+    # which can make the file slightly larger
+    report["bytes_reclaimed"] = max(
+        0,
+        report["db_bytes_before"] - report["db_bytes_after"]
+        + report["blob_bytes_freed"],
+    )
+    return report
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
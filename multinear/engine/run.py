@@ -1,24 +1,68 @@
+import contextvars
 import importlib.util
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import yaml
 import random
 import hashlib
 import json
 
 from .storage import JobModel, TaskModel, TaskStatus
-from .evaluate import evaluate
-from ..utils.capture import OutputCapture
-from ..utils.git import get_git_revision
+from .evaluate import TIERS, evaluate
+from .evaluators import configure_criterion_cache
+from .blobs import configure_blob_store
+from .early_stop import EarlyStop
+from .repeats import SampleStats, get_repeats, summarize_challenges
+from .sampling import (
+    estimate_pass_rate,
+    parse_sample_size,
+    sample_tasks,
+    stratum_of,
+    variance_weights,
+)
+from ..utils import metrics, tracing
+from ..utils.capture import OutputCapture, set_passthrough
+from ..utils.git import get_revision_info
+from ..utils.profiling import RunProfiler
+from ..utils.timing import StageTimer, aggregate_timings, track_retries
 
 
-def run_experiment(project_config: Dict[str, Any], job: JobModel):
+# Seconds between progress updates while tasks are running
+UPDATE_INTERVAL = 1.0
+
+
+def get_challenge_id(task: Dict[str, Any]) -> str:
+    """
+    The ID of a task's challenge: its `id`, or a hash of its input.
+    """
+    challenge_id = task.get("id", None)
+    if not challenge_id:  # Calculate challenge ID from input
+        challenge_id = hashlib.sha256(json.dumps(task["input"]).encode()).hexdigest()
+    return challenge_id
+
+
+def run_experiment(
+    project_config: Dict[str, Any],
+    job: JobModel,
+    profile: Optional[str] = None,
+    sample: Optional[Dict[str, Any]] = None,
+):
     """
     Run an experiment using the task_runner.run_task function from the project folder
 
     Args:
         project_config: Project configuration dictionary containing folder path
         job: JobModel instance for the job being run
+        profile: Profile each task's run_task and evaluation ("sample" or "cprofile")
+        sample: Run a stratified sample of the tasks instead of all of them:
+            `size` (e.g. 200 or "5%"), and optionally `seed`, `by_variance`
+            (favor tasks whose outcome varied in past runs) and `confidence`
+            (of the estimated pass rate's interval, default 0.95)
 
     Yields:
         Dict containing status updates, final results, and status map
@@ -31,10 +75,11 @@ def run_experiment(project_config: Dict[str, Any], job: JobModel):
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found at {config_path}")
 
-    # Save git revision to job details
-    git_revision = get_git_revision(project_folder)
-    print(f"Git revision: {git_revision}")
-    job.update(details={"git_revision": get_git_revision(project_folder)})
+    # Save git revision, dirty state and config hash to job details
+    revision_info = get_revision_info(project_folder)
+    git_revision = revision_info["git_revision"]
+    print(f"Git revision: {git_revision}{' (dirty)' if revision_info['git_dirty'] else ''}")
+    job.update(details=revision_info)
 
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
@@ -46,100 +91,536 @@ def run_experiment(project_config: Dict[str, Any], job: JobModel):
         raise FileNotFoundError(f"Task runner file not found at {task_runner_path}")
 
     # Dynamically load the task runner module
-    spec = importlib.util.spec_from_file_location("task_runner", task_runner_path)
-    task_runner_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(task_runner_module)
+    job_timer = StageTimer()
+    with job_timer.stage("load"):
+        spec = importlib.util.spec_from_file_location("task_runner", task_runner_path)
+        task_runner_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(task_runner_module)
 
     # Check if run_task exists in the module
     if not hasattr(task_runner_module, "run_task"):
         raise AttributeError(f"run_task function not found in {task_runner_path}")
 
+    # Limits for the captured task and evaluation logs
+    capture_options = config.get("meta", {}).get("capture", {})
+
+    # Size above which payloads are moved from the database to the blob store
+    configure_blob_store(threshold=config.get("meta", {}).get("blob_threshold"))
+
+    # Reuse of checklist results per criterion
+    configure_criterion_cache(
+        config.get("meta", {}).get("evaluation", {}).get("criterion_cache", True)
+    )
+
+    # Optional tracing to an OTLP JSON file
+    tracing.configure_tracing(config.get("meta", {}).get("tracing", {}).get("file"))
+    job_span = tracing.start_span(
+        "job", job_id=job.id, project_id=job.project_id, git_revision=git_revision or ""
+    )
+    job_error = None
+    if job_span:
+        job.update(details={"trace_id": job_span.trace_id})
+
+    # Optional profiling of every task
+    profiler = RunProfiler(job.id, mode=profile) if profile else None
+    if profiler:
+        job.update(details={"profile_dir": str(profiler.directory)})
+    profiled = profiler.profile if profiler else (lambda task_number: nullcontext())
+
+    # Number of tasks running at once, in worker threads. The profiler follows
+    # a single thread, so profiled runs run one task at a time.
+    concurrency = max(1, int(config.get("meta", {}).get("concurrency", 1)))
+    if profiler and concurrency > 1:
+        print("Profiling runs one task at a time (ignoring meta.concurrency)")
+        concurrency = 1
+
+    # Do we simulate failures?
+    fail_simulate = config.get("meta", {}).get("fail_simulate", None)
+
     # Run the experiment
+    metrics.JOBS_ACTIVE.inc()
+    queued = 0
+    pool = None
     try:
         results = []
-        total_tasks = len(config["tasks"])
+        task_timings = []
+        # Outcomes so far, reported with every update
+        counts = {"passed": 0, "failed": 0, "errors": 0}
+        # Tasks decided by each evaluation tier, LLM judge calls skipped, and
+        # checklist criteria reused from earlier judgements
+        evaluation = {
+            "tiers": dict.fromkeys(TIERS, 0),
+            "judge_calls_avoided": 0,
+            "criteria_cached": 0,
+        }
+        tasks = config["tasks"]
+        # Optional stratified sample, with the probability of picking each task
+        inclusion = populations = None
+        if sample:
+            tasks, inclusion, populations = _sample(tasks, sample, job)
+
+        # Every task runs once per matrix variant; variants of a task are
+        # interleaved, so that all of them progress together
+        variants = get_variants(config)
+        if variants != [None]:
+            _check_accepts_variant(task_runner_module.run_task)
+            print(f"Matrix run: {len(variants)} variants ({', '.join(v['name'] for v in variants)})")
+        # Tasks with `repeats` (or `meta.repeats`) > 1 run several samples,
+        # scheduled next to each other so that they run on different workers
+        # at once and share the prepared input
+        default_repeats = get_repeats(config.get("meta", {}), default=1)
+        repeats = [get_repeats(task, default=default_repeats) for task in tasks]
+        items = []
+        for i, task in enumerate(tasks):
+            challenge_id = get_challenge_id(task)
+            for repeat in range(repeats[i]):
+                for variant in variants:
+                    items.append({
+                        "number": len(items) + 1,
+                        "index": i,
+                        "task": task,
+                        "challenge_id": challenge_id,
+                        "variant": variant,
+                        "repeat": repeat if repeats[i] > 1 else None,
+                        "inclusion": inclusion[i] if inclusion else None,
+                    })
+        # The k of pass@k: `meta.pass_at_k`, by default the fewest samples of a
+        # repeated task, so that every repeated task has a pass@k
+        pass_k = int(config.get("meta", {}).get(
+            "pass_at_k", min((r for r in repeats if r > 1), default=1)
+        ))
+        # Samples of each challenge (and variant) of repeated tasks
+        challenge_samples: Dict[tuple, SampleStats] = {}
+        # Per-variant outcomes, and outcomes of sampled tasks (per variant)
+        # for the estimates
+        scoreboard = {
+            variant["name"]: {"passed": 0, "failed": 0, "errors": 0, "score": 0.0}
+            for variant in variants if variant
+        }
+        sample_outcomes: Dict[tuple, list] = {}
+
+        # Inputs prepared once by the task runner's prepare_input, if any
+        prepare_input = getattr(task_runner_module, "prepare_input", None)
+        prepared_inputs = (
+            _PreparedInputs(prepare_input, [item["task"]["input"] for item in items])
+            if prepare_input else None
+        )
+
+        total_tasks = len(items)
+        # Optional policy ending the run once its outcome is decided, checked
+        # for each variant on its outcomes per task: a repeated task counts
+        # once all its samples finished. The run stops when every variant is decided.
+        early_stop_config = config.get("meta", {}).get("early_stop")
+        early_stops = {
+            variant["name"] if variant else None: EarlyStop.from_config(
+                early_stop_config, len(tasks)
+            )
+            for variant in variants
+        } if early_stop_config else {}
+        # Passed and failed tasks per variant, samples finished and passed per
+        # task (and variant), and why each decided variant would stop
+        early_stop_outcomes = {variant: [0.0, 0.0] for variant in early_stops}
+        early_stop_samples: Dict[tuple, list] = {}
+        decided: Dict[Optional[str], str] = {}
+        stop_reason = None
+        queued = total_tasks
+        metrics.TASK_QUEUE_DEPTH.inc(queued)
 
         yield {"status": TaskStatus.STARTING, "total": total_tasks}
 
-        for i, task in enumerate(config["tasks"]):
-            current_task = i + 1
+        def execute(item):
+            """
+            Run and evaluate a task in a worker thread, and return its outcome.
+            """
+            task, variant, task_number = item["task"], item["variant"], item["number"]
+            # Per-stage durations of this task; "capture" and "retry" are the
+            # parts of "execute" and "evaluate" spent capturing output and
+            # waiting to retry OpenAI requests
+            timer = StageTimer()
+            timer.add("queue", time.perf_counter() - item["submitted_at"])
+            task_span = tracing.start_span("task", job_id=job.id, task_number=task_number)
+            task_id = None
+            outcome = {"item": item}
 
-            try:
-                input = task["input"]
-                challenge_id = task.get("id", None)
-                if not challenge_id:  # Calculate challenge ID from input
-                    challenge_id = hashlib.sha256(
-                        json.dumps(input).encode()
-                    ).hexdigest()
-
-                # Start new task
-                task_id = TaskModel.start(
-                    job_id=job.id,
-                    task_number=current_task,
-                    challenge_id=challenge_id
-                )
+            with track_retries(timer):
+                try:
+                    input = task["input"]
+                    if task_span:
+                        task_span.set_attribute("challenge_id", item["challenge_id"])
+                        if variant:
+                            task_span.set_attribute("variant", variant["name"])
+                        if item["repeat"] is not None:
+                            task_span.set_attribute("repeat_index", item["repeat"])
 
-                yield {
-                    "status": TaskStatus.RUNNING,
-                    "current": current_task,
-                    "total": total_tasks,
-                    "details": f"Running task {current_task}/{total_tasks}"
-                }
-
-                # Do we simulate a failure?
-                fail_simulate = config.get("meta", {}).get("fail_simulate", None)
-                if fail_simulate is not None and random.random() < fail_simulate:
-                    raise Exception("Simulated failure")
-
-                # Run the task
-                with OutputCapture() as capture:
-                    task_result = task_runner_module.run_task(input)
-                TaskModel.executed(
-                    task_id,
-                    input,
-                    task_result["output"],
-                    task_result["details"],
-                    capture.logs,
-                )
+                    # Start new task
+                    with timer.stage("storage"):
+                        task_id = TaskModel.start(
+                            job_id=job.id,
+                            task_number=task_number,
+                            challenge_id=item["challenge_id"],
+                            variant=variant["name"] if variant else None,
+                            repeat_index=item["repeat"],
+                        )
 
-                yield {
-                    "status": TaskStatus.EVALUATING,
-                    "current": current_task,
-                    "total": total_tasks,
-                    "details": f"Evaluating task {current_task}/{total_tasks}"
-                }
-
-                # Evaluate the task
-                with OutputCapture() as capture:
-                    eval_result = evaluate(task, input, task_result["output"])
-                TaskModel.evaluated(
-                    task_id,
-                    {k: v for k, v in task.items() if k != "input"},
-                    eval_result["passed"],
-                    eval_result["score"],
-                    eval_result["details"],
-                    capture.logs,
-                )
+                    if fail_simulate is not None and random.random() < fail_simulate:
+                        raise Exception("Simulated failure")
 
-                results.append([task_result, eval_result])
+                    # Run the task, on the prepared input if the runner prepares inputs
+                    with OutputCapture(**capture_options) as capture:
+                        with timer.stage("prepare"):
+                            task_input = prepared_inputs.get(input) if prepared_inputs else input
+                        with timer.stage("execute"), tracing.span("run_task"):
+                            with profiled(task_number):
+                                if variant is None:
+                                    task_result = task_runner_module.run_task(task_input)
+                                else:
+                                    task_result = task_runner_module.run_task(task_input, variant)
+                    timer.add("capture", capture.overhead)
+                    with timer.stage("storage"):
+                        TaskModel.executed(
+                            task_id,
+                            input,
+                            task_result["output"],
+                            task_result["details"],
+                            capture.logs,
+                        )
 
-            except Exception as e:
-                error_msg = str(e)
-                print(f"Error running task {current_task}/{total_tasks}: {error_msg}")
-                results.append({"error": error_msg})
-                TaskModel.fail(task_id, error=error_msg)
+                    # Evaluate the task
+                    with OutputCapture(**capture_options) as capture:
+                        with timer.stage("evaluate"), tracing.span("evaluate"):
+                            with profiled(task_number):
+                                eval_result = evaluate(task, input, task_result["output"])
+                    timer.add("capture", capture.overhead)
+                    # Timings are saved with this last write, so they don't include it
+                    outcome["timings"] = timer.as_dict()
+                    TaskModel.evaluated(
+                        task_id,
+                        {k: v for k, v in task.items() if k != "input"},
+                        eval_result["passed"],
+                        eval_result["score"],
+                        eval_result["details"],
+                        capture.logs,
+                        timings=outcome["timings"],
+                    )
+                    metrics.record_task(TaskStatus.COMPLETED, outcome["timings"])
+                    outcome["result"] = [task_result, eval_result]
 
-        yield {
-            "status": TaskStatus.COMPLETED,
-            "current": total_tasks,
+                except Exception as e:
+                    outcome["error"] = e
+                    outcome["timings"] = timer.as_dict()
+                    if task_id:
+                        TaskModel.fail(task_id, error=str(e), timings=outcome["timings"])
+                    metrics.record_task(TaskStatus.FAILED, outcome["timings"])
+
+                finally:
+                    tracing.end_span(task_span, error=outcome.get("error"))
+            return outcome
+
+        # Tasks run in a pool of worker threads, submitted in order with at
+        # most `concurrency` of them started and not finished. Output of this
+        # thread stays out of the tasks' captured logs.
+        set_passthrough(True)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="multinear-task")
+        running = {}
+        submitted = 0
+        while True:
+            while not stop_reason and submitted < total_tasks and len(running) < concurrency:
+                item = items[submitted]
+                submitted += 1
+                queued -= 1
+                metrics.TASK_QUEUE_DEPTH.dec()
+                metrics.TASKS_IN_PROGRESS.inc()
+                item["submitted_at"] = time.perf_counter()
+                # Run in a copy of this context, so task spans are children of the job's
+                future = pool.submit(contextvars.copy_context().run, execute, item)
+                running[future] = item
+            if not running:
+                break
+
+            done, _ = wait(running, timeout=UPDATE_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                metrics.TASKS_IN_PROGRESS.dec()
+                outcome = future.result()
+                task_timings.append(outcome["timings"])
+                variant = item["variant"]["name"] if item["variant"] else None
+
+                if "error" in outcome:
+                    error_msg = str(outcome["error"])
+                    print(f"Error running task {item['number']}/{total_tasks}: {error_msg}")
+                    results.append({"error": error_msg})
+                    counts["errors"] += 1
+                    passed, score, outcome_key = False, 0.0, "errors"
+                else:
+                    eval_result = outcome["result"][1]
+                    passed, score = eval_result["passed"], eval_result["score"] or 0.0
+                    outcome_key = "passed" if passed else "failed"
+                    counts[outcome_key] += 1
+                    evaluation["tiers"][eval_result["details"]["tier"]] += 1
+                    evaluation["judge_calls_avoided"] += len(
+                        eval_result["details"].get("skipped", [])
+                    )
+                    evaluation["criteria_cached"] += eval_result["details"].get("cached", 0)
+                    results.append(outcome["result"])
+
+                if variant is not None:
+                    scoreboard[variant][outcome_key] += 1
+                    scoreboard[variant]["score"] += score
+                if item["repeat"] is not None:
+                    challenge_samples.setdefault(
+                        (item["challenge_id"], variant), SampleStats()
+                    ).add(passed, score)
+                if inclusion:
+                    sample_outcomes.setdefault((variant, item["index"]), []).append(passed)
+
+                if early_stops and variant not in decided:
+                    samples = early_stop_samples.setdefault((variant, item["index"]), [0, 0])
+                    samples[0] += 1
+                    samples[1] += passed
+                    if samples[0] == repeats[item["index"]]:
+                        share = samples[1] / samples[0]
+                        outcomes = early_stop_outcomes[variant]
+                        outcomes[0] += share
+                        outcomes[1] += 1 - share
+                        reason = early_stops[variant].check(*outcomes)
+                        if reason:
+                            decided[variant] = reason
+                            if variant is not None:
+                                print(f"Variant {variant} decided: {reason}")
+                    if len(decided) == len(early_stops):
+                        stop_reason = "; ".join(
+                            f"{name}: {reason}" if name else reason
+                            for name, reason in decided.items()
+                        )
+                        # Running tasks finish, the remaining ones are never started
+                        print(
+                            f"Stopping early after task {item['number']}/{total_tasks}: "
+                            f"{stop_reason}"
+                        )
+
+            finished = sum(counts.values())
+            yield {
+                "status": TaskStatus.RUNNING,
+                "current": finished,
+                "total": total_tasks,
+                "counts": dict(counts),
+                "details": f"{finished}/{total_tasks} tasks finished, {len(running)} running"
+            }
+
+        status = TaskStatus.STOPPED if stop_reason else TaskStatus.COMPLETED
+        metrics.JOBS.labels(status).inc()
+        finished = sum(counts.values())
+
+        final = {
+            "status": status,
+            "current": finished,
             "total": total_tasks,
-            "results": results
+            "counts": counts,
+            "results": results,
+            "evaluation": evaluation,
+            "timings": {
+                **job_timer.as_dict(),
+                "stages": aggregate_timings(task_timings),
+            },
         }
+        if stop_reason:
+            final["early_stop"] = {
+                "reason": stop_reason,
+                "finished": finished,
+                "skipped": total_tasks - finished,
+            }
+        if scoreboard:
+            final["variants"] = _scoreboard(scoreboard)
+        if challenge_samples:
+            # Mean, variance and pass@k per challenge, averaged over challenges
+            stats = {key: samples.as_dict(pass_k) for key, samples in challenge_samples.items()}
+            final["repeats"] = summarize_challenges(stats.values(), pass_k)
+            for variant in scoreboard:
+                final["variants"][variant]["repeats"] = summarize_challenges(
+                    (s for (_, v), s in stats.items() if v == variant), pass_k
+                )
+        if inclusion:
+            # Pass rate of all tasks (per variant for a matrix run), estimated
+            # from the sample; repeated tasks count with their share of passes
+            confidence = sample.get("confidence", 0.95)
+            outcomes_by_variant: Dict[Optional[str], list] = {}
+            for (variant, index), passes in sample_outcomes.items():
+                outcomes_by_variant.setdefault(variant, []).append(
+                    (stratum_of(tasks[index]), sum(passes) / len(passes), inclusion[index])
+                )
+            estimates = {
+                variant: estimate_pass_rate(outcomes, populations, confidence=confidence)
+                for variant, outcomes in outcomes_by_variant.items()
+            }
+            if scoreboard:
+                for variant, estimate in estimates.items():
+                    final["variants"][variant]["estimate"] = estimate
+            else:
+                final["estimate"] = estimates.get(None)
+        yield final
 
     except Exception as e:
+        job_error = e
         print(f"Error running experiment: {e}")
+        metrics.JOBS.labels(TaskStatus.FAILED).inc()
         yield {
             "status": TaskStatus.FAILED,
             "total": 0,
             "error": str(e)
         }
+
+    finally:
+        # Also reached when the caller stops iterating early: running tasks
+        # are waited for, queued ones are never started
+        if pool:
+            pool.shutdown(wait=True)
+            set_passthrough(False)
+        metrics.TASK_QUEUE_DEPTH.dec(queued)
+        metrics.JOBS_ACTIVE.dec()
+        tracing.end_span(job_span, error=job_error)
+        if profiler:
+            profiler.finish()
+
+
+def get_variants(config: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+    """
+    The variants of a matrix run, from the `matrix` list of the config: dicts
+    of parameters passed to run_task, each with a unique `name`.
+
+    Returns:
+        The variants, or [None] if the config has no matrix.
+
+    Raises:
+        ValueError: If the matrix is not a list of mappings with unique names.
+    """
+    matrix = config.get("matrix")
+    if not matrix:
+        return [None]
+    if not isinstance(matrix, list):
+        raise ValueError("matrix must be a list of variants")
+
+    variants = []
+    for i, variant in enumerate(matrix):
+        if not isinstance(variant, dict):
+            raise ValueError(f"Matrix variant {i + 1} must be a mapping of parameters")
+        variant = dict(variant)
+        variant["name"] = str(variant.get("name") or f"variant-{i + 1}")
+        if any(v["name"] == variant["name"] for v in variants):
+            raise ValueError(f"Duplicate matrix variant name: {variant['name']}")
+        variants.append(variant)
+    return variants
+
+
+def _check_accepts_variant(run_task):
+    """
+    Fail before running anything if run_task can't take a variant argument.
+    """
+    try:
+        signature = inspect.signature(run_task)
+    except (TypeError, ValueError):  # No signature available: assume it does
+        return
+    try:
+        signature.bind(None, None)
+    except TypeError:
+        raise TypeError(
+            "run_task must accept a variant argument for matrix runs: "
+            "def run_task(input, variant)"
+        )
+
+
+def _scoreboard(scoreboard: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-variant results: task counts, pass rate and mean score (over the
+    variant's finished tasks, errors counting as failed with a score of 0).
+    """
+    board = {}
+    for name, entry in scoreboard.items():
+        finished = entry["passed"] + entry["failed"] + entry["errors"]
+        board[name] = {
+            "tasks": finished,
+            "passed": entry["passed"],
+            "failed": entry["failed"],
+            "errors": entry["errors"],
+            "pass_rate": entry["passed"] / finished if finished else None,
+            "mean_score": entry["score"] / finished if finished else None,
+        }
+    return board
+
+
+class _PreparedInputs:
+    """
+    Inputs prepared by the task runner's optional `prepare_input(input)`,
+    whose result is passed to run_task instead of the input. Each distinct
+    input is prepared once, by the first task needing it (others wait for
+    it), and dropped after its last task used it.
+    """
+    def __init__(self, prepare, inputs: List[Any]):
+        self.prepare = prepare
+        self.lock = threading.Lock()
+        self.futures: Dict[str, Future] = {}
+        # Number of tasks yet to use each input
+        self.uses: Dict[str, int] = {}
+        for input in inputs:
+            key = self._key(input)
+            self.uses[key] = self.uses.get(key, 0) + 1
+
+    @staticmethod
+    def _key(input: Any) -> str:
+        payload = json.dumps(input, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, input: Any) -> Any:
+        key = self._key(input)
+        with self.lock:
+            future = self.futures.get(key)
+            owner = future is None
+            if owner:
+                future = self.futures[key] = Future()
+        if owner:
+            try:
+                future.set_result(self.prepare(input))
+            except Exception as e:
+                future.set_exception(e)
+        try:
+            return future.result()
+        finally:
+            with self.lock:
+                self.uses[key] -= 1
+                if self.uses[key] <= 0:
+                    self.futures.pop(key, None)
+
+
+def _sample(tasks, sample: Dict[str, Any], job: JobModel):
+    """
+    Pick the tasks of a sampled run, and record the sample in the job details.
+
+    Returns:
+        The picked tasks, the probability of picking each of them, and the
+        number of tasks of each stratum.
+    """
+    size = parse_sample_size(sample["size"])
+    seed = sample.get("seed", 0)
+    challenge_ids = [get_challenge_id(task) for task in tasks]
+    weights = None
+    if sample.get("by_variance"):
+        history = TaskModel.challenge_history(job.project_id, challenge_ids)
+        weights = variance_weights(history, challenge_ids)
+
+    plan = sample_tasks(tasks, size, seed=seed, weights=weights)
+    job.update(details={"sample": {
+        "size": len(plan["indices"]),
+        "population": len(tasks),
+        "seed": seed,
+        "by_variance": bool(weights),
+        "strata": plan["strata"],
+        "challenge_ids": [challenge_ids[i] for i in plan["indices"]],
+    }})
+    print(
+        f"Sampled {len(plan['indices'])} of {len(tasks)} tasks "
+        f"({len(plan['strata'])} strata, seed {seed})"
+    )
+    return (
+        [tasks[i] for i in plan["indices"]],
+        [plan["inclusion"][i] for i in plan["indices"]],
+        {name: stratum["population"] for name, stratum in plan["strata"].items()},
+    )
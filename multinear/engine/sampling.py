@@ -0,0 +1,284 @@
+import random
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..utils.stats import wilson_interval
+
+
+# Stratum of tasks without a group or tags
+DEFAULT_STRATUM = "(none)"
+
+# Selection weight of tasks with no history, and the minimum weight, so that
+# tasks that always passed or failed so far can still be picked
+UNKNOWN_WEIGHT = 0.25
+MIN_WEIGHT = 0.01
+
+
+def parse_sample_size(value: str) -> Union[int, float]:
+    """
+    Parse a sample size: a number of tasks ("200") or a percentage ("5%").
+
+    Returns:
+        An int for a number of tasks, a float (0-1] for a share of the tasks.
+
+    Raises:
+        ValueError: If the value is neither.
+    """
+    value = str(value).strip()
+    try:
+        if value.endswith("%"):
+            share = float(value[:-1]) / 100
+            if 0 < share <= 1:
+                return share
+        elif int(value) > 0:
+            return int(value)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid sample size: {value} (expected e.g. 200 or 5%)")
+
+
+def stratum_of(task: Dict[str, Any]) -> str:
+    """
+    Stratum of a task: its `group`, else its `tags` (sorted, comma-separated).
+    """
+    if task.get("group"):
+        return str(task["group"])
+    tags = task.get("tags")
+    if isinstance(tags, str):
+        tags = [tags]
+    return ",".join(sorted(map(str, tags))) if tags else DEFAULT_STRATUM
+
+
+def variance_weights(history: Dict[str, Tuple[int, int]], challenge_ids: List[str]):
+    """
+    Selection weights from past outcomes: the variance p(1-p) of each
+    challenge's pass rate (smoothed), so that flaky or borderline tasks are
+    picked more often than tasks that always pass or always fail.
+
+    Args:
+        history: Challenge ID -> (evaluated runs, passes).
+        challenge_ids: Challenge ID of each task.
+    """
+    weights = []
+    for challenge_id in challenge_ids:
+        runs, passes = history.get(challenge_id, (0, 0))
+        if not runs:
+            weights.append(UNKNOWN_WEIGHT)
+            continue
+        p = (passes + 1) / (runs + 2)
+        weights.append(max(MIN_WEIGHT, p * (1 - p)))
+    return weights
+
+
+def _allocate(populations: Dict[str, int], size: int) -> Dict[str, int]:
+    """
+    Split a sample size across strata proportionally to their size (largest
+    remainders get the leftovers), with at least one task per stratum when
+    the sample is large enough.
+    """
+    total = sum(populations.values())
+    exact = {name: size * count / total for name, count in populations.items()}
+    allocation = {name: int(share) for name, share in exact.items()}
+    if size >= len(populations):
+        for name in allocation:
+            allocation[name] = max(allocation[name], 1)
+    remaining = size - sum(allocation.values())
+    by_remainder = sorted(exact, key=lambda name: exact[name] - int(exact[name]), reverse=True)
+    for name in by_remainder:
+        if remaining <= 0:
+            break
+        if allocation[name] < populations[name]:
+            allocation[name] += 1
+            remaining -= 1
+    # Taking one task from every stratum may overshoot: trim the largest
+    for name in sorted(allocation, key=allocation.get, reverse=True):
+        while remaining < 0 and allocation[name] > 1:
+            allocation[name] -= 1
+            remaining += 1
+    return allocation
+
+
+def _inclusion_probabilities(weights: List[float], size: int) -> List[float]:
+    """
+    Inclusion probabilities proportional to the weights, capped at 1, that sum
+    to the sample size.
+    """
+    probabilities = [0.0] * len(weights)
+    capped = set()
+    while True:
+        free = [i for i in range(len(weights)) if i not in capped]
+        if not free:
+            return [1.0] * len(weights)
+        scale = (size - len(capped)) / sum(weights[i] for i in free)
+        newly_capped = {i for i in free if weights[i] * scale >= 1}
+        if not newly_capped:
+            for i in free:
+                probabilities[i] = weights[i] * scale
+            for i in capped:
+                probabilities[i] = 1.0
+            return probabilities
+        capped |= newly_capped
+
+
+def _systematic_sample(
+    probabilities: Dict[int, float], count: int, rng: random.Random
+) -> Dict[int, float]:
+    """
+    Systematic sampling proportional to size: the items, in random order, are
+    laid end to end with lengths equal to their inclusion probabilities
+    (summing to `count`), and the items under the points u, u+1, ... u+count-1
+    (u uniform in [0, 1)) are picked. Each item is picked with exactly its
+    inclusion probability, as the Horvitz-Thompson estimate requires.
+
+    Returns:
+        The inclusion probability of each picked item.
+    """
+    order = list(probabilities)
+    rng.shuffle(order)
+    point = rng.random()
+    picked = {}
+    end = 0.0
+    for i in order:
+        end += probabilities[i]
+        if point < end and len(picked) < count:
+            picked[i] = probabilities[i]
+            point += 1
+    # Rounding can leave the last point just past the end
+    for i in order:
+        if len(picked) >= count:
+            break
+        picked.setdefault(i, probabilities[i])
+    return picked
+
+
+def sample_tasks(
+    tasks: List[Dict[str, Any]],
+    size: Union[int, float],
+    seed: int = 0,
+    weights: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """
+    Pick a stratified random sample of tasks.
+
+    Args:
+        tasks: The tasks of the config.
+        size: Number of tasks, or share of the tasks (see `parse_sample_size`).
+        seed: Random seed; the same seed, tasks and size give the same sample.
+        weights: Optional selection weight of each task (see
+            `variance_weights`); by default tasks are picked uniformly.
+
+    Returns:
+        A dict with the picked task `indices` (in config order), the
+        `population` and `sampled` count of each stratum, and the
+        `inclusion` probability of each picked task.
+    """
+    if isinstance(size, float):
+        size = max(1, round(size * len(tasks)))
+    size = min(size, len(tasks))
+
+    strata: Dict[str, List[int]] = {}
+    for i, task in enumerate(tasks):
+        strata.setdefault(stratum_of(task), []).append(i)
+    allocation = _allocate({name: len(members) for name, members in strata.items()}, size)
+
+    rng = random.Random(seed)
+    indices, inclusion = [], {}
+    for name in sorted(strata):
+        members, count = strata[name], allocation[name]
+        if weights is None:
+            picked = rng.sample(members, count)
+            probabilities = {i: count / len(members) for i in picked}
+        else:
+            member_probabilities = _inclusion_probabilities(
+                [weights[i] for i in members], count
+            )
+            probabilities = _systematic_sample(
+                dict(zip(members, member_probabilities)), count, rng
+            )
+            picked = list(probabilities)
+        indices.extend(picked)
+        inclusion.update(probabilities)
+
+    return {
+        "indices": sorted(indices),
+        "strata": {
+            name: {"population": len(strata[name]), "sampled": allocation[name]}
+            for name in sorted(strata)
+        },
+        "inclusion": inclusion,
+    }
+
+
+def estimate_pass_rate(
+    outcomes: List[Tuple[str, float, float]],
+    populations: Dict[str, int],
+    confidence: float = 0.95,
+) -> Optional[Dict[str, float]]:
+    """
+    Estimate the pass rate of all tasks from the outcomes of a sample.
+
+    Each stratum's pass rate is weighted by inverse inclusion probabilities
+    (the plain mean for uniform sampling), and strata are combined by their
+    share of the tasks. The interval is a Wilson interval on the effective
+    sample size of the stratified estimate, with a finite population
+    correction.
+
+    Args:
+        outcomes: (stratum, passed, inclusion probability) of each finished
+            task; `passed` is a bool, or the share of passed samples of a
+            repeated task.
+        populations: Number of tasks of each stratum.
+        confidence: Confidence level of the interval.
+
+    Returns:
+        A dict with `pass_rate`, `low`, `high`, `confidence`, the number of
+        `tasks`, the share of all tasks in strata with finished tasks
+        (`coverage`) and the `missing_strata`, or None if no task finished.
+        With missing strata, `pass_rate` is that of the covered strata, and
+        the interval is widened to any pass rate of the missing ones.
+    """
+    by_stratum: Dict[str, List[Tuple[float, float]]] = {}
+    for stratum, passed, probability in outcomes:
+        by_stratum.setdefault(stratum, []).append((passed, probability))
+    if not by_stratum:
+        return None
+
+    # Strata without finished tasks (allocated no task, or not reached before
+    # an early stop) are left out of the estimate; see the interval below
+    total = sum(populations[name] for name in by_stratum)
+    estimate = variance = 0.0
+    for name, results in by_stratum.items():
+        share = populations[name] / total
+        inverse = [1 / probability for _, probability in results]
+        weight_sum = sum(inverse)
+        rate = sum(w * float(passed) for (passed, _), w in zip(results, inverse)) / weight_sum
+        stratum_variance = sum(
+            (w * (float(passed) - rate)) ** 2
+            for (passed, _), w in zip(results, inverse)
+        ) / weight_sum ** 2
+        stratum_variance *= 1 - len(results) / populations[name]
+        estimate += share * rate
+        variance += share * share * stratum_variance
+
+    n = len(outcomes)
+    if all(len(by_stratum[name]) >= populations[name] for name in by_stratum):
+        low = high = estimate  # Every task was run: the pass rate is known
+    else:
+        effective_n = estimate * (1 - estimate) / variance if variance > 0 else n
+        low, high = wilson_interval(estimate * effective_n, effective_n, confidence)
+
+    # The pass rate of the missing strata is unknown: widen the interval to
+    # all of them failing or passing, over their share of the tasks
+    missing = [name for name in populations if name not in by_stratum]
+    coverage = total / sum(populations.values())
+    if missing:
+        low = coverage * low
+        high = coverage * high + (1 - coverage)
+    return {
+        "pass_rate": estimate,
+        "low": low,
+        "high": high,
+        "confidence": confidence,
+        "tasks": n,
+        "coverage": coverage,
+        "missing_strata": missing,
+    }
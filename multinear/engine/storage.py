@@ -1,5 +1,7 @@
 from sqlalchemy import (
     create_engine,
+    inspect,
+    text,
     Column,
     String,
     Integer,
@@ -7,16 +9,30 @@ from sqlalchemy import (
     ForeignKey,
     Float,
     Boolean,
+    Index,
+    and_,
+    or_,
+    case,
+    func,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from sqlalchemy.types import JSON
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple
+import base64
+import json
+import time
 import uuid
 from pathlib import Path
 import yaml
 
+from .blobs import EncodedJSON, get_blob_store
+from ..utils.tracing import traced
+from ..utils.capture import compress_logs
+from ..utils import fastjson
+
 
 Base = declarative_base()
 
@@ -30,6 +46,7 @@ class TaskStatus:
     EVALUATING = "evaluating"
     COMPLETED = "completed"
     FAILED = "failed"
+    STOPPED = "stopped"  # Jobs ended early by their early stop policy
 
 
 # Define SQLAlchemy models to represent database tables
@@ -58,6 +75,21 @@ class ProjectModel(Base):
         with db_context() as db:
             return db.query(cls).filter(cls.id == project_id).first()
 
+    @classmethod
+    def find_cached(cls, project_id: str) -> Optional["ProjectModel"]:
+        """
+        Find a project by ID, reusing projects found in the last few seconds
+        (projects missing from the database are not cached), for request
+        handlers that look up the project of every request.
+        """
+        cached = _projects.get(project_id)
+        if cached and time.monotonic() - cached[1] < PROJECT_TTL:
+            return cached[0]
+        project = cls.find(project_id)
+        if project:
+            _projects[project_id] = (project, time.monotonic())
+        return project
+
     @classmethod
     def save(cls, id: str, name: str, description: str, folder: str) -> "ProjectModel":
         """
@@ -79,6 +111,7 @@ class ProjectModel(Base):
                 project = cls(id=id, name=name, description=description, folder=folder)
                 db.add(project)
             db.commit()
+            _projects.pop(id, None)
             return project
 
     def to_dict(self):
@@ -88,6 +121,11 @@ class ProjectModel(Base):
         return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
 
 
+# Projects found by `find_cached`: project_id -> (project, monotonic time)
+_projects: Dict[str, Tuple[ProjectModel, float]] = {}
+PROJECT_TTL = 60.0
+
+
 class JobModel(Base):
     __tablename__ = "jobs"
 
@@ -99,9 +137,17 @@ class JobModel(Base):
     details = Column(JSON, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     finished_at = Column(DateTime, nullable=True)
+    pinned = Column(Boolean, default=False)  # Pinned runs are kept by `gc`
+    # Reversed ID, so that lookups by ID suffix (short IDs) can use an index
+    id_reversed = Column(String, nullable=True)
     project = relationship("ProjectModel", back_populates="jobs")
     tasks = relationship("TaskModel", back_populates="job")
 
+    __table_args__ = (
+        Index("ix_jobs_project_created", "project_id", "created_at", "id"),
+        Index("ix_jobs_project_id_reversed", "project_id", "id_reversed"),
+    )
+
     @classmethod
     def start(cls, project_id: str) -> str:
         """
@@ -109,10 +155,16 @@ class JobModel(Base):
         """
         job_id = str(uuid.uuid4())
         with db_context() as db:
-            job = cls(id=job_id, project_id=project_id, status=TaskStatus.STARTING)
+            job = cls(
+                id=job_id,
+                project_id=project_id,
+                status=TaskStatus.STARTING,
+                id_reversed=job_id[::-1],
+            )
             db.add(job)
             db.commit()
-            return job_id
+        _invalidate_job_count(project_id)
+        return job_id
 
     @classmethod
     def find(cls, job_id: str) -> Optional["JobModel"]:
@@ -169,21 +221,60 @@ class JobModel(Base):
             self.status = status
             self.finished_at = finished_at
 
+    @classmethod
+    def find_by_partial_id(
+        cls, project_id: str, partial_id: str
+    ) -> Optional["JobModel"]:
+        """
+        Find the most recent job of a project whose ID ends with `partial_id`.
+        Uses the index on the reversed ID, so all history is searched.
+        """
+        prefix = partial_id[::-1]
+        with db_context() as db:
+            return (db.query(cls)
+                    .filter(
+                        cls.project_id == project_id,
+                        cls.id_reversed >= prefix,
+                        cls.id_reversed < prefix + "\uffff",
+                    )
+                    .order_by(cls.created_at.desc())
+                    .first())
+
     @classmethod
     def list_recent(
-        cls, project_id: str, limit: int = 5, offset: int = 0
+        cls,
+        project_id: str,
+        limit: int = 5,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List["JobModel"]:
         """
         List recent jobs for a project with pagination.
+
+        Pass the `cursor` of the last job of a page (see `encode_cursor`) to get
+        the next page; unlike `offset`, this stays fast for deep pages.
         """
         with db_context() as db:
-            return (db.query(cls)
-                    .filter(cls.project_id == project_id)
-                    .order_by(cls.created_at.desc())
+            query = db.query(cls).filter(cls.project_id == project_id)
+            if cursor:
+                query = query.filter(_after_cursor(cls, cursor))
+            return (query
+                    .order_by(cls.created_at.desc(), cls.id.desc())
                     .offset(offset)
                     .limit(limit)
                     .all())
 
+    @classmethod
+    def find_state(cls, job_id: str) -> Optional[Tuple[str, str, Optional[datetime]]]:
+        """
+        The project ID, status and finish time of a job, without loading its
+        details.
+        """
+        with db_context() as db:
+            return (db.query(cls.project_id, cls.status, cls.finished_at)
+                    .filter(cls.id == job_id)
+                    .first())
+
     @classmethod
     def get_status(cls, project_id: str, job_id: str) -> Optional["JobModel"]:
         """
@@ -196,16 +287,28 @@ class JobModel(Base):
 
     def get_model_summary(self) -> str:
         """
-        Get a summary of models used in this job's tasks.
+        Get a summary of models used in this job's tasks: the variants of a
+        matrix run, otherwise the models reported in the task details.
         """
         with db_context() as db:
-            tasks = db.query(TaskModel).filter(TaskModel.job_id == self.id).all()
+            variants = sorted(
+                variant for (variant,) in
+                db.query(TaskModel.variant)
+                .filter(TaskModel.job_id == self.id, TaskModel.variant.isnot(None))
+                .distinct()
+            )
+            if variants:
+                return ", ".join(variants)
+
+            rows = (db.query(TaskModel.task_details)
+                    .filter(TaskModel.job_id == self.id)
+                    .all())
 
             # Collect unique models from task details
             models = set()
-            for task in tasks:
-                if task.task_details and 'model' in task.task_details:
-                    models.add(task.task_details['model'])
+            for (task_details,) in rows:
+                if task_details and 'model' in task_details:
+                    models.add(task_details['model'])
 
             # Return appropriate summary based on number of unique models
             if len(models) == 0:
@@ -217,13 +320,90 @@ class JobModel(Base):
             else:
                 return "multiple"
 
+    def set_pinned(self, pinned: bool = True):
+        """
+        Pin (or unpin) the job, protecting it from retention cleanup.
+        """
+        with db_context() as db:
+            job = db.query(JobModel).filter(JobModel.id == self.id).one()
+            job.pinned = pinned
+            db.commit()
+            self.pinned = pinned
+
+    @classmethod
+    def list_expired(cls, project_id: str, keep: int) -> List["JobModel"]:
+        """
+        List the jobs of a project outside the `keep` most recent ones,
+        excluding pinned jobs.
+        """
+        with db_context() as db:
+            jobs = (db.query(cls)
+                    .filter(cls.project_id == project_id)
+                    .order_by(cls.created_at.desc())
+                    .offset(keep)
+                    .all())
+            return [job for job in jobs if not job.pinned]
+
+    @classmethod
+    def delete(cls, job_id: str):
+        """
+        Delete a job and all its tasks.
+        """
+        with db_context() as db:
+            project_id = db.query(cls.project_id).filter(cls.id == job_id).scalar()
+            db.query(TaskModel).filter(TaskModel.job_id == job_id).delete()
+            db.query(cls).filter(cls.id == job_id).delete()
+            db.commit()
+        if project_id:
+            _invalidate_job_count(project_id)
+
     @classmethod
     def count_jobs(cls, project_id: str) -> int:
         """
         Get the total count of jobs for a project.
+
+        The count is cached for a few seconds (and reset when this process
+        starts or deletes jobs), so paging doesn't run COUNT(*) every time.
         """
+        cached = _job_counts.get(project_id)
+        if cached and time.monotonic() - cached[1] < JOB_COUNT_TTL:
+            return cached[0]
         with db_context() as db:
-            return db.query(cls).filter(cls.project_id == project_id).count()
+            count = db.query(cls).filter(cls.project_id == project_id).count()
+        _job_counts[project_id] = (count, time.monotonic())
+        return count
+
+
+# Cached job counts per project: project_id -> (count, monotonic time)
+_job_counts: Dict[str, Tuple[int, float]] = {}
+JOB_COUNT_TTL = 10.0
+
+
+def _invalidate_job_count(project_id: str):
+    _job_counts.pop(project_id, None)
+
+
+def encode_cursor(row) -> str:
+    """
+    Encode the position of a job or task row as an opaque pagination cursor.
+    """
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _after_cursor(cls, cursor: str):
+    """
+    Build a filter selecting rows after `cursor` in (created_at, id) desc order.
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor).decode().split("|", 1)
+        created_at = datetime.fromisoformat(created_at)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return or_(
+        cls.created_at < created_at,
+        and_(cls.created_at == created_at, cls.id < row_id),
+    )
 
 
 class TaskModel(Base):
@@ -233,6 +413,8 @@ class TaskModel(Base):
     job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
     challenge_id = Column(String, nullable=False)
     task_number = Column(Integer, nullable=False)
+    variant = Column(String, nullable=True)  # Matrix variant the task ran with
+    repeat_index = Column(Integer, nullable=True)  # Sample of a repeated task (from 0)
     status = Column(String, nullable=False)
     error = Column(String, nullable=True)
     task_input = Column(JSON, nullable=True)
@@ -244,14 +426,28 @@ class TaskModel(Base):
     eval_score = Column(Float, nullable=True)
     eval_details = Column(JSON, nullable=True)
     eval_logs = Column(JSON, nullable=True)
+    timings = Column(JSON, nullable=True)  # Seconds spent per stage
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     executed_at = Column(DateTime, nullable=True)
     evaluated_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
     job = relationship("JobModel", back_populates="tasks")
 
+    __table_args__ = (
+        Index("ix_tasks_job_number", "job_id", "task_number"),
+        Index("ix_tasks_challenge_created", "challenge_id", "created_at", "id"),
+    )
+
     @classmethod
-    def start(cls, job_id: str, task_number: int, challenge_id: str) -> str:
+    @traced("db.task.start")
+    def start(
+        cls,
+        job_id: str,
+        task_number: int,
+        challenge_id: str,
+        variant: Optional[str] = None,
+        repeat_index: Optional[int] = None,
+    ) -> str:
         """
         Start a new task and return its ID.
         """
@@ -262,28 +458,35 @@ class TaskModel(Base):
                 job_id=job_id,
                 task_number=task_number,
                 status=TaskStatus.RUNNING,
-                challenge_id=challenge_id
+                challenge_id=challenge_id,
+                variant=variant,
+                repeat_index=repeat_index,
             )
             db.add(task)
             db.commit()
             return task_id
 
     @classmethod
-    def executed(cls, task_id: str, input: any, output: any, details: dict, logs: dict):
+    @traced("db.task.executed")
+    def executed(cls, task_id: str, input: any, output: any, details: dict, logs: list):
         """
         Update the task as executed with results and logs.
+        Large inputs, outputs and logs are offloaded to the blob store, smaller
+        logs are stored compressed (see `compress_logs`).
         """
+        blobs = get_blob_store()
         with db_context() as db:
             task = db.query(cls).filter(cls.id == task_id).one()
             task.status = TaskStatus.EVALUATING
-            task.task_input = input
-            task.task_output = output
+            task.task_input = blobs.offload(input)
+            task.task_output = blobs.offload(output)
             task.task_details = details
-            task.task_logs = logs
+            task.task_logs = blobs.offload(logs or None, packer=compress_logs)
             task.executed_at = datetime.now(timezone.utc)
             db.commit()
 
     @classmethod
+    @traced("db.task.evaluated")
     def evaluated(
         cls,
         task_id: str,
@@ -291,11 +494,15 @@ class TaskModel(Base):
         passed: bool,
         score: float,
         details: dict,
-        logs: dict,
+        logs: list,
+        timings: Optional[dict] = None,
     ):
         """
         Update the task as evaluated and completed.
+        Logs are stored compressed (see `compress_logs`) or offloaded to the
+        blob store when large.
         """
+        blobs = get_blob_store()
         with db_context() as db:
             task = db.query(cls).filter(cls.id == task_id).one()
             task.status = TaskStatus.COMPLETED if passed else TaskStatus.FAILED
@@ -303,12 +510,14 @@ class TaskModel(Base):
             task.eval_passed = passed
             task.eval_score = score
             task.eval_details = details
-            task.eval_logs = logs
+            task.eval_logs = blobs.offload(logs or None, packer=compress_logs)
+            task.timings = timings
             task.evaluated_at = task.finished_at = datetime.now(timezone.utc)
             db.commit()
 
     @classmethod
-    def fail(cls, task_id: str, error: str):
+    @traced("db.task.fail")
+    def fail(cls, task_id: str, error: str, timings: Optional[dict] = None):
         """
         Mark the task as failed with an error message.
         """
@@ -316,6 +525,7 @@ class TaskModel(Base):
             task = db.query(cls).filter(cls.id == task_id).one()
             task.status = TaskStatus.FAILED
             task.error = error
+            task.timings = timings
             task.finished_at = datetime.now(timezone.utc)
             db.commit()
 
@@ -327,24 +537,140 @@ class TaskModel(Base):
         with db_context() as db:
             return db.query(cls).filter(cls.job_id == job_id).all()
 
+    # Columns needed for an overview of tasks (no inputs, outputs or logs)
+    SUMMARY_COLUMNS = (
+        "id", "task_number", "variant", "repeat_index", "created_at",
+        "finished_at", "task_details", "status", "eval_score",
+    )
+
+    @classmethod
+    def overview(cls, job_id: str) -> Dict[str, int]:
+        """
+        Number of tasks of a job, how many are samples of repeated tasks, and
+        the length of the longest variant and model names, to lay out an
+        overview of the tasks without loading them.
+        """
+        with db_context() as db:
+            tasks, repeats, variant_width, model_width = db.query(
+                func.count(cls.id),
+                func.count(cls.repeat_index),
+                func.max(func.length(cls.variant)),
+                func.max(func.length(func.json_extract(cls.task_details, "$.model"))),
+            ).filter(cls.job_id == job_id).one()
+        return {
+            "tasks": tasks,
+            "repeats": repeats,
+            "variant_width": variant_width or 0,
+            "model_width": model_width or 0,
+        }
+
+    @classmethod
+    def iter_batches(
+        cls, job_id: str, batch_size: int = 200, summary: bool = False
+    ) -> Iterator[List["TaskModel"]]:
+        """
+        Iterate over the tasks of a job in task number order, one batch per
+        query, so that memory use doesn't grow with the size of the job.
+        With `summary`, only the `SUMMARY_COLUMNS` are loaded, as rows.
+        """
+        entities = (
+            [getattr(cls, name) for name in cls.SUMMARY_COLUMNS] if summary else [cls]
+        )
+        last = None
+        while True:
+            with db_context() as db:
+                query = db.query(*entities).filter(cls.job_id == job_id)
+                if last is not None:
+                    query = query.filter(or_(
+                        cls.task_number > last[0],
+                        and_(cls.task_number == last[0], cls.id > last[1]),
+                    ))
+                batch = (query
+                         .order_by(cls.task_number, cls.id)
+                         .limit(batch_size)
+                         .all())
+            if not batch:
+                return
+            yield batch
+            last = (batch[-1].task_number, batch[-1].id)
+
+    @classmethod
+    def challenge_history(
+        cls, project_id: str, challenge_ids: List[str]
+    ) -> Dict[str, Tuple[int, int]]:
+        """
+        Number of evaluated runs and passes of each challenge across the
+        project's jobs.
+        """
+        history = {}
+        unique_ids = list(set(challenge_ids))
+        with db_context() as db:
+            # Chunked to stay below SQLite's limit on query parameters
+            for start in range(0, len(unique_ids), 500):
+                rows = (db.query(
+                            cls.challenge_id,
+                            func.count(cls.id),
+                            func.sum(case((cls.eval_passed.is_(True), 1), else_=0)),
+                        )
+                        .join(JobModel, JobModel.id == cls.job_id)
+                        .filter(JobModel.project_id == project_id)
+                        .filter(cls.eval_passed.isnot(None))
+                        .filter(cls.challenge_id.in_(unique_ids[start:start + 500]))
+                        .group_by(cls.challenge_id)
+                        .all())
+                for challenge_id, runs, passes in rows:
+                    history[challenge_id] = (runs, passes or 0)
+        return history
+
+    @classmethod
+    def challenge_stats(cls, job_id: str) -> List[Tuple]:
+        """
+        Aggregate the finished tasks of a job per challenge and variant, for
+        repeated tasks: (challenge ID, variant, samples, passes, sum of scores,
+        sum of squared scores). Errors count as failed samples with a score
+        of 0.
+        """
+        score = func.coalesce(cls.eval_score, 0.0)
+        with db_context() as db:
+            return (db.query(
+                        cls.challenge_id,
+                        cls.variant,
+                        func.count(cls.id),
+                        func.sum(case((cls.eval_passed.is_(True), 1), else_=0)),
+                        func.sum(score),
+                        func.sum(score * score),
+                    )
+                    .filter(cls.job_id == job_id)
+                    .filter(cls.status.in_([TaskStatus.COMPLETED, TaskStatus.FAILED]))
+                    .group_by(cls.challenge_id, cls.variant)
+                    .order_by(func.min(cls.task_number))
+                    .all())
+
     @classmethod
     def get_status_map(cls, job_id: str) -> Dict[str, str]:
         """
         Get a mapping of task IDs to their statuses for a job.
         """
         with db_context() as db:
-            tasks = db.query(cls).filter(cls.job_id == job_id).all()
-            return {task.id: task.status for task in tasks}
+            # Only read the two columns needed, not the payload columns
+            rows = db.query(cls.id, cls.status).filter(cls.job_id == job_id).all()
+            return {task_id: status for task_id, status in rows}
 
     @classmethod
     def find_same_tasks(
-        cls, project_id: str, challenge_id: str, limit: int = 10, offset: int = 0
+        cls,
+        project_id: str,
+        challenge_id: str,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List["TaskModel"]:
         """
         Find tasks with the same challenge ID within a project.
+        Supports the same keyset `cursor` pagination as `JobModel.list_recent`.
         """
         with db_context() as db:
-            return (
+            query = (
                 db.query(cls)
                 .join(JobModel, cls.job_id == JobModel.id)
                 .filter(
@@ -352,30 +678,198 @@ class TaskModel(Base):
                     JobModel.project_id == project_id,
                     cls.finished_at.isnot(None)  # Only finished tasks
                 )
-                .order_by(cls.created_at.desc())
+            )
+            if cursor:
+                query = query.filter(_after_cursor(cls, cursor))
+            return (
+                query
+                .order_by(cls.created_at.desc(), cls.id.desc())
                 .offset(offset)
                 .limit(limit)
                 .all()
             )
 
 
+class CriterionResultModel(Base):
+    """
+    Cached judge results of single checklist criteria, keyed on a hash of the
+    input, output, criterion and judge model (see `evaluators.checklist`).
+    Results not used for a while are pruned by `multinear gc`.
+    """
+    __tablename__ = "criterion_results"
+
+    key = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    criterion = Column(String, nullable=False)
+    score = Column(Float, nullable=False)
+    rationale = Column(String, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Last time the result was saved or read (updated at most every USE_RESOLUTION)
+    used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_criterion_results_used_at", "used_at"),
+    )
+
+    # Reading a result only updates its last use when older than this, so
+    # that cache hits rarely write to the database
+    USE_RESOLUTION = timedelta(hours=1)
+
+    @classmethod
+    def get_many(cls, keys: List[str]) -> Dict[str, "CriterionResultModel"]:
+        """
+        Find the cached results for the given keys, and record their use.
+        """
+        if not keys:
+            return {}
+        now = datetime.now(timezone.utc)
+        stale = now.replace(tzinfo=None) - cls.USE_RESOLUTION
+        with db_context() as db:
+            rows = db.query(cls).filter(cls.key.in_(keys)).all()
+            touched = [
+                row.key for row in rows
+                if row.used_at is None or row.used_at < stale
+            ]
+            if touched:
+                db.query(cls).filter(cls.key.in_(touched)).update(
+                    {cls.used_at: now}, synchronize_session=False
+                )
+                db.commit()
+            return {row.key: row for row in rows}
+
+    @classmethod
+    def save_many(cls, results: List[Dict]):
+        """
+        Save criterion results (dicts with the columns' values), replacing
+        existing results with the same key. Concurrent tasks may judge the
+        same criterion, so this is a single upsert rather than a merge.
+        """
+        if not results:
+            return
+        statement = sqlite_insert(cls).values(results)
+        statement = statement.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={
+                name: statement.excluded[name]
+                for name in (
+                    "model", "criterion", "score", "rationale", "created_at", "used_at"
+                )
+            },
+        )
+        with db_context() as db:
+            db.execute(statement)
+            db.commit()
+
+    @classmethod
+    def prune(cls, unused_since: Optional[datetime] = None, dry_run: bool = False) -> int:
+        """
+        Delete cached results not used since `unused_since`, or all of them
+        if it is None.
+
+        Returns:
+            The number of deleted (or, with `dry_run`, matching) results.
+        """
+        with db_context() as db:
+            query = db.query(cls)
+            if unused_since is not None:
+                query = query.filter(
+                    func.coalesce(cls.used_at, cls.created_at) < unused_since
+                )
+            if dry_run:
+                return query.count()
+            count = query.delete(synchronize_session=False)
+            db.commit()
+            return count
+
+
 # Database session management
 
-# Global variable to store SessionLocal
+# Global variables to store the engine and SessionLocal
+_engine = None
 _SessionLocal = None
 
+DATABASE_PATH = Path(".multinear") / "multinear.db"
+
 
 def init_db():
     """
     Initialize the database engine and create tables if they don't exist.
     """
-    DATABASE_URL = "sqlite:///./.multinear/multinear.db"
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-    global _SessionLocal
+    DATABASE_URL = f"sqlite:///./{DATABASE_PATH.as_posix()}"
+    # Connections are cheap with SQLite: allow one per API thread and task
+    # worker without waiting for the pool. JSON columns are parsed with orjson
+    # when installed, as loading large runs is dominated by their parsing.
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=16,
+        max_overflow=32,
+        json_serializer=json_serializer,
+        json_deserializer=fastjson.loads,
+    )
+    global _engine, _SessionLocal
+    _engine = engine
     _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     # Create tables defined by the models
     Base.metadata.create_all(bind=engine)
+    _migrate(engine)
+    _backfill()
+
+
+def json_serializer(value) -> str:
+    """
+    Serialize JSON column values, storing values encoded by the blob store
+    (`EncodedJSON`) as they are.
+    """
+    if isinstance(value, EncodedJSON):
+        return value.data.decode()
+    return json.dumps(value)
+
+
+def _migrate(engine):
+    """
+    Bring tables created by older versions up to date with the models.
+
+    `create_all` only creates missing tables, so columns and indexes added to
+    existing models are created here.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" '
+                        f'{column_type}'
+                    ))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _backfill():
+    """
+    Fill derived columns for rows created before those columns existed.
+    """
+    with db_context() as db:
+        job_ids = db.query(JobModel.id).filter(JobModel.id_reversed.is_(None)).all()
+        for (job_id,) in job_ids:
+            db.query(JobModel).filter(JobModel.id == job_id).update(
+                {JobModel.id_reversed: job_id[::-1]}
+            )
+        db.commit()
+
+
+def get_engine():
+    """
+    Get the database engine, initializing the database if needed.
+    """
+    if _engine is None:
+        init_db()
+    return _engine
 
 
 def _create_session():
@@ -32,7 +32,7 @@ export async function handleStartExperiment(selectedProjectId: string, reloadRec
 
         // Polling for job status
         let status = 'started';
-        while (!['completed', 'failed', 'not_found'].includes(status)) {
+        while (!['completed', 'stopped', 'failed', 'not_found'].includes(status)) {
             await new Promise(r => setTimeout(r, 1000));
             const statusData = await getJobStatus(selectedProjectId, jobId);
             status = statusData.status;
@@ -53,7 +53,7 @@ export async function handleStartExperiment(selectedProjectId: string, reloadRec
                 taskStatusCounts: counts,
             });
 
-            if (status === 'completed') {
+            if (status === 'completed' || status === 'stopped') {
                 await reloadRecentRuns();
             } else if (status === 'failed') {
                 break;
@@ -1,17 +1,36 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
+from .api.compression import CompressionMiddleware
+from .api.metrics import metrics_router, MetricsMiddleware
 from .api.router import api_router
 from .engine.storage import init_project_db
+from .utils import metrics
 
 
 # Initialize the configuration and database
 init_project_db()
 
+# Threads running the API endpoints (and jobs started from the frontend), which
+# access the database synchronously
+API_THREADS = int(os.environ.get("MULTINEAR_API_THREADS", "16"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from anyio import to_thread
+
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADS
+    yield
+
+
 # Create the FastAPI application with custom documentation URLs
 app = FastAPI(
+    lifespan=lifespan,
     docs_url="/api/docs",           # Swagger UI
     redoc_url="/api/redoc",         # Redoc
     openapi_url="/api/openapi.json" # OpenAPI JSON schema
@@ -26,8 +45,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses with brotli or gzip, as accepted by the client
+app.add_middleware(CompressionMiddleware)
+
+# Count and time API requests and database statements for the /metrics endpoint
+app.add_middleware(MetricsMiddleware)
+metrics.instrument_database()
+
 # Include the API router with all endpoints
 app.include_router(api_router)
+app.include_router(metrics_router)
 
 # Serve the frontend static files (Svelte app)
 frontend_path = Path(__file__).parent.parent / "multinear" / "frontend" / "build"
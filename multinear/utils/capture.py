@@ -1,7 +1,22 @@
 import sys
 import logging
+import threading
 import time
 import re
+import json
+import zlib
+import base64
+from collections import deque
+from typing import Dict, List, Optional
+
+from . import fastjson
+
+
+# Regex pattern for ANSI escape codes to clean up logs
+_ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Codec used for logs stored in the database
+LOGS_CODEC = "zlib"
 
 
 class OutputCapture:
@@ -10,72 +25,265 @@ class OutputCapture:
 
     This allows capturing all outputs generated by the task execution
     and evaluation processes, including print statements and logs.
+    Captures are per thread, so tasks running concurrently in worker threads
+    each capture their own output (see `_Router`).
+
+    Capture is bounded: at most `max_records` records and `max_bytes` bytes of
+    messages are kept. With `keep_last` > 0 the capture works as a ring buffer,
+    keeping the first records and the last `keep_last` ones; everything in
+    between is replaced by a single truncation marker.
+
+    Args:
+        max_records: Maximum number of records to keep.
+        max_bytes: Maximum total size of kept messages, in bytes of UTF-8.
+        keep_last: Number of most recent records to keep once the limits are hit.
+        min_level: Minimum logging level to capture (prints are always captured).
+        max_message_chars: Longer messages are cut to this length.
     """
-    def __init__(self):
-        self.logs = []
-        self._original_stdout = None
-        self._log_handler = None
-        # Regex pattern for ANSI escape codes to clean up logs
-        self._ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    
-    def _create_log_handler(self):
+    def __init__(
+        self,
+        max_records: int = 10000,
+        max_bytes: int = 1_000_000,
+        keep_last: int = 0,
+        min_level: str = "DEBUG",
+        max_message_chars: int = 10000,
+    ):
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.keep_last = min(keep_last, max_records)
+        self.min_level = logging.getLevelName(str(min_level).upper())
+        if not isinstance(self.min_level, int):
+            raise ValueError(f"Invalid log level: {min_level}")
+        self.max_message_chars = max_message_chars
+
+        # When keeping the tail, split the byte budget between head and tail
+        self._head_max_records = max_records - self.keep_last
+        self._head_max_bytes = max_bytes // 2 if self.keep_last else max_bytes
+        self._tail_max_bytes = max_bytes - self._head_max_bytes
+
+        self._head = []
+        self._head_bytes = 0
+        # (size in bytes, record) pairs, so eviction doesn't encode again
+        self._tail = deque()
+        self._tail_bytes = 0
+        self._dropped = 0
+        self._dropped_bytes = 0
+        # Time spent storing records, i.e. the overhead of capturing
+        self.overhead = 0.0
+
+    @property
+    def logs(self):
         """
-        Create a custom logging handler to capture logs.
+        The captured records, with a truncation marker if any were dropped.
         """
-        handler = logging.Handler()
-        handler.setLevel(logging.DEBUG)
-        
-        def emit(record):
-            self.logs.append({
-                'level': record.levelname,
-                'message': handler.format(record),
-                'timestamp': record.created,
-                'module': record.module
+        logs = list(self._head)
+        if self._dropped:
+            logs.append({
+                'level': 'TRUNCATED',
+                'message': (
+                    f"{self._dropped} records ({self._dropped_bytes} bytes) "
+                    "omitted by capture limits"
+                ),
+                'timestamp': time.time(),
+                'module': 'multinear'
             })
-        handler.emit = emit
-        return handler
-    
+        logs.extend(record for _, record in self._tail)
+        return logs
+
+    def _append(self, level: str, message: str, timestamp: float, module: str):
+        """
+        Store a record, respecting the configured limits.
+        """
+        start = time.perf_counter()
+        try:
+            self._store(level, message, timestamp, module)
+        finally:
+            self.overhead += time.perf_counter() - start
+
+    def _store(self, level: str, message: str, timestamp: float, module: str):
+        if len(message) > self.max_message_chars:
+            message = message[:self.max_message_chars] + " ... [truncated]"
+        record = {
+            'level': level,
+            'message': message,
+            'timestamp': timestamp,
+            'module': module
+        }
+        size = len(message.encode('utf-8', 'replace'))
+
+        # Keep the first records while the head has room
+        if (
+            not self._tail
+            and len(self._head) < self._head_max_records
+            and self._head_bytes + size <= self._head_max_bytes
+        ):
+            self._head.append(record)
+            self._head_bytes += size
+            return
+
+        if not self.keep_last:
+            self._dropped += 1
+            self._dropped_bytes += size
+            return
+
+        # Ring buffer for the last records, evicting the oldest ones
+        self._tail.append((size, record))
+        self._tail_bytes += size
+        while self._tail and (
+            len(self._tail) > self.keep_last
+            or self._tail_bytes > self._tail_max_bytes
+        ):
+            evicted_size, _ = self._tail.popleft()
+            self._tail_bytes -= evicted_size
+            self._dropped += 1
+            self._dropped_bytes += evicted_size
+
     def write(self, text):
         """
         Capture text written to stdout.
         """
-        if text.strip():
+        stripped = text.strip()
+        if stripped:
             # Strip ANSI escape codes before storing
-            clean_text = self._ansi_escape.sub('', text.strip())
-            self.logs.append({
-                'level': 'PRINT',
-                'message': clean_text,
-                'timestamp': time.time(),
-                'module': 'stdout'
-            })
-        self._original_stdout.write(text)
+            if '\x1b' in stripped:
+                stripped = _ANSI_ESCAPE.sub('', stripped)
+            self._append('PRINT', stripped, time.time(), 'stdout')
+        _router.original.write(text)
 
     def flush(self):
         """
         Flush the original stdout buffer.
         """
-        self._original_stdout.flush()
+        _router.original.flush()
 
     def __enter__(self):
         """
-        Enter the context manager, setting up the capture.
+        Enter the context manager, capturing the current thread's output.
         """
-        # Setup stdout capture
-        self._original_stdout = sys.stdout
-        sys.stdout = self
-        
-        # Setup logging capture
-        self._log_handler = self._create_log_handler()
-        logging.getLogger().addHandler(self._log_handler)
+        _push(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Exit the context manager, restoring original stdout and removing log handler.
+        Exit the context manager; stdout and logging are restored once no
+        capture is active in any thread.
         """
-        # Restore stdout
-        sys.stdout = self._original_stdout
-        
-        # Remove the log handler
-        if self._log_handler:
-            logging.getLogger().removeHandler(self._log_handler)
+        _pop(self)
+
+
+class _Router:
+    """
+    Stand-in for sys.stdout and a root log handler, installed while any
+    capture is active, sending output to the capture of the thread producing
+    it. Output of threads without a capture of their own (e.g. threads
+    started by a task) goes to the only active capture if there is exactly
+    one, and to the original stdout otherwise.
+    """
+    def __init__(self):
+        self.original = None
+        self.handler = None
+        self.captures: Dict[int, List[OutputCapture]] = {}
+        self.lock = threading.Lock()
+
+    def capture_for_thread(self) -> Optional[OutputCapture]:
+        stack = self.captures.get(threading.get_ident())
+        if stack:
+            return stack[-1]
+        if len(self.captures) == 1 and not getattr(_passthrough, "enabled", False):
+            for stack in list(self.captures.values()):
+                return stack[-1]
+        return None
+
+    def write(self, text):
+        capture = self.capture_for_thread()
+        if capture is not None:
+            capture.write(text)
+        else:
+            self.original.write(text)
+
+    def flush(self):
+        self.original.flush()
+
+    def __getattr__(self, name):
+        # Other file attributes (encoding, isatty, ...) of the original stdout
+        return getattr(self.original, name)
+
+    def _create_log_handler(self):
+        handler = logging.Handler()
+
+        def emit(record):
+            capture = self.capture_for_thread()
+            # Records below the capture's minimum level aren't formatted
+            if capture is not None and record.levelno >= capture.min_level:
+                capture._append(
+                    record.levelname, handler.format(record), record.created, record.module
+                )
+        handler.emit = emit
+        return handler
+
+
+_router = _Router()
+
+# Threads whose output is never sent to another thread's capture
+_passthrough = threading.local()
+
+
+def set_passthrough(enabled: bool = True):
+    """
+    Keep the current thread's output out of captures of other threads, e.g.
+    for the thread scheduling tasks while they run in worker threads.
+    """
+    _passthrough.enabled = enabled
+
+
+def _push(capture: OutputCapture):
+    with _router.lock:
+        if not _router.captures:
+            _router.original = sys.stdout
+            sys.stdout = _router
+            _router.handler = _router._create_log_handler()
+            logging.getLogger().addHandler(_router.handler)
+        _router.captures.setdefault(threading.get_ident(), []).append(capture)
+
+
+def _pop(capture: OutputCapture):
+    with _router.lock:
+        ident = threading.get_ident()
+        stack = _router.captures.get(ident, [])
+        if capture in stack:
+            stack.remove(capture)
+        if not stack:
+            _router.captures.pop(ident, None)
+        if not _router.captures:
+            sys.stdout = _router.original
+            logging.getLogger().removeHandler(_router.handler)
+            _router.handler = None
+
+
+def compress_logs(logs):
+    """
+    Compress captured logs for storage in a JSON column.
+
+    Returns None for empty logs, otherwise a dict with the codec, the number of
+    records and the base64-encoded compressed payload.
+    """
+    if not logs:
+        return None
+    payload = json.dumps(logs, separators=(',', ':')).encode()
+    return {
+        'codec': LOGS_CODEC,
+        'count': len(logs),
+        'data': base64.b64encode(zlib.compress(payload, 6)).decode('ascii'),
+    }
+
+
+def decompress_logs(value):
+    """
+    Restore logs stored by `compress_logs`.
+    Plain lists (logs stored before compression was introduced) are returned as is.
+    """
+    if not isinstance(value, dict) or 'codec' not in value:
+        return value
+    if value['codec'] != LOGS_CODEC:
+        raise ValueError(f"Unknown logs codec: {value['codec']}")
+    return fastjson.loads(zlib.decompress(base64.b64decode(value['data'])))
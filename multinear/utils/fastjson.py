@@ -0,0 +1,41 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the json module
+    orjson = None
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to compact JSON bytes, with orjson when it is installed.
+
+    Values that are not JSON types (e.g. returned by task runners) are
+    converted with `str`. NaN and infinity become null with orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_OPTIONS)
+        except TypeError:
+            pass  # e.g. integers over 64 bits, which the json module handles
+    return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON, with orjson when it is installed.
+
+    Documents orjson rejects, such as NaN written by the json module, are
+    parsed by the json module.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
@@ -1,23 +1,237 @@
+import hashlib
+import os
+import struct
 from pathlib import Path
-import subprocess
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+
+
+# Resolved revisions, keyed on the git dir, with the mtimes of the files read
+_revision_cache: Dict[Path, Tuple[tuple, Optional[str]]] = {}
+
+# Digests of .multinear files, keyed on (path, size, mtime)
+_file_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
+# Files in .multinear that define an experiment (the database, blobs, archives
+# and other generated files are left out)
+CONFIG_SUFFIXES = (".py", ".yaml", ".yml", ".json", ".toml")
+
+# Maximum depth of symbolic refs to follow
+_MAX_REF_DEPTH = 5
+
+
+def _find_git_dir(folder: Path) -> Optional[Path]:
+    """
+    The git dir of a repository or worktree rooted at `folder`.
+    """
+    git_path = folder / ".git"
+    if git_path.is_dir():
+        return git_path
+    if git_path.is_file():
+        # Worktrees and submodules: ".git" is a file pointing to the git dir
+        content = git_path.read_text().strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            return git_dir if git_dir.is_absolute() else (folder / git_dir).resolve()
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """
+    The directory holding refs shared by all worktrees.
+    """
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        return (git_dir / commondir.read_text().strip()).resolve()
+    return git_dir
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_packed_ref(common_dir: Path, ref: str) -> Optional[str]:
+    try:
+        with open(common_dir / "packed-refs") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def _resolve_head(git_dir: Path) -> Tuple[Optional[str], list]:
+    """
+    Resolve HEAD to a commit hash by reading loose and packed refs.
+
+    Returns:
+        The hash (or None) and the files whose mtimes determine the result.
+    """
+    common_dir = _common_dir(git_dir)
+    head = git_dir / "HEAD"
+    files = [head, common_dir / "packed-refs"]
+    value = head.read_text().strip()
+    for _ in range(_MAX_REF_DEPTH):
+        if not value.startswith("ref:"):
+            return value or None, files
+        ref = value[len("ref:"):].strip()
+        # Per-worktree refs live in the git dir, branches in the common dir
+        for base in (git_dir, common_dir):
+            loose = base / ref
+            files.append(loose)
+            if loose.is_file():
+                value = loose.read_text().strip()
+                break
+        else:
+            return _read_packed_ref(common_dir, ref), files
+    return None, files
 
 
 def get_git_revision(folder: Path) -> Optional[str]:
     """
     Check if folder is a git repository and return current revision hash.
-    Returns None if not a git repo or if git command fails.
+    Returns None if not a git repo or if HEAD can't be resolved (e.g. no commits).
+
+    Reads `.git/HEAD`, loose refs and `packed-refs` directly instead of running
+    git; results are cached until one of these files changes.
     """
-    git_dir = folder / ".git"
-    if not git_dir.is_dir():
+    git_dir = _find_git_dir(Path(folder))
+    if git_dir is None:
         return None
-        
+
+    cached = _revision_cache.get(git_dir)
+    if cached is not None:
+        stamps, revision = cached
+        if tuple((path, _mtime(path)) for path, _ in stamps) == stamps:
+            return revision
+
     try:
-        return subprocess.check_output(
-            ["git", "rev-parse", "HEAD"],
-            cwd=folder,
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-    except Exception as e:
+        revision, files = _resolve_head(git_dir)
+    except OSError as e:
         print(f"Error fetching git revision: {e}")
         return None
+    _revision_cache[git_dir] = (tuple((path, _mtime(path)) for path in files), revision)
+    return revision
+
+
+def _index_entries(index_path: Path):
+    """
+    Yield (path, mtime_s, mtime_ns, size) of the entries of a git index file.
+
+    Supports index versions 2 to 4. Entries marked assume-unchanged or
+    skip-worktree, and submodules, are skipped.
+    """
+    data = index_path.read_bytes()
+    signature, version, count = struct.unpack(">4sII", data[:12])
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise ValueError(f"Unsupported git index version: {version}")
+
+    offset = 12
+    previous_path = b""
+    for _ in range(count):
+        (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size) = struct.unpack(
+            ">10I", data[offset:offset + 40]
+        )
+        flags, = struct.unpack(">H", data[offset + 60:offset + 62])
+        entry_start = offset
+        offset += 62
+        extended = 0
+        if flags & 0x4000:  # Extended flags (version 3+)
+            extended, = struct.unpack(">H", data[offset:offset + 2])
+            offset += 2
+
+        if version == 4:
+            # Path stored as the number of bytes to strip from the previous
+            # path (varint), followed by the NUL-terminated suffix
+            strip = data[offset] & 0x7F
+            while data[offset] & 0x80:
+                offset += 1
+                strip = ((strip + 1) << 7) | (data[offset] & 0x7F)
+            offset += 1
+            end = data.index(b"\0", offset)
+            path = previous_path[:len(previous_path) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            end = data.index(b"\0", offset)
+            path = data[offset:end]
+            # Entries are padded with NULs to a multiple of 8 bytes
+            offset = entry_start + ((end - entry_start + 8) // 8) * 8
+        previous_path = path
+
+        assume_unchanged = flags & 0x8000
+        skip_worktree = extended & 0x4000
+        submodule = (mode >> 12) == 0o16
+        if not (assume_unchanged or skip_worktree or submodule):
+            yield path.decode("utf-8", "surrogateescape"), mtime_s, mtime_ns, size
+
+
+def is_dirty(folder: Path) -> Optional[bool]:
+    """
+    Whether tracked files differ from the index, like the quick stat check of
+    `git status` (modified or deleted files; untracked files are not considered).
+
+    Compares the size and mtime of each file with those recorded in the index,
+    without reading file contents. Returns None if not a git repo or the index
+    can't be read.
+    """
+    folder = Path(folder)
+    git_dir = _find_git_dir(folder)
+    if git_dir is None:
+        return None
+    try:
+        entries = _index_entries(git_dir / "index")
+        for path, mtime_s, mtime_ns, size in entries:
+            try:
+                stat = os.lstat(folder / path)
+            except OSError:
+                return True  # Deleted
+            if (
+                stat.st_size % 2**32 != size
+                or stat.st_mtime_ns // 10**9 != mtime_s
+                or stat.st_mtime_ns % 10**9 != mtime_ns
+            ):
+                return True
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error reading git index: {e}")
+        return None
+    return False
+
+
+def hash_config_dir(folder: Path) -> Optional[str]:
+    """
+    Content hash of the experiment definition in `.multinear/` (config and task
+    runner files), to tell apart runs of the same commit with local changes.
+    File digests are cached until the file's size or mtime changes.
+    """
+    config_dir = Path(folder) / ".multinear"
+    if not config_dir.is_dir():
+        return None
+    digest = hashlib.sha256()
+    for path in sorted(config_dir.iterdir()):
+        if path.suffix not in CONFIG_SUFFIXES or not path.is_file():
+            continue
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        file_digest = _file_hash_cache.get(key)
+        if file_digest is None:
+            file_digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            _file_hash_cache[key] = file_digest
+        digest.update(f"{path.name}\0{file_digest}\n".encode())
+    return digest.hexdigest()
+
+
+def get_revision_info(folder: Path) -> Dict[str, Any]:
+    """
+    Tag for a run: git revision, dirty state and the hash of `.multinear/`.
+    """
+    return {
+        "git_revision": get_git_revision(folder),
+        "git_dirty": is_dirty(folder),
+        "config_hash": hash_config_dir(folder),
+    }
@@ -0,0 +1,168 @@
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import prometheus_client
+except ImportError:  # Metrics are optional, recording becomes a no-op
+    prometheus_client = None
+
+
+# Histogram buckets (seconds) for everything from DB statements to LLM calls
+_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class _NoopMetric:
+    """
+    Stand-in for a metric when prometheus_client is not installed.
+    """
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return prometheus_client.Counter(name, documentation, labels)
+
+
+def _gauge(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return prometheus_client.Gauge(name, documentation, labels)
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return prometheus_client.Histogram(name, documentation, labels, buckets=_BUCKETS)
+
+
+# Runner
+JOBS = _counter("multinear_jobs_total", "Finished jobs, by status", ("status",))
+JOBS_ACTIVE = _gauge("multinear_jobs_active", "Jobs currently running")
+TASKS = _counter("multinear_tasks_total", "Finished tasks, by status", ("status",))
+TASKS_IN_PROGRESS = _gauge(
+    "multinear_tasks_in_progress", "Tasks currently executing or being evaluated"
+)
+TASK_QUEUE_DEPTH = _gauge(
+    "multinear_task_queue_depth", "Tasks of running jobs waiting to start"
+)
+TASK_STAGE_SECONDS = _histogram(
+    "multinear_task_stage_seconds", "Time spent by tasks in each stage", ("stage",)
+)
+
+# Evaluator
+EVALUATIONS = _counter(
+    "multinear_evaluations_total",
+    "Evaluator calls, by evaluator and outcome (ok, error, or skipped by the cascade)",
+    ("evaluator", "outcome"),
+)
+EVALUATION_SECONDS = _histogram(
+    "multinear_evaluation_seconds", "Evaluator call latency", ("evaluator",)
+)
+
+# Storage
+DB_STATEMENT_SECONDS = _histogram(
+    "multinear_db_statement_seconds", "SQL statement latency", ("operation",)
+)
+DB_COMMIT_SECONDS = _histogram(
+    "multinear_db_commit_seconds", "Transaction commit latency, including flush"
+)
+
+# API
+HTTP_REQUESTS = _counter(
+    "multinear_http_requests_total", "API requests", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = _histogram(
+    "multinear_http_request_seconds", "API request latency", ("method", "route")
+)
+
+
+def enabled() -> bool:
+    """
+    Whether metrics are recorded (prometheus_client is installed).
+    """
+    return prometheus_client is not None
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Metrics in the Prometheus text format, with the matching content type.
+    """
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0") -> None:
+    """
+    Serve metrics on a separate port from a daemon thread (e.g. during `multinear run`).
+
+    Raises:
+        RuntimeError: If prometheus_client is not installed.
+    """
+    if prometheus_client is None:
+        raise RuntimeError("Metrics require the prometheus_client package")
+    prometheus_client.start_http_server(port, addr=addr)
+
+
+def record_task(status: str, timings: Optional[Dict[str, float]]) -> None:
+    """
+    Record a finished task and the durations of its stages.
+    """
+    TASKS.labels(status).inc()
+    for stage, seconds in (timings or {}).items():
+        TASK_STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+_database_instrumented = False
+
+
+def instrument_database() -> None:
+    """
+    Time SQL statements and commits of all engines and sessions.
+
+    Called by the processes that expose metrics (the web server and
+    `multinear run --metrics-port`), so other commands don't pay for it.
+    """
+    global _database_instrumented
+    if prometheus_client is None or _database_instrumented:
+        return
+    _database_instrumented = True
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["metrics_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper()
+        DB_STATEMENT_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+    @event.listens_for(Session, "before_commit")
+    def _before_commit(session):
+        session.info["metrics_commit_start"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session):
+        start = session.info.pop("metrics_commit_start", None)
+        if start is not None:
+            DB_COMMIT_SECONDS.observe(time.perf_counter() - start)
@@ -0,0 +1,190 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+
+PROFILES_DIR = Path(".multinear") / "profiles"
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# Number of functions listed in top.txt
+TOP_N = 30
+
+
+@lru_cache(maxsize=None)
+def _short_filename(filename: str) -> str:
+    """
+    Filename relative to the working directory or the import path entry holding
+    it (e.g. "autoevals/llm.py" rather than the full site-packages path).
+    """
+    prefixes = sorted(
+        (os.path.abspath(p) for p in sys.path if p), key=len, reverse=True
+    )
+    cwd = os.getcwd()
+    for prefix in [cwd] + prefixes:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """
+    Background thread sampling the call stack of one thread at a fixed interval.
+
+    Stacks are counted as collapsed strings (outermost frame first, frames
+    separated by ";"), starting below `base_frame`.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="multinear-profiler", daemon=True)
+        self.interval = interval
+        self.counts: Optional[Counter] = None
+        self._target = None
+        self._base_frame = None
+        self._stop_event = threading.Event()
+
+    def attach(self, counts: Counter, base_frame):
+        self._base_frame = base_frame
+        self.counts = counts
+        self._target = threading.get_ident()
+
+    def detach(self):
+        self._target = None
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            target, counts, base = self._target, self.counts, self._base_frame
+            if target is None:
+                continue
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None and frame is not base:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack and self._target is not None:
+                counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """
+    Profile the task runner and evaluation of each task of a run.
+
+    Results are written under `.multinear/profiles/<job-id>/`:
+
+    - "sample" mode (low overhead): `task-<n>.collapsed` per task and
+      `aggregate.collapsed` for the run, in the collapsed stack format read by
+      flamegraph.pl, speedscope and similar tools.
+    - "cprofile" mode (deterministic, higher overhead): `task-<n>.prof` per task
+      and `aggregate.prof`, readable with `pstats` or snakeviz.
+
+    Both modes write `top.txt` with the hottest functions of the run.
+    """
+
+    def __init__(self, job_id: str, mode: str = "sample", interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.directory = PROFILES_DIR / job_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._profiles: Dict[int, cProfile.Profile] = {}
+        self._samples: Dict[int, Counter] = {}
+        self._sampler = None
+        if mode == "sample":
+            self._sampler = _Sampler(interval)
+            self._sampler.start()
+
+    @contextmanager
+    def profile(self, task_number: int):
+        """
+        Profile a block of code as part of a task (may be entered several times).
+        """
+        if self.mode == "cprofile":
+            profile = self._profiles.setdefault(task_number, cProfile.Profile())
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+        else:
+            counts = self._samples.setdefault(task_number, Counter())
+            self._sampler.attach(counts, sys._getframe(2))
+            try:
+                yield
+            finally:
+                self._sampler.detach()
+
+    def finish(self) -> Path:
+        """
+        Write per-task and aggregated profiles and the top functions.
+
+        Returns:
+            The directory holding the profiles.
+        """
+        if self._sampler is not None:
+            self._sampler.stop()
+
+        if self.mode == "cprofile":
+            for task_number, profile in self._profiles.items():
+                profile.dump_stats(self.directory / f"task-{task_number:04d}.prof")
+            if self._profiles:
+                profiles = list(self._profiles.values())
+                stats = pstats.Stats(profiles[0], stream=io.StringIO())
+                for profile in profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(self.directory / "aggregate.prof")
+                self._write_top_cprofile(stats)
+        else:
+            aggregate = Counter()
+            for task_number, counts in self._samples.items():
+                _write_collapsed(self.directory / f"task-{task_number:04d}.collapsed", counts)
+                aggregate.update(counts)
+            _write_collapsed(self.directory / "aggregate.collapsed", aggregate)
+            self._write_top_samples(aggregate)
+        return self.directory
+
+    def _write_top_cprofile(self, stats: pstats.Stats):
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats("tottime").print_stats(TOP_N)
+        stats.sort_stats("cumulative").print_stats(TOP_N)
+        (self.directory / "top.txt").write_text(output.getvalue())
+
+    def _write_top_samples(self, counts: Counter):
+        own = Counter()
+        total = Counter()
+        for stack, count in counts.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        samples = sum(counts.values()) or 1
+
+        lines = [f"{sum(counts.values())} samples", "", "Self time:"]
+        for frame, count in own.most_common(TOP_N):
+            lines.append(f"{count / samples:7.1%} {count:8d}  {frame}")
+        lines += ["", "Total time (including callees):"]
+        for frame, count in total.most_common(TOP_N):
+            lines.append(f"{count / samples:7.1%} {count:8d}  {frame}")
+        (self.directory / "top.txt").write_text("\n".join(lines) + "\n")
+
+
+def _write_collapsed(path: Path, counts: Counter):
+    with open(path, "w") as f:
+        for stack, count in counts.most_common():
+            f.write(f"{stack} {count}\n")
@@ -0,0 +1,111 @@
+import math
+from typing import Dict, Iterable, Sequence, Tuple
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Percentile (0-100) of already sorted values, with linear interpolation.
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(values: Iterable[float], qs=(50, 95, 99)) -> Dict[str, float]:
+    """
+    Summarize values (e.g. durations) with count, mean, max and percentiles.
+    """
+    values = sorted(values)
+    summary = {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": values[-1] if values else 0.0,
+    }
+    for q in qs:
+        summary[f"p{q}"] = percentile(values, q)
+    return summary
+
+
+def z_score(confidence: float) -> float:
+    """
+    Two-sided critical value of the standard normal distribution, e.g. 1.96 for 0.95.
+    """
+    from statistics import NormalDist
+
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes: float, n: float, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a proportion; well-behaved for small samples and
+    proportions near 0 or 1.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    z = z_score(confidence)
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def _bernoulli_kl(p: float, q: float) -> float:
+    """
+    Kullback-Leibler divergence between Bernoulli distributions with means p and q.
+    """
+    total = 0.0
+    if p > 0:
+        total += p * math.log(p / q)
+    if p < 1:
+        total += (1 - p) * math.log((1 - p) / (1 - q))
+    return total
+
+
+def sequential_upper_bound(successes: int, n: int, confidence: float = 0.95) -> float:
+    """
+    Upper confidence bound on a proportion after n observations, valid at every
+    n simultaneously, so it can be checked after each observation.
+
+    Uses the Chernoff bound n * KL(p || q) <= log(1 / alpha_n), with the error
+    rate split over n as alpha_n = alpha / (n * (n + 1)), which sums to alpha.
+    """
+    if n <= 0:
+        return 1.0
+    p = successes / n
+    limit = math.log(n * (n + 1) / (1 - confidence)) / n
+    low, high = p, 1.0
+    if high - low < 1e-12 or _bernoulli_kl(p, 1 - 1e-12) <= limit:
+        return 1.0
+    for _ in range(50):
+        middle = (low + high) / 2
+        if _bernoulli_kl(p, middle) > limit:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """
+    Unbiased estimate of the probability that at least one of k samples
+    passes, from n samples of which c passed: 1 - C(n-c, k) / C(n, k).
+
+    Raises:
+        ValueError: If fewer than k samples were taken.
+    """
+    if n < k:
+        raise ValueError(f"pass@{k} needs at least {k} samples, got {n}")
+    if n - c < k:
+        return 1.0
+    # Product form of the ratio of binomial coefficients, avoiding large numbers
+    ratio = 1.0
+    for i in range(n - c + 1, n + 1):
+        ratio *= 1 - k / i
+    return 1.0 - ratio
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from .stats import summarize
+
+
+class StageTimer:
+    """
+    Accumulate wall-clock durations (monotonic clock) per named stage.
+
+    Entering the same stage several times adds up its durations.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Durations in seconds, rounded to microseconds to keep rows compact.
+        """
+        return {name: round(seconds, 6) for name, seconds in self.durations.items()}
+
+
+# Logger of the OpenAI client, which logs each retry with its wait in seconds
+OPENAI_LOGGER = "openai._base_client"
+
+_retry_timers = threading.local()
+_retry_handler: Optional[logging.Handler] = None
+
+
+class _RetryWaitHandler(logging.Handler):
+    """
+    Add the waits of the OpenAI client before retrying requests (after rate
+    limits, timeouts or server errors) to the "retry" stage of the timer of
+    the current thread.
+    """
+    def emit(self, record):
+        timer = getattr(_retry_timers, "timer", None)
+        if timer is None or not str(record.msg).startswith("Retrying request"):
+            return
+        # The wait is the only float argument ("Retrying request in %f seconds ...")
+        wait = next((arg for arg in record.args or () if isinstance(arg, float)), None)
+        if wait is not None:
+            timer.add("retry", wait)
+
+
+@contextmanager
+def track_retries(timer: StageTimer):
+    """
+    Record in `timer` the time this thread spends waiting to retry OpenAI
+    requests (including waits after rate limits), as the "retry" stage.
+    """
+    global _retry_handler
+    if _retry_handler is None:
+        _retry_handler = _RetryWaitHandler()
+        logger = logging.getLogger(OPENAI_LOGGER)
+        logger.addHandler(_retry_handler)
+        # Retries are logged at INFO level
+        if not logger.isEnabledFor(logging.INFO):
+            logger.setLevel(logging.INFO)
+    previous = getattr(_retry_timers, "timer", None)
+    _retry_timers.timer = timer
+    try:
+        yield
+    finally:
+        _retry_timers.timer = previous
+
+
+def aggregate_timings(timings: Iterable[Dict[str, float]]) -> Dict[str, Dict]:
+    """
+    Aggregate per-task stage timings into p50/p95/p99 (and mean/max) per stage.
+    """
+    values: Dict[str, list] = {}
+    for task_timings in timings:
+        for stage, seconds in (task_timings or {}).items():
+            values.setdefault(stage, []).append(seconds)
+    return {stage: summarize(stage_values) for stage, stage_values in values.items()}
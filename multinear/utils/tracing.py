@@ -0,0 +1,231 @@
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Span of the code currently running (per thread / async task)
+_current_span = contextvars.ContextVar("multinear_current_span", default=None)
+
+# Finished spans are written in batches of this size (and when a trace ends)
+_BATCH_SIZE = 512
+
+
+class Span:
+    """
+    A timed operation of a trace, with attributes.
+
+    IDs and timestamps follow OpenTelemetry: 16-byte trace IDs and 8-byte span
+    IDs as hex strings, times in nanoseconds since the epoch.
+    """
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "attributes",
+        "start_ns", "end_ns", "error", "_token",
+    )
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """
+        W3C trace context header value, to continue the trace elsewhere.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": (
+                {"code": 2, "message": self.error} if self.error is not None
+                else {"code": 1}
+            ),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class FileExporter:
+    """
+    Append finished spans to a file in the OTLP JSON format.
+
+    Each line is one ExportTraceServiceRequest, as written by the OpenTelemetry
+    Collector file exporter, so the file can be loaded by OTLP-aware tools.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._buffer.append(span)
+            if span.parent_id is None or len(self._buffer) >= _BATCH_SIZE:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [_otlp_attribute("service.name", "multinear")],
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "multinear"},
+                    "spans": [span.to_otlp() for span in self._buffer],
+                }],
+            }],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(request, separators=(",", ":")) + "\n")
+        self._buffer = []
+
+
+_exporter: Optional[FileExporter] = None
+
+
+def configure_tracing(path: Optional[str]) -> None:
+    """
+    Write spans to `path`, or disable tracing if `path` is None.
+    """
+    global _exporter
+    if _exporter is not None:
+        if path is not None and Path(path) == _exporter.path:
+            return
+        _exporter.flush()
+    _exporter = FileExporter(Path(path)) if path else None
+
+
+@atexit.register
+def _flush_at_exit():
+    if _exporter is not None:
+        _exporter.flush()
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """
+    Start a span as a child of the current one and make it current.
+
+    Returns None when tracing is disabled. Every started span must be ended
+    with `end_span`, in reverse order of starting.
+    """
+    if _exporter is None:
+        return None
+    span = Span(name, _current_span.get(), attributes)
+    span._token = _current_span.set(span)
+    return span
+
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None) -> None:
+    """
+    End a span started by `start_span`, restoring its parent as the current span.
+    """
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = str(error) or type(error).__name__
+    try:
+        _current_span.reset(span._token)
+    except ValueError:  # Ended from another context, e.g. a closed generator
+        pass
+    if _exporter is not None:
+        _exporter.export(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Trace a block of code. Yields the span, or None when tracing is disabled.
+
+    Task runners can use this to add their own spans under multinear's:
+
+        from multinear.utils.tracing import span
+
+        def run_task(input):
+            with span("retrieve", query=input):
+                ...
+    """
+    current = start_span(name, **attributes)
+    try:
+        yield current
+    except Exception as e:
+        end_span(current, error=e)
+        current = None
+        raise
+    finally:
+        end_span(current)
+
+
+def traced(name: str):
+    """
+    Decorator tracing every call of a function as a span named `name`.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _exporter is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """
+    ID of the current trace (e.g. the job being run), or None when not tracing.
+    """
+    current = _current_span.get()
+    return current.trace_id if current else None